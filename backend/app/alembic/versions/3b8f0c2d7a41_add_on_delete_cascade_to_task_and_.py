@@ -0,0 +1,44 @@
+"""Add ON DELETE CASCADE to task and association foreign keys
+
+Revision ID: 3b8f0c2d7a41
+Revises: 670430b7d2e6
+Create Date: 2026-10-19 10:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f0c2d7a41'
+down_revision = '670430b7d2e6'
+branch_labels = None
+depends_on = None
+
+
+# (表名, 外键列, 引用表)
+FOREIGN_KEYS = [
+    ('task', 'project_id', 'project'),
+    ('task', 'owner_id', 'user'),
+    ('task_collaborator_association', 'task_id', 'task'),
+    ('task_collaborator_association', 'user_id', 'user'),
+    ('project_collaborator_association', 'project_id', 'project'),
+    ('project_collaborator_association', 'user_id', 'user'),
+]
+
+
+def upgrade():
+    for table, column, referred_table in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referred_table, [column], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade():
+    for table, column, referred_table in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred_table, [column], ['id'])
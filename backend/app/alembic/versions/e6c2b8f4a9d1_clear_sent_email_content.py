@@ -0,0 +1,27 @@
+"""Clear content of sent and failed emails
+
+Revision ID: e6c2b8f4a9d1
+Revises: b7d3e9a1c5f2
+Create Date: 2026-10-19 22:13:52.408315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6c2b8f4a9d1'
+down_revision = 'b7d3e9a1c5f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 已发送或最终失败的邮件可能包含初始密码、重置密码令牌，不再保存内容
+    op.execute("UPDATE email_outbox SET html_content = '' WHERE status IN ('SENT', 'FAILED')")
+
+
+def downgrade():
+    # 已清空的内容无法恢复
+    pass
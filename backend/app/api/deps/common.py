@@ -1,17 +1,43 @@
 # 通用依赖
+import math
 from collections.abc import Generator
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request
 from sqlmodel import Session
 
-from app.core.db import engine
+from app.core.circuit_breaker import CircuitOpenError, guard_database
+from app.core.deadlines import (
+    apply_statement_timeout,
+    check_deadline,
+    is_statement_timeout,
+    request_deadline,
+    statement_timeout_error,
+)
 
 
-# 数据库会话依赖项，提供数据库连接
-def get_db() -> Generator[Session, None, None]:
+# 数据库会话依赖项，使用 lifespan 中创建的引擎提供数据库连接。
+# 请求已超过截止时间或数据库熔断器打开时不再检出连接，SQL 语句的执行时间不超过剩余时间
+def get_db(request: Request) -> Generator[Session, None, None]:
+    deadline = request_deadline(request)
+    check_deadline(request, deadline)
+    engine = request.app.state.engine
+    try:
+        guard_database(engine)
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Database unavailable",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        ) from e
     with Session(engine) as session:
-        yield session
+        apply_statement_timeout(session, request, deadline)
+        try:
+            yield session
+        except Exception as e:
+            if is_statement_timeout(e):
+                raise statement_timeout_error(request) from e
+            raise
 
 
 # 数据库会话依赖注入类型
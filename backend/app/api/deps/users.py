@@ -1,5 +1,5 @@
 # 用户相关依赖
-
+import uuid
 from typing import Annotated
 
 import jwt
@@ -11,6 +11,7 @@ from pydantic import ValidationError
 from app.api.deps.common import SessionDep
 from app.core import security
 from app.core.config import settings
+from app.core.tracing import start_span
 from app.models import User, TokenPayload
 
 
@@ -25,22 +26,24 @@ TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 # 获取当前登录用户，验证JWT令牌并检查用户状态
 def get_current_user(session: SessionDep, token: TokenDep) -> User:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-    user = session.get(User, token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+    with start_span("get_current_user"):
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+            )
+            token_data = TokenPayload(**payload)
+            user_id = uuid.UUID(token_data.sub)
+        except (InvalidTokenError, ValidationError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        user = session.get(User, user_id)
+        if not user or user.deleted_at is not None:
+            raise HTTPException(status_code=404, detail="User not found")
+        if not user.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+        return user
 
 
 # 当前用户依赖注入类型
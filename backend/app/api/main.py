@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import projects, login, private, users, utils, tasks
+from app.api.routes import projects, login, private, purge, users, utils, tasks
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -9,6 +9,7 @@ api_router.include_router(users.router)
 api_router.include_router(utils.router)
 api_router.include_router(projects.router)
 api_router.include_router(tasks.router)
+api_router.include_router(purge.router)
 
 
 if settings.ENVIRONMENT == "local":
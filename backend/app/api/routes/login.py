@@ -10,6 +10,7 @@ from fastapi import (
 from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
+from app.crud.emails import crud_enqueue_email
 from app.crud.users import crud_authenticate, crud_get_user_by_email
 
 from app.api.deps.common import SessionDep
@@ -18,7 +19,7 @@ from app.api.deps.users import CurrentUser, get_current_active_superuser
 from app.core import security
 from app.core.config import settings
 from app.core.security import get_password_hash
-from app.core.rate_limiter import init_rate_limiter
+from app.core.rate_limiter import limiter
 
 from app.models import (
     Message,
@@ -29,11 +30,9 @@ from app.models import (
 from app.utils import (
     generate_password_reset_token,
     generate_reset_password_email,
-    send_email,
     verify_password_reset_token,
 )
 
-limiter = init_rate_limiter()
 router = APIRouter(tags=["login"])
 
 
@@ -86,11 +85,8 @@ def recover_password(email: str, session: SessionDep) -> Message:
     email_data = generate_reset_password_email(
         email_to=user.email, email=email, token=password_reset_token
     )
-    send_email(
-        email_to=user.email,
-        subject=email_data.subject,
-        html_content=email_data.html_content,
-    )
+    crud_enqueue_email(session=session, email_to=user.email, email_data=email_data)
+    session.commit()
     return Message(message="Password recovery email sent")
 
 
@@ -1,11 +1,15 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Request, Response
+from sqlmodel import col, select
 
 from app.api.deps.common import SessionDep
 from app.api.deps.users import CurrentUser
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.responses import ModelJSONResponse
+from app.crud.projects import crud_get_projects, crud_get_projects_version
+from app.crud.purge import crud_soft_delete_project
 
 from app.models import (
     Project,
@@ -13,7 +17,7 @@ from app.models import (
     ProjectPublic,
     ProjectsPublic,
     ProjectUpdate,
-    Message
+    PurgeMessage
 )
 
 router = APIRouter(prefix="/projects", tags=["项目"])
@@ -21,46 +25,58 @@ router = APIRouter(prefix="/projects", tags=["项目"])
 
 @router.get("/", response_model=ProjectsPublic)
 def read_projects(
-        session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+        request: Request,
+        session: SessionDep,
+        current_user: CurrentUser,
+        skip: int = 0,
+        limit: int = 100,
+        after: uuid.UUID | None = None,
 ) -> Any:
     """
-    检索项目.
+    检索项目，按 id 排序。传入上一页最后一个项目的 id 作为 after 进行游标分页
     """
+    owner_id = None if current_user.is_superuser else current_user.id
+
+    # 总数和最近更新时间一次查出，生成列表 ETag，命中时不再查询列表
+    count, last_updated = crud_get_projects_version(session=session, owner_id=owner_id)
+    etag = make_etag(count, last_updated, skip, limit, after)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Project)
-        count = session.exec(count_statement).one()
-        statement = select(Project).offset(skip).limit(limit)
-        projects = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Project)
-            .where(Project.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Project)
-            .where(Project.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        projects = session.exec(statement).all()
-
-    return ProjectsPublic(data=projects, count=count)
+    projects = crud_get_projects(
+        session=session, owner_id=owner_id, skip=skip, limit=limit, after=after
+    )
+    response = ModelJSONResponse(ProjectsPublic.model_construct(data=projects, count=count))
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/{id}", response_model=ProjectPublic)
-def read_project(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_project(
+        request: Request,
+        response: Response,
+        session: SessionDep,
+        current_user: CurrentUser,
+        id: uuid.UUID,
+) -> Any:
     """
     Get project by ID.
     """
-    project = session.get(Project, id)
-    if not project:
+    # 先只查询权限检查和 ETag 需要的列，缓存命中时不加载整行
+    statement = select(Project.owner_id, Project.updated_at).where(
+        Project.id == id, col(Project.deleted_at).is_(None)
+    )
+    version = session.exec(statement).first()
+    if not version:
         raise HTTPException(status_code=404, detail="Project not found")
-    if not current_user.is_superuser and (project.owner_id != current_user.id):
+    owner_id, updated_at = version
+    if not current_user.is_superuser and (owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return project
+    etag = make_etag(id, updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return session.get(Project, id)
 
 
 @router.post("/", response_model=ProjectPublic)
@@ -89,7 +105,7 @@ def update_project(
     Update an project.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at is not None:
         raise HTTPException(status_code=404, detail="Project not found")
     if not current_user.is_superuser and (project.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
@@ -104,15 +120,19 @@ def update_project(
 @router.delete("/{id}")
 def delete_project(
         session: SessionDep, current_user: CurrentUser, id: uuid.UUID
-) -> Message:
+) -> PurgeMessage:
     """
     Delete an project.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at is not None:
         raise HTTPException(status_code=404, detail="Project not found")
     if not current_user.is_superuser and (project.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(project)
-    session.commit()
-    return Message(message="Project deleted successfully")
+    # 先软删除立即隐藏，任务由后台清理任务分批删除
+    purge_job = crud_soft_delete_project(
+        session=session, project=project, requested_by_id=current_user.id
+    )
+    return PurgeMessage(
+        message="Project deleted successfully", purge_job_id=purge_job.id
+    )
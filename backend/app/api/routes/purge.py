@@ -0,0 +1,23 @@
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+
+from app.api.deps.common import SessionDep
+from app.api.deps.users import CurrentUser
+from app.models import PurgeJob, PurgeJobPublic
+
+router = APIRouter(prefix="/purge-jobs", tags=["purge"])
+
+
+@router.get("/{id}", response_model=PurgeJobPublic)
+def read_purge_job(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+    """
+    查询后台清理任务进度
+    """
+    purge_job = session.get(PurgeJob, id)
+    if not purge_job:
+        raise HTTPException(status_code=404, detail="Purge job not found")
+    if not current_user.is_superuser and purge_job.requested_by_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return purge_job
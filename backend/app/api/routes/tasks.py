@@ -26,7 +26,7 @@ def create_task(
 ) -> Any:
     # 检查用户是否有权限在 project 下创建 task
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleted_at is not None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
     # 检查用户是否是 project 所有者或协作者
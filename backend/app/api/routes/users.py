@@ -1,17 +1,22 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import ColumnElement
+from sqlmodel import col, func, select
 
+from app.crud.emails import crud_enqueue_email
+from app.crud.purge import crud_soft_delete_user
 from app.crud.users import crud_get_user_by_email, crud_create_user, crud_update_user
 
 from app.api.deps.common import SessionDep
 from app.api.deps.users import CurrentUser, CurrentSuperuser, get_current_active_superuser
 
 from app.core.config import settings
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.responses import ModelJSONResponse
 from app.core.security import get_password_hash, verify_password
-from app.utils import generate_new_account_email, send_email
+from app.utils import generate_new_account_email
 
 from app.models import (
     UpdatePassword,
@@ -23,7 +28,7 @@ from app.models import (
     UserUpdate,
     UserUpdateMe,
     Message,
-    Project
+    PurgeMessage,
 )
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -34,18 +39,44 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+        request: Request,
+        session: SessionDep,
+        skip: int = 0,
+        limit: int = 100,
+        after: uuid.UUID | None = None,
+) -> Any:
     """
-    检索用户
+    检索用户，按 id 排序。传入上一页最后一个用户的 id 作为 after 进行游标分页
     """
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
-
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return UsersPublic(data=users, count=count)
+    # 总数和最近更新时间一次查出，生成列表 ETag，命中时不再查询列表
+    count_statement = select(func.count(), func.max(User.updated_at)).where(
+        col(User.deleted_at).is_(None)
+    )
+    count, last_updated = session.exec(count_statement).one()
+    etag = make_etag(count, last_updated, skip, limit, after)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # 只查询响应需要的列，直接构造响应模型，避免 ORM 对象和二次校验
+    columns = [getattr(User, name) for name in UserPublic.model_fields]
+    conditions: list[ColumnElement[bool]] = [col(User.deleted_at).is_(None)]
+    if after is not None:
+        conditions.append(col(User.id) > after)
+    statement = (
+        select(*columns)
+        .where(*conditions)
+        .order_by(col(User.id))
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = session.exec(statement).all()
+
+    users = [UserPublic.model_construct(**row._mapping) for row in rows]
+    response = ModelJSONResponse(UsersPublic.model_construct(data=users, count=count))
+    set_etag(response, etag)
+    return response
 
 
 @router.post(
@@ -62,16 +93,15 @@ def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud_create_user(session=session, user_create=user_in)
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
         )
-        send_email(
-            email_to=user_in.email,
-            subject=email_data.subject,
-            html_content=email_data.html_content,
+        # 写入发件箱，随用户创建一起提交，由后台进程发送
+        crud_enqueue_email(
+            session=session, email_to=user_in.email, email_data=email_data
         )
+    user = crud_create_user(session=session, user_create=user_in)
     return user
 
 
@@ -118,14 +148,19 @@ def update_password_me(
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> Any:
+def read_user_me(request: Request, response: Response, current_user: CurrentUser) -> Any:
     """
     Get current user.
     """
+    # 当前用户已在认证时加载，直接用其 updated_at 生成 ETag
+    etag = make_etag(current_user.id, current_user.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return current_user
 
 
-@router.delete("/me", response_model=Message)
+@router.delete("/me", response_model=PurgeMessage)
 def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
     """
     Delete own user.
@@ -134,9 +169,13 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    session.delete(current_user)
-    session.commit()
-    return Message(message="User deleted successfully")
+    # 先软删除立即隐藏，关联数据由后台清理任务分批删除
+    purge_job = crud_soft_delete_user(
+        session=session, user=current_user, requested_by_id=current_user.id
+    )
+    return PurgeMessage(
+        message="User deleted successfully", purge_job_id=purge_job.id
+    )
 
 
 @router.post("/signup", response_model=UserPublic)
@@ -157,20 +196,38 @@ def register_user(session: SessionDep, user_in: UserRegister) -> Any:
 
 @router.get("/{user_id}", response_model=UserPublic)
 def read_user_by_id(
-        user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+        request: Request,
+        response: Response,
+        user_id: uuid.UUID,
+        session: SessionDep,
+        current_user: CurrentUser,
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = session.get(User, user_id)
-    if user == current_user:
-        return user
+    if user_id == current_user.id:
+        etag = make_etag(current_user.id, current_user.updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        return current_user
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges",
         )
-    return user
+    # 先只查询 updated_at，缓存命中时不加载整行
+    statement = select(User.updated_at).where(
+        User.id == user_id, col(User.deleted_at).is_(None)
+    )
+    updated_at = session.exec(statement).first()
+    if not updated_at:
+        raise HTTPException(status_code=404, detail="User not found")
+    etag = make_etag(user_id, updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return session.get(User, user_id)
 
 
 @router.patch(
@@ -189,7 +246,7 @@ def update_user(
     """
 
     db_user = session.get(User, user_id)
-    if not db_user:
+    if not db_user or db_user.deleted_at is not None:
         raise HTTPException(
             status_code=404,
             detail="The user with this id does not exist in the system",
@@ -205,22 +262,24 @@ def update_user(
     return db_user
 
 
-@router.delete("/{user_id}", response_model=Message)
+@router.delete("/{user_id}", response_model=PurgeMessage)
 def delete_user(
         session: SessionDep, current_superuser: CurrentSuperuser, user_id: uuid.UUID
-) -> Message:
+) -> PurgeMessage:
     """
     删除用户，需要超级用户
     """
     user = session.get(User, user_id)
-    if not user:
+    if not user or user.deleted_at is not None:
         raise HTTPException(status_code=404, detail="User not found")
     if user == current_superuser:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Project).where(col(Project.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
-    return Message(message="User deleted successfully")
+    # 先软删除立即隐藏，项目、任务及协作关系由后台清理任务分批删除
+    purge_job = crud_soft_delete_user(
+        session=session, user=user, requested_by_id=current_superuser.id
+    )
+    return PurgeMessage(
+        message="User deleted successfully", purge_job_id=purge_job.id
+    )
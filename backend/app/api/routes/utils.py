@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends
+import uuid
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import HTMLResponse
 from pydantic.networks import EmailStr
 
-from app.api.deps.users import get_current_active_superuser
-from app.utils import generate_test_email, send_email
+from app.api.deps.common import SessionDep
+from app.api.deps.users import CurrentSuperuser, get_current_active_superuser
+from app.core.config import settings
+from app.core.profiling import profile_path
+from app.core.security import create_profile_token
+from app.core.slow_queries import get_slow_queries
+from app.crud.emails import crud_enqueue_email
+from app.utils import generate_test_email
 
-from app.models import Message
+from app.models import Message, ProfileReport, ProfileToken, SlowQueriesPublic
 
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -15,19 +25,70 @@ router = APIRouter(prefix="/utils", tags=["utils"])
     dependencies=[Depends(get_current_active_superuser)],
     status_code=201,
 )
-def test_email(email_to: EmailStr) -> Message:
+def test_email(email_to: EmailStr, session: SessionDep) -> Message:
     """
     Test emails.
     """
     email_data = generate_test_email(email_to=email_to)
-    send_email(
-        email_to=email_to,
-        subject=email_data.subject,
-        html_content=email_data.html_content,
-    )
+    crud_enqueue_email(session=session, email_to=email_to, email_data=email_data)
+    session.commit()
     return Message(message="Test email sent")
 
 
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.post("/profile-token/")
+def create_profiling_token(current_user: CurrentSuperuser) -> ProfileToken:
+    """
+    申请性能分析令牌，放在 X-Profile 请求头或 profile 查询参数中，
+    该请求的性能分析报告ID在响应头 X-Profile-Id 中返回
+    """
+    expires_delta = timedelta(minutes=settings.PROFILE_TOKEN_EXPIRE_MINUTES)
+    return ProfileToken(
+        token=create_profile_token(current_user.id, expires_delta),
+        expires_in=int(expires_delta.total_seconds()),
+    )
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def read_profile(profile_id: uuid.UUID) -> ProfileReport:
+    """
+    查看性能分析报告：请求耗时和执行的 SQL 语句
+    """
+    path = profile_path(profile_id, "json")
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return ProfileReport.model_validate_json(path.read_bytes())
+
+
+@router.get(
+    "/profiles/{profile_id}/flamegraph",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=HTMLResponse,
+)
+def read_profile_flamegraph(profile_id: uuid.UUID) -> HTMLResponse:
+    """
+    查看接口函数的 pyinstrument 采样结果
+    """
+    path = profile_path(profile_id, "html")
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return HTMLResponse(path.read_text())
+
+
+@router.get(
+    "/slow-queries/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def read_slow_queries(limit: int = 20) -> SlowQueriesPublic:
+    """
+    当前进程启动以来最慢的语句结构，按最大耗时排序
+    """
+    data, count = get_slow_queries(limit)
+    return SlowQueriesPublic(data=data, count=count)
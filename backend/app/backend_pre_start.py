@@ -1,10 +1,10 @@
 import logging
 
 from sqlalchemy import Engine
-from sqlmodel import Session, select
 from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
 
-from app.core.db import engine
+from app.core.circuit_breaker import probe_database
+from app.core.db import create_db_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,9 +21,9 @@ wait_seconds = 1
 )
 def init(db_engine: Engine) -> None:
     try:
-        with Session(db_engine) as session:
-            # Try to create session to check if DB is awake
-            session.exec(select(1))
+        # Try to create session to check if DB is awake.
+        # 连续失败后熔断器打开，之后每隔 DB_CIRCUIT_RESET_SECONDS 秒才再次连接数据库
+        probe_database(db_engine)
     except Exception as e:
         logger.error(e)
         raise e
@@ -31,7 +31,7 @@ def init(db_engine: Engine) -> None:
 
 def main() -> None:
     logger.info("Initializing service")
-    init(engine)
+    init(create_db_engine())
     logger.info("Service finished initializing")
 
 
@@ -0,0 +1,137 @@
+# 数据库熔断器：连续多次无法连接数据库后打开，打开期间需要数据库的请求直接返回 503，
+# 不再逐个等待连接超时、继续压向已经不可用的数据库。DB_CIRCUIT_RESET_SECONDS 秒后进入半开，
+# 只放行一个调用方执行 select(1) 探测，成功则关闭，失败则重新打开
+import logging
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.metrics import circuit_breaker_rejections, circuit_breaker_state
+
+logger = logging.getLogger(__name__)
+
+closed = "closed"
+half_open = "half_open"
+opened = "open"
+# 指标中的状态值
+state_values = {closed: 0, half_open: 1, opened: 2}
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Database circuit breaker is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = closed
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started: float | None = None
+
+    def before_call(self) -> bool:
+        """
+        关闭时返回 False；打开时抛出 CircuitOpenError；半开时只放行一个调用方并返回 True，
+        由其执行探测并调用 record_success / record_failure。探测超过 reset_timeout
+        仍未结束时（如线程被放弃）允许下一个调用方重新探测
+        """
+        if self.state == closed:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            if self.state == closed:
+                return False
+            if self.state == opened and now - self.opened_at >= self.reset_timeout:
+                self.set_state(half_open)
+            if self.state == half_open and (
+                self.probe_started is None
+                or now - self.probe_started >= self.reset_timeout
+            ):
+                self.probe_started = now
+                return True
+            circuit_breaker_rejections.inc()
+            raise CircuitOpenError(max(0.0, self.opened_at + self.reset_timeout - now))
+
+    def record_success(self) -> None:
+        if self.state == closed and not self.failures:
+            return
+        with self.lock:
+            self.failures = 0
+            self.probe_started = None
+            self.set_state(closed)
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            # 打开后仍在执行的请求失败时不推迟半开的时间
+            if self.state == opened:
+                return
+            if self.state == half_open or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.probe_started = None
+                self.set_state(opened)
+
+    def set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Database circuit breaker {self.state} -> {state}")
+            self.state = state
+        circuit_breaker_state.set(state_values[state])
+
+
+database_breaker = CircuitBreaker(
+    settings.DB_CIRCUIT_FAILURE_THRESHOLD, settings.DB_CIRCUIT_RESET_SECONDS
+)
+
+
+def run_probe(engine: Engine, breaker: CircuitBreaker) -> None:
+    try:
+        with Session(engine) as session:
+            session.exec(select(1))
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+
+
+def probe_database(engine: Engine, breaker: CircuitBreaker = database_breaker) -> None:
+    """熔断器打开时抛出 CircuitOpenError，否则执行 select(1) 并记录结果"""
+    breaker.before_call()
+    run_probe(engine, breaker)
+
+
+def guard_database(engine: Engine, breaker: CircuitBreaker = database_breaker) -> None:
+    """
+    熔断器关闭时不访问数据库直接返回，打开时抛出 CircuitOpenError，
+    半开时由当前调用方执行探测，探测失败同样抛出 CircuitOpenError
+    """
+    if breaker.before_call():
+        try:
+            run_probe(engine, breaker)
+        except Exception as e:
+            raise CircuitOpenError(breaker.reset_timeout) from e
+
+
+def instrument_circuit_breaker(
+    engine: Engine, breaker: CircuitBreaker = database_breaker
+) -> None:
+    """
+    建立连接失败或连接断开时记为失败，语句执行成功时记为成功。
+    SQL 错误、语句超时等数据库仍可用的错误不计入
+    """
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: Any) -> None:
+        if context.connection is None or context.is_disconnect:
+            breaker.record_failure()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(*_: Any) -> None:
+        breaker.record_success()
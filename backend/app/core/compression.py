@@ -0,0 +1,276 @@
+# 响应压缩
+import hashlib
+import zlib
+from collections.abc import Callable
+from typing import Protocol
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes, flush: bool = False) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        result = self._compressor.compress(data)
+        if flush:
+            result += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return result
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        result: bytes = self._compressor.process(data)
+        if flush:
+            result += self._compressor.flush()
+        return result
+
+    def finish(self) -> bytes:
+        result: bytes = self._compressor.finish()
+        return result
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        result: bytes = self._compressor.compress(data)
+        if flush:
+            result += self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return result
+
+    def finish(self) -> bytes:
+        result: bytes = self._compressor.flush()
+        return result
+
+
+def get_encoder(encoding: str, level: int | None = None) -> Encoder:
+    """创建指定算法的流式压缩器，level 为空时使用配置中的压缩级别"""
+    if encoding == "zstd":
+        return ZstdEncoder(level or settings.COMPRESSION_ZSTD_LEVEL)
+    if encoding == "br":
+        return BrotliEncoder(level or settings.COMPRESSION_BROTLI_QUALITY)
+    return GzipEncoder(level or settings.COMPRESSION_GZIP_LEVEL)
+
+
+# 服务端偏好顺序，只包含已安装依赖的算法
+available_encodings = [
+    encoding
+    for encoding, module in (("zstd", zstandard), ("br", brotli), ("gzip", zlib))
+    if module is not None
+]
+
+# 不可变内容只压缩一次，使用最高压缩级别
+max_levels = {"zstd": 19, "br": 11, "gzip": 9}
+
+
+def select_encoding(accept_encoding: str) -> str | None:
+    """根据 Accept-Encoding（含 q 值）选择压缩算法，客户端不接受任何算法时返回 None"""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    candidates = [
+        encoding
+        for encoding in available_encodings
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    # q 值相同时按服务端偏好顺序
+    return max(
+        candidates,
+        key=lambda encoding: accepted.get(encoding, accepted.get("*", 0.0)),
+    )
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith(("+json", "+xml"))
+        or media_type
+        in (
+            "application/json",
+            "application/javascript",
+            "application/xml",
+            "image/svg+xml",
+        )
+    )
+
+
+class CompressionMiddleware:
+    """
+    按 Accept-Encoding 协商 zstd / br / gzip 压缩响应。
+    单块响应小于 minimum_size 时原样返回；流式响应逐块压缩并立即刷新，
+    客户端可以边接收边解压。已带 Content-Encoding 的响应（如预压缩内容）不再处理。
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int | None = None) -> None:
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send
+        self.start_message: Message | None = None
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # 等到第一块响应体才能判断是否需要压缩
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or not is_compressible(
+                headers.get("content-type", "")
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+            self.encoder = get_encoder(self.encoding)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start_message)
+
+        if self.passthrough or self.encoder is None:
+            await self.send(message)
+            return
+        if more_body:
+            body = self.encoder.compress(body, flush=True)
+        else:
+            body = self.encoder.compress(body) + self.encoder.finish()
+        await self.send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
+
+
+class PrecompressedPayload:
+    """
+    不可变的响应内容（如 OpenAPI 文档、文档页静态资源），按所有可用算法压缩一次并缓存在内存中，
+    请求时只需根据 Accept-Encoding 选出对应版本。prepare() 可在启动时调用，
+    否则在首次请求时于线程池中执行
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], bytes],
+        media_type: str = "application/json",
+        cache_control: str = "no-cache",
+        levels: dict[str, int] | None = None,
+    ) -> None:
+        self.build = build
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.levels = levels or max_levels
+        self.variants: dict[str | None, bytes] = {}
+        self.digest = ""
+
+    def prepare(self) -> None:
+        content = self.build()
+        variants: dict[str | None, bytes] = {None: content}
+        for encoding in available_encodings:
+            encoder = get_encoder(encoding, self.levels[encoding])
+            variants[encoding] = encoder.compress(content) + encoder.finish()
+        self.digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self.variants = variants
+
+    async def endpoint(self, request: Request) -> Response:
+        if not self.variants:
+            await run_in_threadpool(self.prepare)
+        encoding = select_encoding(request.headers.get("accept-encoding", ""))
+        # 强 ETag 对应具体的字节内容，每种编码使用不同的 ETag，缓存和范围请求不会混用
+        etag = f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+        if etag_matches(request, etag):
+            return not_modified(etag, self.cache_control)
+        headers = {
+            "Vary": "Accept-Encoding",
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+        }
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            self.variants[encoding], media_type=self.media_type, headers=headers
+        )
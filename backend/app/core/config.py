@@ -48,6 +48,12 @@ class Settings(BaseSettings):
             self.FRONTEND_HOST
         ]
 
+    # 响应压缩：小于该字节数的响应不压缩，以及各算法的压缩级别
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
     PROJECT_NAME: str
     SENTRY_DSN: HttpUrl | None = None
     POSTGRES_SERVER: str
@@ -68,12 +74,68 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # 数据库连接池大小和允许额外创建的连接数
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # worker 数，默认取可用的 CPU 数（考虑容器的 cgroup 配额），uvicorn 也读取该变量
+    WEB_CONCURRENCY: int | None = None
+    # 同步路由线程池大小，默认与连接池容量（DB_POOL_SIZE + DB_MAX_OVERFLOW）一致
+    THREADPOOL_SIZE: int | None = None
+    # 所有 worker 的连接池合计允许占用的 Postgres 连接数，超过时启动时警告。
+    # 需为 email-sender、purge-worker 等其他服务和 max_connections 的保留连接留出余量
+    DB_CONNECTION_BUDGET: int = 80
+    # 启动时预先建立连接池连接、编译热点 SQL，测试时关闭
+    WARMUP_ENABLED: bool = True
+    # 就绪检查：结果缓存时间（毫秒）、数据库检查超时（秒）、发件箱允许的最大积压（秒）
+    HEALTH_CACHE_MS: int = 1000
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MAX_OUTBOX_LAG_SECONDS: float = 600.0
+    # 按需性能分析：是否启用、令牌有效期（分钟）、报告保存目录
+    PROFILING_ENABLED: bool = True
+    PROFILE_TOKEN_EXPIRE_MINUTES: int = 15
+    PROFILE_DIR: str = "/tmp/profiles"
+    # 慢查询日志：耗时阈值（毫秒）、慢查询中捕获 EXPLAIN 执行计划的比例、
+    # 捕获执行计划时再次执行语句的超时（毫秒）
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+    # 链路追踪：默认采样比例、按路由 id 覆盖的采样比例（JSON），
+    # span 导出到的本地文件（OTLP/JSON 行）或 OTLP/HTTP 地址，如 http://collector:4318/v1/traces
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_ROUTE_SAMPLE_RATES: dict[str, float] = {}
+    TRACING_EXPORT_FILE: str | None = None
+    TRACING_OTLP_ENDPOINT: str | None = None
+
+    # 数据库熔断器：连续多少次连接失败后打开，打开多少秒后进入半开并探测
+    DB_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    DB_CIRCUIT_RESET_SECONDS: float = 5.0
+
+    # 请求截止时间：默认超时（秒）、按路由 id 覆盖的超时（JSON），客户端可通过 X-Request-Timeout 缩短
+    REQUEST_TIMEOUT_SECONDS: float = 30.0
+    REQUEST_ROUTE_TIMEOUTS: dict[str, float] = {}
+
+    # 过载保护：每个 worker 中各路由的初始、最小、最大并发上限，按路由 id 覆盖的最大并发上限（JSON），
+    # 等待队列长度、排队超时（毫秒），延迟超过路由长期平均延迟多少倍时减小并发上限，
+    # 拒绝请求时 Retry-After 的秒数
+    LOAD_SHEDDING_ENABLED: bool = True
+    LOAD_SHEDDING_INITIAL_LIMIT: int = 20
+    LOAD_SHEDDING_MIN_LIMIT: int = 2
+    LOAD_SHEDDING_MAX_LIMIT: int = 200
+    LOAD_SHEDDING_ROUTE_LIMITS: dict[str, int] = {}
+    LOAD_SHEDDING_QUEUE_SIZE: int = 50
+    LOAD_SHEDDING_QUEUE_TIMEOUT_MS: int = 1000
+    LOAD_SHEDDING_LATENCY_TOLERANCE: float = 2.0
+    LOAD_SHEDDING_RETRY_AFTER_SECONDS: int = 1
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
     SMTP_HOST: str | None = None
     SMTP_USER: str | None = None
     SMTP_PASSWORD: str | None = None
+    # SMTP 连接池大小，以及空闲连接的最长复用时间（秒）
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_IDLE_SECONDS: float = 60.0
     EMAILS_FROM_EMAIL: EmailStr | None = None
     EMAILS_FROM_NAME: EmailStr | None = None
 
@@ -84,6 +146,11 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # 发件箱：最大重试次数、首次重试间隔（秒，之后指数退避）、空闲轮询间隔（秒）、每批发送数量
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 30.0
+    EMAIL_SENDER_POLL_SECONDS: float = 5.0
+    EMAIL_SENDER_BATCH_SIZE: int = 100
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -94,6 +161,16 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # bcrypt 加密轮数，测试时可调低以加快用例执行
+    BCRYPT_ROUNDS: int = 12
+    # 是否启用限流，测试时关闭
+    RATE_LIMIT_ENABLED: bool = True
+
+    # 软删除后台清理：每批删除行数、批次间隔（秒）、空闲轮询间隔（秒）
+    PURGE_CHUNK_SIZE: int = 1000
+    PURGE_THROTTLE_SECONDS: float = 0.1
+    PURGE_POLL_SECONDS: float = 5.0
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
             message = (
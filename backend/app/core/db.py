@@ -1,3 +1,4 @@
+from sqlalchemy import Engine
 from sqlmodel import Session, create_engine, select
 
 from app.crud.users import crud_create_user
@@ -5,7 +6,17 @@ from app.core.config import settings
 
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def create_db_engine() -> Engine:
+    """
+    创建数据库引擎。创建时会导入数据库驱动，Web 应用在 lifespan 中创建，
+    后台脚本在 main() 中创建，导入模块本身不产生开销
+    """
+    return create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,96 @@
+# 请求截止时间：请求到达时记录时间，截止时间为到达时间加上路由的默认超时，
+# 客户端可通过 X-Request-Timeout 请求头（秒）缩短。get_db 在检出数据库连接前检查
+# 是否已过期，并在每个事务开始时以剩余时间设置 statement_timeout，已在线程池或
+# 过载保护队列中等待过久的请求不再执行完整的查询
+import time
+from typing import Any
+
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import deadline_exceeded, statement_timeouts
+
+timeout_header = "x-request-timeout"
+# 语句被取消（包括 statement_timeout 超时）时 PostgreSQL 返回的 SQLSTATE
+query_canceled = "57014"
+
+
+class DeadlineMiddleware:
+    """记录请求到达的时间，需在过载保护等会让请求等待的中间件之外注册"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["received_at"] = time.monotonic()
+        await self.app(scope, receive, send)
+
+
+def route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return route.unique_id if isinstance(route, APIRoute) else "unmatched"
+
+
+def request_deadline(request: Request) -> float | None:
+    """返回 time.monotonic() 时间的截止时间，未经过 DeadlineMiddleware 时返回 None"""
+    received_at = request.scope.get("state", {}).get("received_at")
+    if received_at is None:
+        return None
+    timeout = settings.REQUEST_ROUTE_TIMEOUTS.get(
+        route_label(request), settings.REQUEST_TIMEOUT_SECONDS
+    )
+    try:
+        requested = float(request.headers.get(timeout_header, "inf"))
+    except ValueError:
+        requested = float("inf")
+    # 客户端只能缩短超时，不能延长
+    if requested > 0:
+        timeout = min(timeout, requested)
+    return float(received_at + timeout)
+
+
+def check_deadline(request: Request, deadline: float | None) -> float | None:
+    """返回剩余的秒数，已过期时拒绝请求"""
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        deadline_exceeded.labels(route_label(request)).inc()
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
+    return remaining
+
+
+def apply_statement_timeout(
+    session: Session, request: Request, deadline: float | None
+) -> None:
+    """每个事务开始时按剩余时间设置 SET LOCAL statement_timeout，请求中提交后的新事务同样受限"""
+    if deadline is None or session.get_bind().dialect.name != "postgresql":
+        return
+
+    @event.listens_for(session, "after_begin")
+    def _set_statement_timeout(
+        _session: Any, _transaction: Any, connection: Any
+    ) -> None:
+        remaining = check_deadline(request, deadline)
+        assert remaining is not None
+        connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}"
+        )
+
+
+def is_statement_timeout(exc: Exception) -> bool:
+    return (
+        isinstance(exc, DBAPIError)
+        and getattr(exc.orig, "sqlstate", None) == query_canceled
+    )
+
+
+def statement_timeout_error(request: Request) -> HTTPException:
+    statement_timeouts.labels(route_label(request)).inc()
+    return HTTPException(status_code=504, detail="Request deadline exceeded")
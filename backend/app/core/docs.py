@@ -0,0 +1,113 @@
+# API 文档：Swagger UI / ReDoc 静态资源随应用发布，OpenAPI 文档启动时预先生成
+from pathlib import Path
+
+import orjson
+from fastapi import FastAPI, HTTPException
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.core.compression import PrecompressedPayload
+
+static_dir = Path(__file__).parent.parent / "static" / "docs"
+
+docs_url = "/docs"
+redoc_url = "/redoc"
+oauth2_redirect_url = "/docs/oauth2-redirect"
+assets_url = "/docs/assets"
+
+# 资源地址带内容哈希，浏览器可以长期缓存，升级资源后地址随之变化
+immutable_cache_control = "public, max-age=31536000, immutable"
+# 静态资源较大，首次请求时压缩，使用中等压缩级别
+asset_levels = {"zstd": 9, "br": 9, "gzip": 9}
+
+asset_media_types = {
+    "swagger-ui-bundle.js": "text/javascript",
+    "swagger-ui.css": "text/css",
+    "redoc.standalone.js": "text/javascript",
+    "favicon.png": "image/png",
+}
+
+assets = {
+    name: PrecompressedPayload(
+        (static_dir / name).read_bytes,
+        media_type=media_type,
+        cache_control=immutable_cache_control,
+        levels=asset_levels,
+    )
+    for name, media_type in asset_media_types.items()
+}
+
+
+def asset_url(name: str) -> str:
+    payload = assets[name]
+    if not payload.variants:
+        payload.prepare()
+    return f"{assets_url}/{name}?v={payload.digest[:12]}"
+
+
+async def docs_asset(request: Request) -> Response:
+    payload = assets.get(request.path_params["name"])
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return await payload.endpoint(request)
+
+
+def setup_docs(app: FastAPI, openapi_url: str) -> PrecompressedPayload:
+    """
+    注册文档页面、静态资源和 OpenAPI 路由，替代 FastAPI 默认的 CDN 文档页和
+    每次请求都重新序列化的 openapi.json。返回 OpenAPI 内容，由 lifespan 在启动时生成
+    """
+    openapi_payload = PrecompressedPayload(lambda: orjson.dumps(app.openapi()))
+
+    def swagger_ui() -> bytes:
+        return bytes(
+            get_swagger_ui_html(
+                openapi_url=openapi_url,
+                title=f"{app.title} - Swagger UI",
+                swagger_js_url=asset_url("swagger-ui-bundle.js"),
+                swagger_css_url=asset_url("swagger-ui.css"),
+                swagger_favicon_url=asset_url("favicon.png"),
+                oauth2_redirect_url=oauth2_redirect_url,
+                init_oauth=app.swagger_ui_init_oauth,
+                swagger_ui_parameters=app.swagger_ui_parameters,
+            ).body
+        )
+
+    def redoc() -> bytes:
+        return bytes(
+            get_redoc_html(
+                openapi_url=openapi_url,
+                title=f"{app.title} - ReDoc",
+                redoc_js_url=asset_url("redoc.standalone.js"),
+                redoc_favicon_url=asset_url("favicon.png"),
+                with_google_fonts=False,
+            ).body
+        )
+
+    def oauth2_redirect() -> bytes:
+        return bytes(get_swagger_ui_oauth2_redirect_html().body)
+
+    pages = {
+        openapi_url: openapi_payload,
+        docs_url: PrecompressedPayload(swagger_ui, media_type="text/html"),
+        redoc_url: PrecompressedPayload(redoc, media_type="text/html"),
+        oauth2_redirect_url: PrecompressedPayload(
+            oauth2_redirect, media_type="text/html"
+        ),
+    }
+    # 移除 FastAPI 自动注册的同名路由
+    app.router.routes = [
+        route
+        for route in app.router.routes
+        if not (isinstance(route, Route) and route.path in pages)
+    ]
+    for path, payload in pages.items():
+        app.add_route(path, payload.endpoint, include_in_schema=False)
+    app.add_route(f"{assets_url}/{{name}}", docs_asset, include_in_schema=False)
+    return openapi_payload
@@ -0,0 +1,44 @@
+# ETag 条件请求
+import hashlib
+from typing import Any
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# 客户端必须每次携带 If-None-Match 重新验证，且不允许共享缓存保存带认证的响应
+private_cache_control = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    由资源版本信息生成弱 ETag：单个资源使用 id + updated_at，
+    列表使用 count + max(updated_at) 以及分页参数
+    """
+    version = "|".join(str(part) for part in parts)
+    digest = hashlib.blake2b(version.encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """按弱比较规则判断 If-None-Match 是否包含当前 ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str = private_cache_control) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = private_cache_control
@@ -0,0 +1,140 @@
+# 存活与就绪探针
+import time
+from typing import Any
+
+import anyio
+import anyio.to_thread
+import orjson
+from sqlalchemy import Engine
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session, col, func, select
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.circuit_breaker import CircuitOpenError, database_breaker
+from app.core.config import settings
+from app.models import EmailOutbox, EmailStatus
+from app.utils import get_beijing_time
+
+live_path = f"{settings.API_V1_STR}/health/live"
+ready_path = f"{settings.API_V1_STR}/health/ready"
+
+
+def check_pool(engine: Engine) -> dict[str, Any]:
+    """连接池的所有连接都被占用时，新请求只能排队等待连接"""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"ok": True}
+    capacity = pool.size() + pool._max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "ok": checked_out < capacity,
+        "checked_out": checked_out,
+        "capacity": capacity,
+    }
+
+
+def check_database(engine: Engine) -> dict[str, Any]:
+    """与 backend_pre_start 相同，执行 select(1) 确认数据库可用，同时查询发件箱积压"""
+    start = time.perf_counter()
+    with Session(engine) as session:
+        session.exec(select(1))
+        latency_ms = (time.perf_counter() - start) * 1000
+        oldest_due = session.exec(
+            select(func.min(EmailOutbox.next_attempt_at)).where(
+                col(EmailOutbox.status) == EmailStatus.PENDING,
+                col(EmailOutbox.next_attempt_at) <= get_beijing_time(),
+            )
+        ).one()
+    lag = (get_beijing_time() - oldest_due).total_seconds() if oldest_due else 0.0
+    return {"ok": True, "latency_ms": round(latency_ms, 1), "outbox_lag_seconds": lag}
+
+
+async def run_checks(state: Any) -> tuple[bool, dict[str, Any]]:
+    if not getattr(state, "warm", False):
+        return False, {"warmup": {"ok": False}}
+    engine: Engine = state.engine
+    checks: dict[str, Any] = {"warmup": {"ok": True}, "pool": check_pool(engine)}
+    try:
+        probe = database_breaker.before_call()
+    except CircuitOpenError:
+        # 熔断器打开时不访问数据库
+        checks["circuit_breaker"] = {"ok": False, "state": database_breaker.state}
+        return False, checks
+    if not checks["pool"]["ok"] and not probe:
+        # 连接池已满时不再检出连接检查数据库，避免探针也排队等待。流量高峰时所有 worker
+        # 会同时占满连接池，只报告为 degraded，负载均衡不会摘除全部 worker；
+        # 数据库连接失败仍由熔断器反映
+        checks["circuit_breaker"] = {"ok": True, "state": database_breaker.state}
+        return True, checks
+    try:
+        # 超时后放弃等待卡住的线程，探针按时返回
+        with anyio.fail_after(settings.HEALTH_DB_TIMEOUT_SECONDS):
+            database = await anyio.to_thread.run_sync(
+                check_database, engine, abandon_on_cancel=True
+            )
+    except Exception as e:
+        # 半开时就绪检查本身即为探测，worker 不接收流量时熔断器也能恢复
+        if probe:
+            database_breaker.record_failure()
+        checks["circuit_breaker"] = {"ok": False, "state": database_breaker.state}
+        checks["database"] = {"ok": False, "error": str(e) or type(e).__name__}
+        return False, checks
+    if probe:
+        database_breaker.record_success()
+    checks["circuit_breaker"] = {"ok": True, "state": database_breaker.state}
+    lag = database.pop("outbox_lag_seconds")
+    checks["database"] = database
+    # 邮件积压由发件进程导致，不影响本进程处理请求，只在结果中报告
+    checks["outbox"] = {
+        "ok": lag <= settings.HEALTH_MAX_OUTBOX_LAG_SECONDS,
+        "lag_seconds": round(lag, 1),
+    }
+    return True, checks
+
+
+class HealthCheckMiddleware:
+    """
+    处理存活和就绪探针，需注册为最外层中间件，探针请求不经过限流、压缩等其他中间件，
+    也不进入路由。就绪检查的结果缓存 HEALTH_CACHE_MS 毫秒，探针频率再高也不会增加数据库负载
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.lock = anyio.Lock()
+        self.cached_at = 0.0
+        self.cached: tuple[int, bytes] = (503, b"")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in (live_path, ready_path):
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == live_path:
+            # 存活只表示进程能处理请求，不检查依赖，避免数据库故障导致所有进程被重启
+            status, body = 200, b'{"status":"ok"}'
+        else:
+            status, body = await self.readiness(scope["app"].state)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"cache-control", b"no-store"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def readiness(self, state: Any) -> tuple[int, bytes]:
+        async with self.lock:
+            now = time.monotonic()
+            if (now - self.cached_at) * 1000 >= settings.HEALTH_CACHE_MS:
+                ready, checks = await run_checks(state)
+                status = "ok" if ready else "fail"
+                if ready and not all(check["ok"] for check in checks.values()):
+                    status = "degraded"
+                body = orjson.dumps({"status": status, "checks": checks})
+                self.cached = (200 if ready else 503, body)
+                self.cached_at = time.monotonic()
+            return self.cached
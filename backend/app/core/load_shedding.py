@@ -0,0 +1,144 @@
+# 过载保护：按路由限制同时处理的请求数，超出上限的请求在有界队列中等待，
+# 队列已满或等待超时时直接返回 503 和 Retry-After，不让请求堆积在线程池和连接池前
+# 等到客户端已经超时才处理完。并发上限按 AIMD 自适应：请求延迟明显高于该路由的
+# 长期平均延迟时乘性减小，否则在并发接近上限时加性增大
+import math
+import time
+from collections import deque
+
+import anyio
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import load_shed_limit, load_shed_rejections, match_route
+
+
+class AdaptiveLimit:
+    """AIMD 并发上限，延迟基线为所有请求延迟的指数移动平均，持续变慢后基线随之升高"""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float,
+        backoff: float = 0.9,
+        smoothing: float = 0.01,
+    ) -> None:
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.baseline: float | None = None
+
+    def update(self, latency: float, inflight: int) -> None:
+        if self.baseline is None:
+            self.baseline = latency
+            return
+        if latency > self.baseline * self.tolerance:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif inflight * 2 >= self.limit:
+            # 并发远低于上限时不增大，避免空闲时上限无限增长
+            self.limit = min(self.max_limit, self.limit + 1)
+        self.baseline += self.smoothing * (latency - self.baseline)
+
+
+class RouteLimiter:
+    """
+    单个路由的并发许可和先进先出的等待队列。请求完成时许可直接转交给队首的请求，
+    排队的请求不会被新到达的请求插队
+    """
+
+    def __init__(self, limit: AdaptiveLimit, queue_size: int) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.inflight = 0
+        self.waiters: deque[anyio.Event] = deque()
+
+    async def acquire(self, timeout: float) -> str | None:
+        """获得许可时返回 None，否则返回拒绝原因"""
+        if self.inflight < self.limit.limit and not self.waiters:
+            self.inflight += 1
+            return None
+        if len(self.waiters) >= self.queue_size:
+            return "queue_full"
+        event = anyio.Event()
+        self.waiters.append(event)
+        try:
+            with anyio.move_on_after(timeout):
+                await event.wait()
+        except BaseException:
+            # 等待中被取消（如客户端断开），已转交的许可需归还
+            if event.is_set():
+                self.release(None)
+            else:
+                self.waiters.remove(event)
+            raise
+        if event.is_set():
+            return None
+        self.waiters.remove(event)
+        return "queue_timeout"
+
+    def release(self, latency: float | None) -> None:
+        if latency is not None:
+            self.limit.update(latency, self.inflight)
+        self.inflight -= 1
+        while self.waiters and self.inflight < self.limit.limit:
+            self.inflight += 1
+            self.waiters.popleft().set()
+
+
+def create_route_limiter(route: str) -> RouteLimiter:
+    limit = AdaptiveLimit(
+        initial=settings.LOAD_SHEDDING_INITIAL_LIMIT,
+        min_limit=settings.LOAD_SHEDDING_MIN_LIMIT,
+        max_limit=settings.LOAD_SHEDDING_ROUTE_LIMITS.get(
+            route, settings.LOAD_SHEDDING_MAX_LIMIT
+        ),
+        tolerance=settings.LOAD_SHEDDING_LATENCY_TOLERANCE,
+    )
+    return RouteLimiter(limit, settings.LOAD_SHEDDING_QUEUE_SIZE)
+
+
+class LoadSheddingMiddleware:
+    """只限制 API 路由，文档、指标等路由不受影响；出错的请求不参与调整并发上限"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiters: dict[str, RouteLimiter] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = match_route(scope) if scope["type"] == "http" else None
+        if not isinstance(route, APIRoute):
+            await self.app(scope, receive, send)
+            return
+        route_id = route.unique_id
+        limiter = self.limiters.get(route_id)
+        if limiter is None:
+            limiter = self.limiters[route_id] = create_route_limiter(route_id)
+
+        reason = await limiter.acquire(settings.LOAD_SHEDDING_QUEUE_TIMEOUT_MS / 1000)
+        if reason is not None:
+            load_shed_rejections.labels(route_id, reason).inc()
+            response = JSONResponse(
+                {"detail": "Server is overloaded, please retry later"},
+                status_code=503,
+                headers={
+                    "Retry-After": str(settings.LOAD_SHEDDING_RETRY_AFTER_SECONDS)
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        latency = None
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+            latency = time.perf_counter() - start
+        finally:
+            limiter.release(latency)
+            load_shed_limit.labels(route_id).set(math.floor(limiter.limit.limit))
@@ -0,0 +1,218 @@
+# Prometheus 指标
+# 多进程部署时设置 PROMETHEUS_MULTIPROC_DIR，各 worker 将指标写入该目录下的 mmap 文件，
+# /metrics 汇总所有进程的数据；未设置时只统计当前进程
+import os
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi.routing import APIRoute
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+metrics_path = "/metrics"
+
+# 无标签的仪表盘在定义时即打开 mmap 文件。同一镜像中的 prestart、email-sender、
+# purge-worker 等进程不经过 Web 服务的启动命令，目录可能尚未创建
+if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# 当前请求的路由标签，慢查询日志等需要关联路由的地方使用
+current_route: ContextVar[str | None] = ContextVar("current_route", default=None)
+
+requests_total = Counter(
+    "http_requests_total", "HTTP 请求数", ["route", "method", "status"]
+)
+request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP 请求耗时", ["route", "method"]
+)
+requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "正在处理的 HTTP 请求数",
+    ["route", "method"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_capacity = Gauge(
+    "db_pool_capacity", "连接池最大连接数", multiprocess_mode="livesum"
+)
+db_pool_connections = Gauge(
+    "db_pool_connections", "已建立的数据库连接数", multiprocess_mode="livesum"
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "已被检出使用的数据库连接数", multiprocess_mode="livesum"
+)
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds",
+    "SQL 语句执行耗时",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt 哈希和校验耗时",
+    ["operation"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2),
+)
+
+rate_limit_rejections = Counter(
+    "rate_limit_rejections_total", "被限流拒绝的请求数", ["route"]
+)
+
+circuit_breaker_state = Gauge(
+    "db_circuit_breaker_state",
+    "数据库熔断器状态：0 关闭，1 半开，2 打开",
+    multiprocess_mode="livemax",
+)
+circuit_breaker_rejections = Counter(
+    "db_circuit_breaker_rejections_total", "熔断器打开期间直接拒绝的数据库访问次数"
+)
+deadline_exceeded = Counter(
+    "request_deadline_exceeded_total",
+    "已超过截止时间、在检出数据库连接前被拒绝的请求数",
+    ["route"],
+)
+statement_timeouts = Counter(
+    "db_statement_timeouts_total",
+    "超过请求截止时间被 statement_timeout 取消的 SQL 语句数",
+    ["route"],
+)
+
+load_shed_rejections = Counter(
+    "load_shed_rejections_total", "被过载保护拒绝的请求数", ["route", "reason"]
+)
+load_shed_limit = Gauge(
+    "load_shed_concurrency_limit",
+    "过载保护当前的并发上限",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+
+
+def match_route(scope: Scope) -> BaseRoute | None:
+    """中间件在路由之前执行，需要自行匹配请求对应的路由"""
+    route: BaseRoute | None = scope.get("route")
+    if route is None:
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return route
+
+
+def route_id(scope: Scope) -> str:
+    """
+    按路由匹配得到指标标签：API 路由使用 custom_generate_unique_id 生成的 id，
+    其他路由使用路径模板，未匹配的请求统一归为 unmatched，避免标签数量随 URL 增长
+    """
+    route = match_route(scope)
+    if isinstance(route, APIRoute):
+        return route.unique_id
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """按路由统计请求数、耗时和正在处理的请求数"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == metrics_path:
+            await self.app(scope, receive, send)
+            return
+        route = route_id(scope)
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = requests_in_progress.labels(route, method)
+        in_progress.inc()
+        reset = current_route.set(route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_route.reset(reset)
+            request_duration.labels(route, method).observe(time.perf_counter() - start)
+            requests_total.labels(route, method, str(status)).inc()
+            in_progress.dec()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """通过连接池和执行事件记录连接池使用情况及每条 SQL 的耗时"""
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        db_pool_capacity.inc(pool.size() + pool._max_overflow)
+
+    @event.listens_for(pool, "connect")
+    def _connect(*_: Any) -> None:
+        db_pool_connections.inc()
+
+    @event.listens_for(pool, "close")
+    def _close(*_: Any) -> None:
+        db_pool_connections.dec()
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(*_: Any) -> None:
+        db_pool_checked_out.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(*_: Any) -> None:
+        db_pool_checked_out.dec()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn: Any, *_: Any) -> None:
+        conn.info.setdefault("statement_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+        elapsed = time.perf_counter() - conn.info["statement_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            operation = "OTHER"
+        db_statement_duration.labels(operation).observe(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: Any) -> None:
+        # 执行出错时不会触发 after_cursor_execute，丢弃对应的开始时间
+        if context.connection is not None and context.connection.info.get(
+            "statement_start"
+        ):
+            context.connection.info["statement_start"].pop()
+
+
+def metrics_endpoint(_request: Request) -> Response:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead(pid: int) -> None:
+    """删除已退出 worker 的 live 仪表盘文件，/metrics 不再汇总其最后的值"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)  # type: ignore[no-untyped-call]
@@ -0,0 +1,186 @@
+# OpenTelemetry SDK 相关实现，只在启用链路追踪时由 app.core.tracing 导入
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import httpx
+import orjson
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import (
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanKind
+from opentelemetry.util.types import Attributes
+
+route_attribute = "app.route"
+
+
+class RouteSampler(Sampler):
+    """按 app.route 属性选择采样比例，同一 trace id 的采样结果在各进程间一致"""
+
+    def __init__(self, rate: float, route_rates: dict[str, float]) -> None:
+        self.default = TraceIdRatioBased(rate)
+        self.routes = {
+            route: TraceIdRatioBased(route_rate)
+            for route, route_rate in route_rates.items()
+        }
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: Any = None,
+    ) -> SamplingResult:
+        route = attributes.get(route_attribute) if attributes else None
+        sampler = self.routes.get(str(route), self.default)
+        return sampler.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+
+    def get_description(self) -> str:
+        return f"RouteSampler{{{self.default.get_description()}}}"
+
+
+def encode_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, list | tuple):
+        return {"arrayValue": {"values": [encode_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def encode_attributes(attributes: Attributes) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": encode_value(value)}
+        for key, value in (attributes or {}).items()
+    ]
+
+
+def encode_span(span: ReadableSpan) -> dict[str, Any]:
+    context = span.get_span_context()
+    assert context is not None
+    return {
+        "traceId": f"{context.trace_id:032x}",
+        "spanId": f"{context.span_id:016x}",
+        "parentSpanId": f"{span.parent.span_id:016x}" if span.parent else "",
+        "name": span.name,
+        # SDK 的 SpanKind 从 INTERNAL=0 开始，OTLP 中 0 表示未指定
+        "kind": span.kind.value + 1,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": encode_attributes(span.attributes),
+        "events": [
+            {
+                "timeUnixNano": str(event.timestamp),
+                "name": event.name,
+                "attributes": encode_attributes(event.attributes),
+            }
+            for event in span.events
+        ],
+        "status": {
+            "code": span.status.status_code.value,
+            "message": span.status.description or "",
+        },
+    }
+
+
+def encode_spans(spans: Sequence[ReadableSpan]) -> bytes:
+    """编码为 OTLP/JSON 的 ExportTraceServiceRequest"""
+    return orjson.dumps(
+        {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": encode_attributes(spans[0].resource.attributes)
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app"},
+                            "spans": [encode_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+    )
+
+
+class OTLPJsonFileExporter(SpanExporter):
+    """每批 span 写为一行 OTLP/JSON，可由 collector 的 otlpjsonfile receiver 读取"""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if not spans:
+            return SpanExportResult.SUCCESS
+        line = encode_spans(spans) + b"\n"
+        with self.lock, self.path.open("ab") as f:
+            f.write(line)
+        return SpanExportResult.SUCCESS
+
+
+class OTLPJsonHttpExporter(SpanExporter):
+    """以 OTLP/HTTP 的 JSON 编码发送到收集器，如 http://collector:4318/v1/traces"""
+
+    def __init__(self, endpoint: str, timeout: float = 10.0) -> None:
+        self.endpoint = endpoint
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if not spans:
+            return SpanExportResult.SUCCESS
+        try:
+            response = self.client.post(
+                self.endpoint,
+                content=encode_spans(spans),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        self.client.close()
+
+
+def create_tracer_provider(
+    service_name: str,
+    rate: float,
+    route_rates: dict[str, float],
+    export_file: str | None,
+    otlp_endpoint: str | None,
+) -> TracerProvider:
+    # 上游请求带有 traceparent 时沿用其采样结果，否则按路由比例采样
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(RouteSampler(rate, route_rates)),
+    )
+    if export_file:
+        provider.add_span_processor(BatchSpanProcessor(OTLPJsonFileExporter(export_file)))
+    if otlp_endpoint:
+        provider.add_span_processor(
+            BatchSpanProcessor(OTLPJsonHttpExporter(otlp_endpoint))
+        )
+    return provider
@@ -0,0 +1,229 @@
+# 按需性能分析：超级用户申请的令牌放在 X-Profile 请求头或 profile 查询参数中，
+# 该请求的接口函数在 pyinstrument 采样下执行，报告连同执行的 SQL 语句保存在 PROFILE_DIR
+import functools
+import inspect
+import time
+import uuid
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import parse_qs
+
+import anyio.to_thread
+import jwt
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from jwt.exceptions import InvalidTokenError
+from sqlalchemy import Engine, event
+from starlette.routing import request_response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import security
+from app.core.config import settings
+from app.models import ProfiledStatement, ProfileReport
+from app.utils import get_beijing_time
+
+profile_header = b"x-profile"
+profile_param = "profile"
+# pyinstrument 采样间隔（秒）
+sample_interval = 0.001
+
+
+@dataclass
+class RequestProfile:
+    id: uuid.UUID
+    method: str
+    path: str
+    statements: list[ProfiledStatement] = field(default_factory=list)
+    # 接口函数执行期间采集的 pyinstrument Session
+    session: Any = None
+
+
+# 只有携带有效令牌的请求才会设置，线程池中执行的依赖和接口函数继承该上下文
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def get_profile_token(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == profile_header:
+            token: str = value.decode("latin-1")
+            return token
+    query_string: bytes = scope["query_string"]
+    if profile_param.encode() in query_string:
+        values = parse_qs(query_string.decode("latin-1")).get(profile_param)
+        if values:
+            return values[0]
+    return None
+
+
+def verify_profile_token(token: str) -> bool:
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+        )
+    except InvalidTokenError:
+        return False
+    return "profile" in payload
+
+
+def profile_path(profile_id: uuid.UUID, suffix: str) -> Path:
+    return Path(settings.PROFILE_DIR) / f"{profile_id}.{suffix}"
+
+
+def save_report(profile: RequestProfile, status_code: int, duration_ms: float) -> None:
+    from pyinstrument.renderers import HTMLRenderer
+
+    report = ProfileReport(
+        id=profile.id,
+        method=profile.method,
+        path=profile.path,
+        status_code=status_code,
+        duration_ms=round(duration_ms, 2),
+        created_at=get_beijing_time(),
+        statements=profile.statements,
+    )
+    Path(settings.PROFILE_DIR).mkdir(parents=True, exist_ok=True)
+    profile_path(profile.id, "json").write_text(report.model_dump_json())
+    if profile.session is not None:
+        html = HTMLRenderer().render(profile.session)
+        profile_path(profile.id, "html").write_text(html)
+
+
+def profiled(call: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    包装接口函数：同步接口在线程池中执行，只有在执行接口的线程上启动采样才能看到调用栈。
+    未处于性能分析的请求只多一次 ContextVar 读取
+    """
+
+    def start(async_mode: Literal["enabled", "disabled"]) -> Any:
+        from pyinstrument import Profiler
+
+        profiler = Profiler(interval=sample_interval, async_mode=async_mode)
+        profiler.start()
+        return profiler
+
+    if inspect.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            profile = current_profile.get()
+            if profile is None:
+                return await call(*args, **kwargs)
+            profiler = start("enabled")
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                profile.session = profiler.stop()
+
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profile = current_profile.get()
+        if profile is None:
+            return call(*args, **kwargs)
+        profiler = start("disabled")
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profile.session = profiler.stop()
+
+    return wrapper
+
+
+def _before_execute(conn: Any, *_: Any) -> None:
+    if current_profile.get() is not None:
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+    profile = current_profile.get()
+    if profile is not None and conn.info.get("profile_start"):
+        elapsed = time.perf_counter() - conn.info["profile_start"].pop()
+        profile.statements.append(
+            ProfiledStatement(statement=statement, duration_ms=round(elapsed * 1000, 3))
+        )
+
+
+def _handle_error(context: Any) -> None:
+    if context.connection is not None and context.connection.info.get("profile_start"):
+        context.connection.info["profile_start"].pop()
+
+
+def setup_profiling(app: FastAPI) -> None:
+    """在所有路由注册之后调用，包装接口函数并记录所有引擎执行的 SQL"""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = profiled(route.endpoint)
+            # 请求处理函数在创建路由时已根据 dependant 生成，需要重新生成
+            route.app = request_response(route.get_route_handler())
+    if not event.contains(Engine, "before_cursor_execute", _before_execute):
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+class ProfilingMiddleware:
+    """
+    只处理携带性能分析令牌的请求：令牌无效返回 403，有效则记录性能分析报告，
+    并在响应头 X-Profile-Id 中返回报告ID
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = get_profile_token(scope) if scope["type"] == "http" else None
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if not verify_profile_token(token):
+            body = b'{"detail":"Invalid profile token"}'
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 403,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        profile = RequestProfile(uuid.uuid4(), scope["method"], scope["path"])
+        status_code = 500
+        saved = False
+        start = time.perf_counter()
+
+        async def save() -> None:
+            nonlocal saved
+            saved = True
+            duration_ms = (time.perf_counter() - start) * 1000
+            await anyio.to_thread.run_sync(save_report, profile, status_code, duration_ms)
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", str(profile.id).encode()),
+                ]
+            elif not message.get("more_body", False):
+                # 报告写入后再发送最后一块响应体，客户端收到响应时即可查询报告
+                await save()
+            await send(message)
+
+        reset = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            current_profile.reset(reset)
+            if not saved:
+                await save()
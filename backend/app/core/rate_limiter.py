@@ -1,10 +1,12 @@
 # 限流器配置
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from starlette.responses import Response
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
 from app.core.config import settings
+from app.core.metrics import rate_limit_rejections, route_id
 
 
 def init_rate_limiter() -> Limiter:
@@ -21,13 +23,25 @@ def init_rate_limiter() -> Limiter:
     return Limiter(
         key_func=get_remote_address,  # 基于客户端IP限流
         default_limits=current_limits,
-        storage_uri="memory://"  # 个人网站用内存存储，未来可考虑使用 Redis 存储
+        storage_uri="memory://",  # 个人网站用内存存储，未来可考虑使用 Redis 存储
+        enabled=settings.RATE_LIMIT_ENABLED,
     )
 
 
+def rate_limit_exceeded_handler(request: Request, exc: Exception) -> Response:
+    """记录被限流的请求后返回 429"""
+    assert isinstance(exc, RateLimitExceeded)
+    rate_limit_rejections.labels(route_id(request.scope)).inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+# 全局共享的限流器，路由装饰器在导入时即需要该实例
+limiter = init_rate_limiter()
+
+
 def setup_rate_limiter(app: FastAPI, limiter: Limiter) -> None:
     """为FastAPI应用配置限流器和异常处理"""
     # 绑定限流器到应用状态
     app.state.limiter = limiter
     # 添加限流超额异常处理器
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
\ No newline at end of file
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
\ No newline at end of file
@@ -0,0 +1,20 @@
+# 响应序列化
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class ModelJSONResponse(Response):
+    """
+    直接由 pydantic-core 将响应模型序列化为 JSON 字节。
+    路由返回 Response 时 FastAPI 不会再按 response_model 校验和 jsonable_encoder 转换，
+    适用于已从数据库行构造好响应模型的热点列表接口。
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes | memoryview:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
@@ -5,8 +5,12 @@ import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import password_hash_duration
+from app.core.tracing import start_span
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 
 ALGORITHM = "HS256"
@@ -19,9 +23,18 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
+def create_profile_token(subject: str | Any, expires_delta: timedelta) -> str:
+    # 不设置 sub，性能分析令牌不能作为访问令牌使用
+    expire = datetime.now(timezone.utc) + expires_delta
+    to_encode = {"exp": expire, "profile": str(subject)}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with start_span("bcrypt.verify"), password_hash_duration.labels("verify").time():
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with start_span("bcrypt.hash"), password_hash_duration.labels("hash").time():
+        return pwd_context.hash(password)
@@ -0,0 +1,193 @@
+# 慢查询日志：耗时超过 SLOW_QUERY_THRESHOLD_MS 的语句记录日志并按语句结构汇总，
+# PostgreSQL 下按 SLOW_QUERY_EXPLAIN_SAMPLE_RATE 的比例在另一个连接上捕获执行计划
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+from app.core.metrics import current_route
+from app.models import SlowQueryPublic
+from app.utils import get_beijing_time
+
+logger = logging.getLogger(__name__)
+
+# 汇总的语句结构数量上限，超过后新的结构只记录日志
+max_shapes = 1000
+
+_whitespace = re.compile(r"\s+")
+# IN 参数展开后的占位符列表，如 IN (%(id_1_1)s, %(id_1_2)s)，不同长度视为同一结构
+_placeholder_list = re.compile(
+    r"\(\s*(?:%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))+\s*\)"
+)
+
+# 加锁读取的语句（如发件箱、清理任务的 SKIP LOCKED 领取），再次执行会抢走后台进程要领取的行
+_locking_clause = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+|KEY\s+)?(?:UPDATE|SHARE)\b", re.IGNORECASE
+)
+
+# EXPLAIN ANALYZE 会再执行一次原语句，放到单独的线程中执行，不延长请求耗时
+explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+
+@dataclass
+class SlowQueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_route: str | None = None
+    last_seen_at: datetime | None = None
+    plan: str | None = None
+
+
+slow_queries: dict[str, SlowQueryStats] = {}
+# 已提交 EXPLAIN、尚未完成的语句结构
+explaining: set[str] = set()
+slow_queries_lock = threading.Lock()
+
+
+def statement_shape(statement: str) -> str:
+    shape = _whitespace.sub(" ", statement).strip()
+    return _placeholder_list.sub("(...)", shape)
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> Any:
+    """日志中只保留参数名和类型，不记录参数值"""
+    if executemany:
+        return f"<{len(parameters)} rows>"
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def record_slow_query(shape: str, duration_ms: float, route: str | None) -> None:
+    with slow_queries_lock:
+        stats = slow_queries.get(shape)
+        if stats is None:
+            if len(slow_queries) >= max_shapes:
+                return
+            stats = slow_queries[shape] = SlowQueryStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        stats.last_route = route
+        stats.last_seen_at = get_beijing_time()
+
+
+def capture_plan(engine: Engine, shape: str, statement: str, parameters: Any) -> None:
+    """
+    在另一个连接上执行 EXPLAIN (ANALYZE, BUFFERS)，执行后回滚。
+    以 SLOW_QUERY_EXPLAIN_TIMEOUT_MS 限制再次执行的时间，数据库变慢时不会长时间占用连接
+    """
+    plan = None
+    try:
+        with engine.connect() as connection:
+            connection.execution_options(slow_query_log=False)
+            connection.exec_driver_sql(
+                "SET LOCAL statement_timeout = "
+                f"{int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"
+            )
+            result = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            plan = "\n".join(row[0] for row in result)
+            connection.rollback()
+    except Exception as e:
+        logger.warning(f"Failed to capture plan for slow query: {e}")
+    finally:
+        with slow_queries_lock:
+            explaining.discard(shape)
+            if plan is not None and shape in slow_queries:
+                slow_queries[shape].plan = plan
+
+
+def should_explain(engine: Engine, statement: str) -> bool:
+    # 只对不加锁的查询语句执行 EXPLAIN ANALYZE，避免重复执行写操作或抢占行锁
+    return (
+        engine.dialect.name == "postgresql"
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and not _locking_clause.search(statement)
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    )
+
+
+def reserve_explain(shape: str) -> bool:
+    """
+    每个语句结构只捕获一次执行计划：已有执行计划或已在队列中时返回 False，
+    数据库变慢时大量慢查询不会逐个排队再执行一次
+    """
+    with slow_queries_lock:
+        stats = slow_queries.get(shape)
+        if stats is None or stats.plan is not None or shape in explaining:
+            return False
+        explaining.add(shape)
+        return True
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn: Any, *_: Any) -> None:
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(
+        conn: Any,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        _context: Any,
+        executemany: bool,
+    ) -> None:
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+        if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+        if not conn.get_execution_options().get("slow_query_log", True):
+            return
+        route = current_route.get()
+        shape = statement_shape(statement)
+        logger.warning(
+            f"Slow query ({duration_ms:.1f} ms, route {route or '-'}): {shape} "
+            f"parameters={redact_parameters(parameters, executemany)}"
+        )
+        record_slow_query(shape, duration_ms, route)
+        if (
+            not executemany
+            and should_explain(engine, statement)
+            and reserve_explain(shape)
+        ):
+            explain_executor.submit(capture_plan, engine, shape, statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: Any) -> None:
+        if context.connection is not None and context.connection.info.get(
+            "slow_query_start"
+        ):
+            context.connection.info["slow_query_start"].pop()
+
+
+def get_slow_queries(limit: int) -> tuple[list[SlowQueryPublic], int]:
+    """按最大耗时从高到低返回慢查询统计"""
+    with slow_queries_lock:
+        items = [
+            SlowQueryPublic(
+                statement=shape,
+                count=stats.count,
+                total_ms=round(stats.total_ms, 1),
+                max_ms=round(stats.max_ms, 1),
+                last_route=stats.last_route,
+                last_seen_at=stats.last_seen_at,
+                plan=stats.plan,
+            )
+            for shape, stats in slow_queries.items()
+        ]
+    items.sort(key=lambda item: item.max_ms, reverse=True)
+    return items[:limit], len(items)
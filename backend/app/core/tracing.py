@@ -0,0 +1,169 @@
+# 链路追踪：基于 OpenTelemetry SDK，按路由配置头部采样比例，
+# span 以 OTLP/JSON 格式写入本地文件或发送到 OTLP/HTTP 收集器。
+# 未配置采样比例或导出目标时不导入 OpenTelemetry，埋点处只多一次全局变量判断
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import match_route, route_id
+
+# 启用后为 opentelemetry 的 Tracer 和 TracerProvider
+tracer: Any = None
+provider: Any = None
+
+
+def tracing_enabled() -> bool:
+    sampled = settings.TRACING_SAMPLE_RATE > 0 or any(
+        rate > 0 for rate in settings.TRACING_ROUTE_SAMPLE_RATES.values()
+    )
+    exported = bool(settings.TRACING_EXPORT_FILE or settings.TRACING_OTLP_ENDPOINT)
+    return sampled and exported
+
+
+def setup_tracing(service_name: str) -> None:
+    global tracer, provider
+    if tracer is not None or not tracing_enabled():
+        return
+    from app.core.otel import create_tracer_provider
+
+    provider = create_tracer_provider(
+        service_name,
+        rate=settings.TRACING_SAMPLE_RATE,
+        route_rates=settings.TRACING_ROUTE_SAMPLE_RATES,
+        export_file=settings.TRACING_EXPORT_FILE,
+        otlp_endpoint=settings.TRACING_OTLP_ENDPOINT,
+    )
+    tracer = provider.get_tracer("app")
+
+
+def shutdown_tracing() -> None:
+    """导出缓冲中剩余的 span"""
+    global tracer, provider
+    if provider is not None:
+        provider.shutdown()
+    tracer = provider = None
+
+
+def current_span_recording() -> bool:
+    from opentelemetry import trace
+
+    return bool(trace.get_current_span().is_recording())
+
+
+@contextmanager
+def start_span(name: str, attributes: dict[str, Any] | None = None) -> Iterator[Any]:
+    """在当前已采样的 span 下创建子 span，未启用追踪或当前 trace 未被采样时不创建"""
+    if tracer is None or not current_span_recording():
+        yield None
+        return
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+@contextmanager
+def start_trace(name: str, route: str) -> Iterator[Any]:
+    """后台进程中开始新的 trace，按 route 对应的比例采样"""
+    if tracer is None:
+        yield None
+        return
+    from app.core.otel import route_attribute
+
+    with tracer.start_as_current_span(name, attributes={route_attribute: route}) as span:
+        yield span
+
+
+def instrument_tracing(engine: Engine) -> None:
+    """为已采样请求中的每条 SQL 语句创建 span，语句中不包含参数值"""
+    if tracer is None:
+        return
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+
+    from app.core.slow_queries import statement_shape
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+        span = None
+        if tracer is not None and current_span_recording():
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+            span = tracer.start_span(
+                operation or "SQL",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "db.system": engine.dialect.name,
+                    "db.operation.name": operation,
+                    "db.query.text": statement_shape(statement),
+                },
+            )
+        conn.info.setdefault("trace_span", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn: Any, *_: Any) -> None:
+        span = conn.info["trace_span"].pop()
+        if span is not None:
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: Any) -> None:
+        if context.connection is None or not context.connection.info.get("trace_span"):
+            return
+        span = context.connection.info["trace_span"].pop()
+        if span is not None:
+            span.record_exception(context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+
+
+class TracingMiddleware:
+    """为每个请求创建 SERVER span，沿用请求头 traceparent 中的 trace 和采样结果"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if tracer is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+        from opentelemetry.trace.propagation.tracecontext import (
+            TraceContextTextMapPropagator,
+        )
+
+        from app.core.otel import route_attribute
+
+        carrier = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in (b"traceparent", b"tracestate")
+        }
+        parent = TraceContextTextMapPropagator().extract(carrier) if carrier else None
+        route = match_route(scope)
+        template = getattr(route, "path", None)
+        method = scope["method"]
+        attributes = {
+            route_attribute: route_id(scope),
+            "http.request.method": method,
+            "url.path": scope["path"],
+        }
+        if template:
+            attributes["http.route"] = template
+
+        with tracer.start_as_current_span(
+            f"{method} {template}" if template else method,
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes=attributes,
+        ) as span:
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
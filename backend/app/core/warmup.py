@@ -0,0 +1,65 @@
+# 启动预热：在接收请求前建立数据库连接、编译热点 SQL、加载密码哈希后端
+import logging
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.security import pwd_context
+from app.crud.projects import crud_get_projects, crud_get_projects_version
+from app.crud.users import crud_get_user_by_email
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_pool(engine: Engine, connections: int) -> None:
+    """同时检出多个连接迫使连接池建立连接，归还后保留在池中供请求使用"""
+    opened = [engine.connect() for _ in range(connections)]
+    for connection in opened:
+        connection.close()
+
+
+def warm_up_statements(engine: Engine) -> None:
+    """
+    以不会命中数据的参数执行一次热点查询，SQL 编译结果进入 SQLAlchemy 的编译缓存，
+    同时完成 ORM 映射配置。查询结构需与请求中的一致，参数值不影响缓存
+    """
+    missing_id = uuid.UUID(int=0)
+    with Session(engine) as session:
+        # get_current_user
+        session.get(User, missing_id)
+        crud_get_user_by_email(session=session, email="warmup@example.com")
+        # read_projects，超级用户和普通用户的查询结构不同
+        for owner_id in (None, missing_id):
+            crud_get_projects_version(session=session, owner_id=owner_id)
+            crud_get_projects(session=session, owner_id=owner_id, skip=0, limit=100)
+
+
+def warm_up_serializers(app: FastAPI) -> None:
+    """解析响应模型中的前向引用，完成 pydantic 校验器和序列化器的构建"""
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        model = route.response_model
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            model.model_rebuild()
+
+
+def warm_up(app: FastAPI, engine: Engine) -> None:
+    start = time.perf_counter()
+    # 加载 bcrypt 后端并完成 passlib 的自检，避免首个登录请求承担
+    pwd_context.handler().get_backend()
+    warm_up_serializers(app)
+    try:
+        warm_up_pool(engine, settings.DB_POOL_SIZE)
+        warm_up_statements(engine)
+    except Exception as e:
+        # 数据库暂时不可用时不阻止启动，由就绪检查反映数据库状态
+        logger.warning(f"Database warmup failed: {e}")
+    logger.info(f"Warmup finished in {(time.perf_counter() - start) * 1000:.0f} ms")
@@ -0,0 +1,82 @@
+# worker 数和线程池大小：worker 数默认取容器可用的 CPU 数（考虑 cgroup 配额），
+# 同步路由所用线程池的大小与数据库连接池容量一致，线程不会阻塞在等待连接上
+#
+#     WEB_CONCURRENCY=$(python -m app.core.workers) fastapi run app/main.py
+import logging
+import math
+import os
+import sys
+from pathlib import Path
+
+import anyio.to_thread
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+cgroup_root = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_limit(root: Path = cgroup_root) -> float | None:
+    """读取 cgroup 的 CPU 配额，未限制时返回 None"""
+    # cgroup v2：cpu.max 内容为 "<quota> <period>"，不限制时 quota 为 max
+    cpu_max = root / "cpu.max"
+    if cpu_max.exists():
+        quota, period = cpu_max.read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    # cgroup v1：不限制时 quota 为 -1
+    for directory in ("cpu", "cpu,cpuacct"):
+        quota_file = root / directory / "cpu.cfs_quota_us"
+        period_file = root / directory / "cpu.cfs_period_us"
+        if quota_file.exists() and period_file.exists():
+            quota_us = int(quota_file.read_text())
+            if quota_us <= 0:
+                return None
+            return quota_us / int(period_file.read_text())
+    return None
+
+
+def available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit(cgroup_root)
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return cpus
+
+
+def worker_count() -> int:
+    return settings.WEB_CONCURRENCY or available_cpus()
+
+
+def pool_capacity() -> int:
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def threadpool_size() -> int:
+    return settings.THREADPOOL_SIZE or pool_capacity()
+
+
+def configure_threadpool() -> int:
+    """设置当前事件循环默认线程池的大小，需在事件循环中调用"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = threadpool_size()
+    return int(limiter.total_tokens)
+
+
+def check_connection_budget(workers: int) -> bool:
+    connections = workers * pool_capacity()
+    if connections > settings.DB_CONNECTION_BUDGET:
+        logger.warning(
+            f"{workers} workers x {pool_capacity()} pooled connections = {connections} "
+            f"exceeds DB_CONNECTION_BUDGET={settings.DB_CONNECTION_BUDGET}, "
+            "requests may fail with too many connections"
+        )
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.stdout.write(f"{worker_count()}\n")
@@ -0,0 +1,19 @@
+from sqlmodel import Session
+
+from app.models import EmailOutbox
+from app.utils import EmailData
+
+
+def crud_enqueue_email(
+    *, session: Session, email_to: str, email_data: EmailData
+) -> EmailOutbox:
+    """
+    写入发件箱，不提交事务，由调用方与触发邮件的数据变更一起提交
+    """
+    db_email = EmailOutbox(
+        email_to=email_to,
+        subject=email_data.subject,
+        html_content=email_data.html_content,
+    )
+    session.add(db_email)
+    return db_email
@@ -1,8 +1,10 @@
 import uuid
+from datetime import datetime
 
-from sqlmodel import Session
+from sqlalchemy import ColumnElement
+from sqlmodel import Session, col, func, select
 
-from app.models import Project, ProjectCreate
+from app.models import Project, ProjectCreate, ProjectPublic
 
 
 def crud_create_project(*, session: Session, project_in: ProjectCreate, owner_id: uuid.UUID) -> Project:
@@ -11,3 +13,49 @@ def crud_create_project(*, session: Session, project_in: ProjectCreate, owner_id
     session.commit()
     session.refresh(db_project)
     return db_project
+
+
+def _visible_projects(owner_id: uuid.UUID | None) -> list[ColumnElement[bool]]:
+    # owner_id 为空时（超级用户）可见所有未删除的项目
+    conditions: list[ColumnElement[bool]] = [col(Project.deleted_at).is_(None)]
+    if owner_id is not None:
+        conditions.append(col(Project.owner_id) == owner_id)
+    return conditions
+
+
+def crud_get_projects_version(
+    *, session: Session, owner_id: uuid.UUID | None
+) -> tuple[int, datetime | None]:
+    """可见项目的总数和最近更新时间，一次查询得到，用于生成列表 ETag"""
+    statement = select(func.count(), func.max(Project.updated_at)).where(
+        *_visible_projects(owner_id)
+    )
+    count, last_updated = session.exec(statement).one()
+    return count, last_updated
+
+
+def crud_get_projects(
+    *,
+    session: Session,
+    owner_id: uuid.UUID | None,
+    skip: int,
+    limit: int,
+    after: uuid.UUID | None = None,
+) -> list[ProjectPublic]:
+    """
+    只查询响应需要的列，直接构造响应模型，避免 ORM 对象和二次校验。
+    按 id 排序，传入 after 时从该 id 之后继续（游标分页），不再扫描并丢弃前面的行
+    """
+    columns = [getattr(Project, name) for name in ProjectPublic.model_fields]
+    conditions = _visible_projects(owner_id)
+    if after is not None:
+        conditions.append(col(Project.id) > after)
+    statement = (
+        select(*columns)
+        .where(*conditions)
+        .order_by(col(Project.id))
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = session.exec(statement).all()
+    return [ProjectPublic.model_construct(**row._mapping) for row in rows]
@@ -0,0 +1,48 @@
+import uuid
+
+from sqlmodel import Session, col, update
+
+from app.models import Project, PurgeJob, PurgeTarget, User
+from app.utils import get_beijing_time
+
+
+def crud_soft_delete_user(
+    *, session: Session, user: User, requested_by_id: uuid.UUID | None = None
+) -> PurgeJob:
+    """标记用户及其项目为已删除，并创建后台清理任务"""
+    now = get_beijing_time()
+    user.deleted_at = now
+    session.add(user)
+    # 用户拥有的项目数量有限，一条 UPDATE 即可同时隐藏
+    statement = (
+        update(Project)
+        .where(col(Project.owner_id) == user.id, col(Project.deleted_at).is_(None))
+        .values(deleted_at=now)
+    )
+    session.exec(statement)
+    purge_job = PurgeJob(
+        target_type=PurgeTarget.USER,
+        target_id=user.id,
+        requested_by_id=requested_by_id,
+    )
+    session.add(purge_job)
+    session.commit()
+    session.refresh(purge_job)
+    return purge_job
+
+
+def crud_soft_delete_project(
+    *, session: Session, project: Project, requested_by_id: uuid.UUID | None = None
+) -> PurgeJob:
+    """标记项目为已删除，并创建后台清理任务"""
+    project.deleted_at = get_beijing_time()
+    session.add(project)
+    purge_job = PurgeJob(
+        target_type=PurgeTarget.PROJECT,
+        target_id=project.id,
+        requested_by_id=requested_by_id,
+    )
+    session.add(purge_job)
+    session.commit()
+    session.refresh(purge_job)
+    return purge_job
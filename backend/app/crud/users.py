@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlmodel import Session, col, select
 
 from app.core.security import get_password_hash, verify_password
 
@@ -36,7 +36,8 @@ def crud_update_user(*, session: Session, db_user: User, user_in: UserUpdate) ->
 
 
 def crud_get_user_by_email(*, session: Session, email: str) -> User | None:
-    statement = select(User).where(User.email == email)
+    """已软删除的用户视为不存在，邮箱可重新注册"""
+    statement = select(User).where(User.email == email, col(User.deleted_at).is_(None))
     session_user = session.exec(statement).first()
     return session_user
 
@@ -0,0 +1,87 @@
+import logging
+import time
+from datetime import timedelta
+
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+from app.core.tracing import instrument_tracing, setup_tracing, start_trace
+from app.models import EmailOutbox, EmailStatus
+from app.utils import EmailData, get_beijing_time, send_email_batch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def claim_due_emails(session: Session) -> list[EmailOutbox]:
+    """领取一批到期待发送的邮件，行锁持有到提交，多个进程并行时通过 SKIP LOCKED 避免重复发送"""
+    statement = (
+        select(EmailOutbox)
+        .where(
+            col(EmailOutbox.status) == EmailStatus.PENDING,
+            col(EmailOutbox.next_attempt_at) <= get_beijing_time(),
+        )
+        .order_by(col(EmailOutbox.next_attempt_at))
+        .limit(settings.EMAIL_SENDER_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    return list(session.exec(statement).all())
+
+
+def record_result(email: EmailOutbox, error: Exception | None) -> None:
+    """
+    记录发送结果。邮件内容可能包含初始密码、重置密码令牌，
+    发送成功或最终失败后清空，不在发件箱中长期保存
+    """
+    email.attempts += 1
+    if error is None:
+        email.status = EmailStatus.SENT
+        email.sent_at = get_beijing_time()
+        email.html_content = ""
+        return
+    email.last_error = str(error)[:1000]
+    if email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+        email.status = EmailStatus.FAILED
+        email.html_content = ""
+    else:
+        # 指数退避：30s, 60s, 120s...
+        backoff = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (email.attempts - 1)
+        email.next_attempt_at = get_beijing_time() + timedelta(seconds=backoff)
+
+
+def send_pending_emails(session: Session) -> int:
+    """发送所有到期的邮件，每批复用同一个 SMTP 连接，返回处理的邮件数"""
+    count = 0
+    while emails := claim_due_emails(session):
+        errors = send_email_batch(
+            messages=[
+                (
+                    email.email_to,
+                    EmailData(html_content=email.html_content, subject=email.subject),
+                )
+                for email in emails
+            ]
+        )
+        for email, error in zip(emails, errors, strict=True):
+            record_result(email, error)
+            session.add(email)
+        session.commit()
+        count += len(emails)
+    return count
+
+
+def main() -> None:
+    logger.info("Starting email sender")
+    setup_tracing(f"{settings.PROJECT_NAME}-email-sender")
+    engine = create_db_engine()
+    instrument_tracing(engine)
+    while True:
+        with start_trace("send_pending_emails", "email-sender"), Session(engine) as session:
+            processed = send_pending_emails(session)
+        if not processed:
+            time.sleep(settings.EMAIL_SENDER_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,98 @@
-import sentry_sdk
-import fastapi_cdn_host
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.core.circuit_breaker import instrument_circuit_breaker
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.db import create_db_engine
+from app.core.deadlines import DeadlineMiddleware
+from app.core.docs import setup_docs
+from app.core.health import HealthCheckMiddleware
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.core.metrics import (
+    MetricsMiddleware,
+    instrument_engine,
+    metrics_endpoint,
+    metrics_path,
+)
+from app.core.profiling import ProfilingMiddleware, setup_profiling
 
-from app.core.rate_limiter import init_rate_limiter, setup_rate_limiter
+from app.core.rate_limiter import limiter, setup_rate_limiter
+from app.core.slow_queries import instrument_slow_queries
+from app.core.tracing import (
+    TracingMiddleware,
+    instrument_tracing,
+    setup_tracing,
+    shutdown_tracing,
+)
+from app.core.warmup import warm_up
+from app.core.workers import (
+    check_connection_budget,
+    configure_threadpool,
+    worker_count,
+)
+from app.utils import precompile_email_templates
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
-    sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
+    # 只在启用时导入 sentry，减少冷启动时间
+    import sentry_sdk
+
+    # Sentry 性能追踪与内置链路追踪使用相同的采样比例
+    sentry_sdk.init(
+        dsn=str(settings.SENTRY_DSN), traces_sample_rate=settings.TRACING_SAMPLE_RATE
+    )
+
+# 链路追踪，只在配置了采样比例和导出目标时导入 OpenTelemetry
+setup_tracing(settings.PROJECT_NAME)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # 线程池与连接池容量一致，同步路由不会因等待连接而占住线程
+    configure_threadpool()
+    check_connection_budget(worker_count())
+    app.state.engine = create_db_engine()
+    instrument_engine(app.state.engine)
+    instrument_slow_queries(app.state.engine)
+    instrument_tracing(app.state.engine)
+    instrument_circuit_breaker(app.state.engine)
+    app.state.warm = False
+    precompile_email_templates()
+    # 预加载模式下已在主进程中生成
+    if not openapi_payload.variants:
+        openapi_payload.prepare()
+    if settings.WARMUP_ENABLED:
+        # 预热完成后才开始接收请求，数据库操作放在线程中执行
+        await run_in_threadpool(warm_up, app, app.state.engine)
+    app.state.warm = True
+    yield
+    app.state.engine.dispose()
+    shutdown_tracing()
+
 
 app: FastAPI = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # 文档页由 setup_docs 注册，使用本地静态资源
+    docs_url=None,
+    redoc_url=None,
     generate_unique_id_function=custom_generate_unique_id,
 )
 
-# 国内使用在线swagger，避免无法加载
-fastapi_cdn_host.patch_docs(app)
-
-# 初始化并配置限流器
-limiter = init_rate_limiter()
+# 配置限流器
 setup_rate_limiter(app, limiter)
 
 # CORS配置
@@ -39,4 +105,36 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+# 响应压缩，按 Accept-Encoding 协商 zstd / br / gzip
+app.add_middleware(CompressionMiddleware)
+
+# 按需性能分析，只处理携带性能分析令牌的请求
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# 过载保护，按路由限制并发并排队，被拒绝的请求同样计入请求指标
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+
+# 按路由统计请求指标，包含压缩等内层中间件的耗时
+app.add_middleware(MetricsMiddleware)
+
+# 链路追踪，请求 span 覆盖其他中间件的耗时
+app.add_middleware(TracingMiddleware)
+
+# 记录请求到达时间，在过载保护队列中等待的时间也计入请求截止时间
+app.add_middleware(DeadlineMiddleware)
+
+# 存活/就绪探针，必须最后注册，作为最外层中间件不经过其他中间件
+app.add_middleware(HealthCheckMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+if settings.PROFILING_ENABLED:
+    setup_profiling(app)
+
+# Prometheus 指标
+app.add_route(metrics_path, metrics_endpoint, include_in_schema=False)
+
+# 文档页和静态资源从应用本地提供；OpenAPI 文档在启动时序列化并压缩一次
+openapi_payload = setup_docs(app, f"{settings.API_V1_STR}/openapi.json")
@@ -1,6 +1,10 @@
+import os
+import threading
+import time
 import uuid
 
 from pydantic import EmailStr
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 from datetime import datetime
 from typing import Optional
@@ -9,6 +13,36 @@ from enum import Enum
 from app.utils import get_beijing_time
 
 
+# ==================== 主键生成 ====================
+uuid7_lock = threading.Lock()
+# 上一次生成的 48 位毫秒时间戳和 12 位毫秒内序号
+uuid7_last = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    按 RFC 9562 生成时间有序的 UUIDv7：48 位毫秒时间戳，rand_a 的 12 位为毫秒内的时间小数，
+    同一进程内时间未前进时递增，保证单调；其余 62 位随机。新行按时间顺序追加到主键 B 树末尾，
+    避免 uuid4 的随机插入造成页分裂和缓存命中率下降。与已有的 uuid4 主键共存于同一列，
+    按 id 排序时旧行的位置随机，新行按创建顺序排列
+    """
+    global uuid7_last
+    ns = time.time_ns()
+    timestamp = (ns // 1_000_000) << 12 | (ns % 1_000_000) * 4096 // 1_000_000
+    with uuid7_lock:
+        if timestamp <= uuid7_last:
+            timestamp = uuid7_last + 1
+        uuid7_last = timestamp
+    random = int.from_bytes(os.urandom(8), "big") & (1 << 62) - 1
+    return uuid.UUID(
+        int=(timestamp >> 12) << 80
+        | 7 << 76
+        | (timestamp & 0xFFF) << 64
+        | 0b10 << 62
+        | random
+    )
+
+
 # ==================== 枚举类型定义 ====================
 class TaskStatus(str, Enum):
     """任务状态枚举"""
@@ -24,24 +58,45 @@ class TaskPriority(str, Enum):
     HIGH = "high"
 
 
+class PurgeTarget(str, Enum):
+    """后台清理对象类型枚举"""
+    USER = "user"
+    PROJECT = "project"
+
+
+class EmailStatus(str, Enum):
+    """邮件发送状态枚举"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class PurgeStatus(str, Enum):
+    """后台清理任务状态枚举"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 # ==================== 关联表模型 ====================
 # 任务协作者关联表 - 多对多关系表
 class TaskCollaboratorLink(SQLModel, table=True):
     __tablename__ = "task_collaborator_association"
-    task_id: uuid.UUID = Field(default=None, foreign_key="task.id", primary_key=True)
-    user_id: uuid.UUID = Field(default=None, foreign_key="user.id", primary_key=True)
+    task_id: uuid.UUID = Field(default=None, foreign_key="task.id", primary_key=True, ondelete="CASCADE")
+    user_id: uuid.UUID = Field(default=None, foreign_key="user.id", primary_key=True, ondelete="CASCADE")
 
 
 # 项目协作者关联表 - 多对多关系表
 class ProjectCollaboratorLink(SQLModel, table=True):
     __tablename__ = "project_collaborator_association"
-    project_id: uuid.UUID = Field(default=None, foreign_key="project.id", primary_key=True)
-    user_id: uuid.UUID = Field(default=None, foreign_key="user.id", primary_key=True)
+    project_id: uuid.UUID = Field(default=None, foreign_key="project.id", primary_key=True, ondelete="CASCADE")
+    user_id: uuid.UUID = Field(default=None, foreign_key="user.id", primary_key=True, ondelete="CASCADE")
 
 
 # ==================== 用户相关模型 ====================
 class UserBase(SQLModel):
-    email: EmailStr = Field(unique=True, index=True, max_length=255, description="用户邮箱")
+    email: EmailStr = Field(max_length=255, description="用户邮箱")
     is_active: bool = Field(default=True, description="账户激活状态")
     is_superuser: bool = Field(default=False, description="管理员权限")
     full_name: str | None = Field(default=None, max_length=255, description="用户全名")
@@ -74,19 +129,42 @@ class UpdatePassword(SQLModel):
 
 # 数据库模型，生成user表
 class User(UserBase, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, description="用户ID")
+    # 邮箱只在未删除的用户中唯一，软删除后等待清理期间可用同一邮箱重新注册
+    __table_args__ = (
+        Index(
+            "ix_user_email",
+            "email",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+    )
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True, description="用户ID")
     hashed_password: str = Field(max_length=255, description="密码哈希值")
-    projects: list["Project"] = Relationship(back_populates="owner", cascade_delete=True)  # 与 Project 的关系，级联删除
-    owned_tasks: list["Task"] = Relationship(back_populates="owner")  # 与 Task 的关系
+    deleted_at: datetime | None = Field(default=None, index=True, description="软删除时间，非空表示等待后台清理")
+    updated_at: datetime = Field(
+        default_factory=get_beijing_time,
+        sa_column_kwargs={"onupdate": get_beijing_time},
+        description="更新时间"
+    )
+    # 级联删除由数据库 ON DELETE CASCADE 完成，passive_deletes 避免删除前加载关联集合
+    projects: list["Project"] = Relationship(
+        back_populates="owner", cascade_delete=True, passive_deletes=True
+    )  # 与 Project 的关系，级联删除
+    owned_tasks: list["Task"] = Relationship(
+        back_populates="owner", cascade_delete=True, passive_deletes=True
+    )  # 与 Task 的关系，级联删除
 
     # 协作者关系 - 多对多
     collaborated_projects: list["Project"] = Relationship(
         back_populates="collaborators",
-        link_model=ProjectCollaboratorLink
+        link_model=ProjectCollaboratorLink,
+        passive_deletes=True
     )
     collaborated_tasks: list["Task"] = Relationship(
         back_populates="collaborators",
-        link_model=TaskCollaboratorLink
+        link_model=TaskCollaboratorLink,
+        passive_deletes=True
     )
 
 
@@ -115,20 +193,26 @@ class ProjectUpdate(ProjectBase):
 
 # 数据库模型，生成project表
 class Project(ProjectBase, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, description="项目ID")
+    # 普通用户按 id 游标分页时走索引范围扫描，不需要排序
+    __table_args__ = (Index("ix_project_owner_id_id", "owner_id", "id"),)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True, description="项目ID")
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE", description="所有者ID")
     owner: Optional["User"] = Relationship(back_populates="projects")  # 与User模型的关系
+    deleted_at: datetime | None = Field(default=None, index=True, description="软删除时间，非空表示等待后台清理")
     created_at: datetime = Field(default_factory=get_beijing_time, description="创建时间")
     updated_at: datetime = Field(
         default_factory=get_beijing_time,
         sa_column_kwargs={"onupdate": get_beijing_time},
         description="更新时间"
     )
-    tasks: list["Task"] = Relationship(back_populates="project")  # 与 Task 的关系
+    tasks: list["Task"] = Relationship(
+        back_populates="project", cascade_delete=True, passive_deletes=True
+    )  # 与 Task 的关系，级联删除
     # 协作者关系 - 多对多
     collaborators: list["User"] = Relationship(
         back_populates="collaborated_projects",
-        link_model=ProjectCollaboratorLink
+        link_model=ProjectCollaboratorLink,
+        passive_deletes=True
     )
 
 
@@ -165,9 +249,9 @@ class TaskUpdate(TaskBase):
 
 # 任务表 task
 class Task(TaskBase, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, description="任务ID")
-    project_id: uuid.UUID = Field(foreign_key="project.id", description="所属项目ID")
-    owner_id: uuid.UUID = Field(foreign_key="user.id", index=True, description="所有者ID")
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True, description="任务ID")
+    project_id: uuid.UUID = Field(foreign_key="project.id", ondelete="CASCADE", description="所属项目ID")
+    owner_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True, description="所有者ID")
     created_at: datetime = Field(default_factory=get_beijing_time, description="创建时间")
     updated_at: datetime = Field(
         default_factory=get_beijing_time,
@@ -179,7 +263,8 @@ class Task(TaskBase, table=True):
     # 协作者关系 - 多对多
     collaborators: list["User"] = Relationship(
         back_populates="collaborated_tasks",
-        link_model=TaskCollaboratorLink
+        link_model=TaskCollaboratorLink,
+        passive_deletes=True
     )
 
 
@@ -197,12 +282,65 @@ class TasksPublic(SQLModel):
     count: int = Field(description="任务总数")
 
 
+# ==================== 后台清理相关模型 ====================
+# 清理任务表 purge_job - 记录软删除对象的分批清理进度
+class PurgeJob(SQLModel, table=True):
+    __tablename__ = "purge_job"
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, description="清理任务ID")
+    target_type: PurgeTarget = Field(description="清理对象类型")
+    target_id: uuid.UUID = Field(index=True, description="清理对象ID")
+    requested_by_id: uuid.UUID | None = Field(default=None, description="发起删除的用户ID")
+    status: PurgeStatus = Field(default=PurgeStatus.PENDING, index=True, description="清理状态")
+    deleted_rows: int = Field(default=0, description="已删除的行数")
+    error: str | None = Field(default=None, max_length=1000, description="失败原因")
+    created_at: datetime = Field(default_factory=get_beijing_time, description="创建时间")
+    updated_at: datetime = Field(
+        default_factory=get_beijing_time,
+        sa_column_kwargs={"onupdate": get_beijing_time},
+        description="更新时间"
+    )
+    finished_at: datetime | None = Field(default=None, description="完成时间")
+
+
+class PurgeJobPublic(SQLModel):
+    id: uuid.UUID = Field(description="清理任务ID")
+    target_type: PurgeTarget = Field(description="清理对象类型")
+    target_id: uuid.UUID = Field(description="清理对象ID")
+    status: PurgeStatus = Field(description="清理状态")
+    deleted_rows: int = Field(description="已删除的行数")
+    error: str | None = Field(default=None, description="失败原因")
+    created_at: datetime = Field(description="创建时间")
+    updated_at: datetime = Field(description="更新时间")
+    finished_at: datetime | None = Field(default=None, description="完成时间")
+
+
+# ==================== 邮件发件箱模型 ====================
+# 邮件发件箱表 email_outbox - 与触发邮件的数据变更在同一事务中写入，由后台进程发送
+class EmailOutbox(SQLModel, table=True):
+    __tablename__ = "email_outbox"
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, description="邮件ID")
+    email_to: str = Field(max_length=255, description="收件人")
+    subject: str = Field(max_length=255, description="邮件主题")
+    html_content: str = Field(description="邮件HTML内容")
+    status: EmailStatus = Field(default=EmailStatus.PENDING, index=True, description="发送状态")
+    attempts: int = Field(default=0, description="已尝试发送次数")
+    next_attempt_at: datetime = Field(default_factory=get_beijing_time, index=True, description="下次尝试发送时间")
+    last_error: str | None = Field(default=None, max_length=1000, description="最近一次失败原因")
+    created_at: datetime = Field(default_factory=get_beijing_time, description="创建时间")
+    sent_at: datetime | None = Field(default=None, description="发送成功时间")
+
+
 # ==================== 通用模型 ====================
 # 通用消息类 - 用于返回简单的消息响应
 class Message(SQLModel):
     message: str = Field(description="操作消息")
 
 
+# 删除操作的响应 - 附带后台清理任务ID，可用于查询清理进度
+class PurgeMessage(Message):
+    purge_job_id: uuid.UUID = Field(description="清理任务ID")
+
+
 # 包含访问令牌的 JSON 负载 - 用于认证响应
 class Token(SQLModel):
     access_token: str = Field(description="JWT访问令牌")
@@ -218,3 +356,44 @@ class TokenPayload(SQLModel):
 class NewPassword(SQLModel):
     token: str = Field(description="密码重置令牌")
     new_password: str = Field(min_length=8, max_length=128, description="新密码")
+
+
+# ==================== 性能分析 ====================
+# 性能分析令牌 - 请求时放在 X-Profile 请求头或 profile 查询参数中
+class ProfileToken(SQLModel):
+    token: str = Field(description="性能分析令牌")
+    expires_in: int = Field(description="有效期（秒）")
+
+
+# 性能分析期间执行的 SQL 语句
+class ProfiledStatement(SQLModel):
+    statement: str = Field(description="SQL 语句")
+    duration_ms: float = Field(description="执行耗时（毫秒）")
+
+
+# 单个请求的性能分析报告，火焰图通过 /utils/profiles/{id}/flamegraph 查看
+class ProfileReport(SQLModel):
+    id: uuid.UUID = Field(description="报告ID")
+    method: str = Field(description="请求方法")
+    path: str = Field(description="请求路径")
+    status_code: int = Field(description="响应状态码")
+    duration_ms: float = Field(description="请求总耗时（毫秒）")
+    created_at: datetime = Field(description="创建时间")
+    statements: list[ProfiledStatement] = Field(description="执行的 SQL 语句")
+
+
+# ==================== 慢查询 ====================
+# 按语句结构汇总的慢查询统计，只包含当前进程启动以来的数据
+class SlowQueryPublic(SQLModel):
+    statement: str = Field(description="语句结构，参数以占位符表示")
+    count: int = Field(description="超过阈值的次数")
+    total_ms: float = Field(description="累计耗时（毫秒）")
+    max_ms: float = Field(description="最大耗时（毫秒）")
+    last_route: str | None = Field(description="最近一次出现时所在的路由")
+    last_seen_at: datetime = Field(description="最近一次出现的时间")
+    plan: str | None = Field(default=None, description="最近一次采样的 EXPLAIN (ANALYZE, BUFFERS) 执行计划")
+
+
+class SlowQueriesPublic(SQLModel):
+    data: list[SlowQueryPublic] = Field(description="慢查询列表")
+    count: int = Field(description="语句结构总数")
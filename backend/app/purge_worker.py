@@ -0,0 +1,157 @@
+import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlmodel import Session, and_, col, delete, or_, select
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+from app.models import (
+    Project,
+    ProjectCollaboratorLink,
+    PurgeJob,
+    PurgeStatus,
+    PurgeTarget,
+    Task,
+    TaskCollaboratorLink,
+    User,
+)
+from app.utils import get_beijing_time
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 超过该时间未更新进度的 running 任务视为 worker 已退出，可被重新领取
+stale_after = timedelta(minutes=10)
+
+
+def delete_in_chunks(
+    session: Session, job: PurgeJob, model: Any, key: Any, *whereclause: Any
+) -> None:
+    """
+    按 key 分批删除满足条件的行，每批单独提交并记录进度，批次之间休眠，
+    避免长事务持有大量锁、产生大量 WAL，影响其他请求。关联表的 key 不唯一，
+    删除时同样需要带上条件，否则会删除其他项目、任务中相同 key 的行
+    """
+    while True:
+        chunk = select(key).where(*whereclause).limit(settings.PURGE_CHUNK_SIZE)
+        statement = delete(model).where(key.in_(chunk), *whereclause)
+        deleted = session.exec(statement).rowcount
+        job.deleted_rows += deleted
+        session.add(job)
+        session.commit()
+        if deleted < settings.PURGE_CHUNK_SIZE:
+            return
+        time.sleep(settings.PURGE_THROTTLE_SECONDS)
+
+
+def purge_project(session: Session, job: PurgeJob, project_id: uuid.UUID) -> None:
+    delete_in_chunks(
+        session, job, Task, col(Task.id), col(Task.project_id) == project_id
+    )
+    delete_in_chunks(
+        session,
+        job,
+        ProjectCollaboratorLink,
+        col(ProjectCollaboratorLink.user_id),
+        col(ProjectCollaboratorLink.project_id) == project_id,
+    )
+    delete_in_chunks(session, job, Project, col(Project.id), col(Project.id) == project_id)
+
+
+def purge_user(session: Session, job: PurgeJob, user_id: uuid.UUID) -> None:
+    project_ids = session.exec(
+        select(Project.id).where(Project.owner_id == user_id)
+    ).all()
+    for project_id in project_ids:
+        purge_project(session, job, project_id)
+    # 用户在他人项目中创建的任务
+    delete_in_chunks(session, job, Task, col(Task.id), col(Task.owner_id) == user_id)
+    delete_in_chunks(
+        session,
+        job,
+        TaskCollaboratorLink,
+        col(TaskCollaboratorLink.task_id),
+        col(TaskCollaboratorLink.user_id) == user_id,
+    )
+    delete_in_chunks(
+        session,
+        job,
+        ProjectCollaboratorLink,
+        col(ProjectCollaboratorLink.project_id),
+        col(ProjectCollaboratorLink.user_id) == user_id,
+    )
+    delete_in_chunks(session, job, User, col(User.id), col(User.id) == user_id)
+
+
+def claim_next_job(session: Session) -> PurgeJob | None:
+    """领取一个待处理的清理任务，多个 worker 并行时通过 SKIP LOCKED 避免重复领取"""
+    stale_before = get_beijing_time() - stale_after
+    statement = (
+        select(PurgeJob)
+        .where(
+            or_(
+                col(PurgeJob.status) == PurgeStatus.PENDING,
+                and_(
+                    col(PurgeJob.status) == PurgeStatus.RUNNING,
+                    col(PurgeJob.updated_at) < stale_before,
+                ),
+            )
+        )
+        .order_by(col(PurgeJob.created_at))
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = session.exec(statement).first()
+    if not job:
+        return None
+    job.status = PurgeStatus.RUNNING
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def run_purge_job(session: Session, job: PurgeJob) -> None:
+    logger.info(f"Purging {job.target_type.value} {job.target_id}")
+    try:
+        if job.target_type == PurgeTarget.USER:
+            purge_user(session, job, job.target_id)
+        else:
+            purge_project(session, job, job.target_id)
+    except Exception as e:
+        logger.error(e)
+        session.rollback()
+        job.status = PurgeStatus.FAILED
+        job.error = str(e)[:1000]
+    else:
+        job.status = PurgeStatus.COMPLETED
+    job.finished_at = get_beijing_time()
+    session.add(job)
+    session.commit()
+    logger.info(f"Purge job {job.id} {job.status.value}, {job.deleted_rows} rows")
+
+
+def run_pending_jobs(session: Session) -> int:
+    """处理所有待清理任务，返回处理的任务数"""
+    count = 0
+    while job := claim_next_job(session):
+        run_purge_job(session, job)
+        count += 1
+    return count
+
+
+def main() -> None:
+    logger.info("Starting purge worker")
+    engine = create_db_engine()
+    while True:
+        with Session(engine) as session:
+            processed = run_pending_jobs(session)
+        if not processed:
+            time.sleep(settings.PURGE_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
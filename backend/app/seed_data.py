@@ -0,0 +1,336 @@
+"""
+生成接近生产规模和分布的测试数据：用户、项目、任务以及项目和任务的协作者。
+
+- 每个用户拥有的项目数、每个项目的任务数服从 Zipf 分布，少数用户和项目占大部分数据
+- 每个项目和任务的协作者数服从重尾的 Pareto 分布，多数没有协作者
+- 所有用户使用同一个预先计算的密码哈希，密码为 seed-password
+- PostgreSQL 下使用 COPY 写入，其他数据库使用批量 INSERT
+- 相同的 --seed 和数量参数生成完全相同的数据，需写入空数据库
+
+    python app/seed_data.py --users 100000 --projects 1000000 --tasks 10000000 --seed 42
+"""
+import argparse
+import itertools
+import logging
+import random
+import string
+import time
+import uuid
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Table
+
+from app.core.db import create_db_engine
+from app.core.security import pwd_context
+from app.models import (
+    Project,
+    ProjectCollaboratorLink,
+    Task,
+    TaskCollaboratorLink,
+    TaskPriority,
+    TaskStatus,
+    User,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+seed_password = "seed-password"
+# 生成的时间均匀分布在该时间之后的一年内
+base_time = datetime(2025, 1, 1)
+# 枚举列按成员名存储
+task_statuses = [status.name for status in TaskStatus]
+task_priorities = [priority.name for priority in TaskPriority]
+bcrypt_salt_chars = (
+    "./" + string.ascii_uppercase + string.ascii_lowercase + string.digits
+)
+
+
+@dataclass
+class SeedCounts:
+    users: int = 0
+    projects: int = 0
+    project_collaborators: int = 0
+    tasks: int = 0
+    task_collaborators: int = 0
+
+
+def make_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def make_timestamp(rng: random.Random) -> datetime:
+    return base_time + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+
+def make_password_hash(rng: random.Random) -> str:
+    """只计算一次 bcrypt 哈希，盐由随机数种子决定，使生成的数据可以复现"""
+    # bcrypt 盐的最后一个字符只使用高位，取 "." 避免 passlib 的填充位警告
+    salt = "".join(rng.choices(bcrypt_salt_chars, k=21)) + "."
+    return str(pwd_context.handler().using(salt=salt).hash(seed_password))
+
+
+def zipf_cum_weights(n: int, exponent: float, rng: random.Random) -> list[float]:
+    """第 k 名的权重为 1 / k^exponent，名次随机分配，热点不集中在前面的编号"""
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return list(itertools.accumulate(1 / rank**exponent for rank in ranks))
+
+
+def heavy_tailed_count(rng: random.Random, alpha: float, limit: int) -> int:
+    """Pareto 分布取整后减一：多数为 0，少数很大"""
+    return min(int(rng.paretovariate(alpha)) - 1, limit)
+
+
+def sample_others(
+    rng: random.Random, population: int, count: int, exclude: int
+) -> set[int]:
+    chosen: set[int] = set()
+    count = min(count, population - 1)
+    while len(chosen) < count:
+        candidate = rng.randrange(population)
+        if candidate != exclude:
+            chosen.add(candidate)
+    return chosen
+
+
+def write_rows(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: list[tuple[Any, ...]],
+) -> None:
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql":
+        cursor = connection.connection.driver_connection.cursor()  # type: ignore[union-attr]
+        statement = f'COPY "{table.name}" ({", ".join(columns)}) FROM STDIN'
+        with cursor, cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(row)
+    else:
+        connection.execute(
+            table.insert(), [dict(zip(columns, row, strict=True)) for row in rows]
+        )
+
+
+def chunked(
+    rows: Iterator[tuple[Any, ...]], size: int
+) -> Iterator[list[tuple[Any, ...]]]:
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def seed_database(
+    engine: Engine,
+    *,
+    users: int,
+    projects: int,
+    tasks: int,
+    seed: int = 0,
+    zipf_exponent: float = 1.1,
+    collaborator_alpha: float = 1.5,
+    task_collaborator_alpha: float = 2.5,
+    max_collaborators: int = 50,
+    chunk_size: int = 100_000,
+) -> SeedCounts:
+    # 每张表使用独立的随机数序列，调整任务数不会改变用户和项目数据
+    user_rng = random.Random(f"{seed}-users")
+    project_rng = random.Random(f"{seed}-projects")
+    task_rng = random.Random(f"{seed}-tasks")
+    counts = SeedCounts()
+
+    user_table = User.__table__  # type: ignore[attr-defined]
+    project_table = Project.__table__  # type: ignore[attr-defined]
+    project_link_table = ProjectCollaboratorLink.__table__  # type: ignore[attr-defined]
+    task_table = Task.__table__  # type: ignore[attr-defined]
+    task_link_table = TaskCollaboratorLink.__table__  # type: ignore[attr-defined]
+
+    with engine.connect() as connection:
+        start = time.perf_counter()
+        password_hash = make_password_hash(user_rng)
+        user_ids = [make_uuid(user_rng) for _ in range(users)]
+        user_rows = (
+            (
+                user_ids[i],
+                f"seed-user-{i}@example.com",
+                f"Seed User {i}",
+                password_hash,
+                True,
+                False,
+                make_timestamp(user_rng),
+            )
+            for i in range(users)
+        )
+        user_columns = [
+            "id",
+            "email",
+            "full_name",
+            "hashed_password",
+            "is_active",
+            "is_superuser",
+            "updated_at",
+        ]
+        for chunk in chunked(user_rows, chunk_size):
+            # COPY 直接使用驱动连接执行，需显式开始事务，提交时才会提交驱动连接上的事务
+            with connection.begin():
+                write_rows(connection, user_table, user_columns, chunk)
+            counts.users += len(chunk)
+        logger.info(f"{counts.users} users in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        owner_weights = zipf_cum_weights(users, zipf_exponent, project_rng)
+        project_owners = project_rng.choices(
+            range(users), cum_weights=owner_weights, k=projects
+        )
+        project_ids = [make_uuid(project_rng) for _ in range(projects)]
+        project_columns = [
+            "id",
+            "title",
+            "description",
+            "owner_id",
+            "created_at",
+            "updated_at",
+        ]
+        link_columns = ["project_id", "user_id"]
+        for offset in range(0, projects, chunk_size):
+            project_rows: list[tuple[Any, ...]] = []
+            link_rows: list[tuple[Any, ...]] = []
+            for i in range(offset, min(offset + chunk_size, projects)):
+                created_at = make_timestamp(project_rng)
+                project_rows.append(
+                    (
+                        project_ids[i],
+                        f"Project {i}",
+                        None,
+                        user_ids[project_owners[i]],
+                        created_at,
+                        created_at,
+                    )
+                )
+                collaborators = sample_others(
+                    project_rng,
+                    users,
+                    heavy_tailed_count(
+                        project_rng, collaborator_alpha, max_collaborators
+                    ),
+                    exclude=project_owners[i],
+                )
+                link_rows.extend(
+                    (project_ids[i], user_ids[u]) for u in sorted(collaborators)
+                )
+            with connection.begin():
+                write_rows(connection, project_table, project_columns, project_rows)
+                write_rows(connection, project_link_table, link_columns, link_rows)
+            counts.projects += len(project_rows)
+            counts.project_collaborators += len(link_rows)
+        logger.info(
+            f"{counts.projects} projects, {counts.project_collaborators} collaborators "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+        start = time.perf_counter()
+        project_weights = zipf_cum_weights(projects, zipf_exponent, task_rng)
+        task_columns = [
+            "id",
+            "title",
+            "status",
+            "priority",
+            "due_date",
+            "project_id",
+            "owner_id",
+            "created_at",
+            "updated_at",
+        ]
+        link_columns = ["task_id", "user_id"]
+        for offset in range(0, tasks, chunk_size):
+            size = min(chunk_size, tasks - offset)
+            task_projects = task_rng.choices(
+                range(projects), cum_weights=project_weights, k=size
+            )
+            task_rows: list[tuple[Any, ...]] = []
+            link_rows = []
+            for i, project in zip(
+                range(offset, offset + size), task_projects, strict=True
+            ):
+                task_id = make_uuid(task_rng)
+                owner = project_owners[project]
+                created_at = make_timestamp(task_rng)
+                due_date = (
+                    created_at + timedelta(days=task_rng.randrange(1, 90))
+                    if task_rng.random() < 0.5
+                    else None
+                )
+                task_rows.append(
+                    (
+                        task_id,
+                        f"Task {i}",
+                        task_rng.choice(task_statuses),
+                        task_rng.choice(task_priorities),
+                        due_date,
+                        project_ids[project],
+                        user_ids[owner],
+                        created_at,
+                        created_at,
+                    )
+                )
+                collaborators = sample_others(
+                    task_rng,
+                    users,
+                    heavy_tailed_count(
+                        task_rng, task_collaborator_alpha, max_collaborators
+                    ),
+                    exclude=owner,
+                )
+                link_rows.extend((task_id, user_ids[u]) for u in sorted(collaborators))
+            with connection.begin():
+                write_rows(connection, task_table, task_columns, task_rows)
+                write_rows(connection, task_link_table, link_columns, link_rows)
+            counts.tasks += len(task_rows)
+            counts.task_collaborators += len(link_rows)
+            logger.info(f"{counts.tasks}/{tasks} tasks")
+        logger.info(
+            f"{counts.tasks} tasks, {counts.task_collaborators} collaborators "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+        if connection.dialect.name == "postgresql":
+            # 更新统计信息，查询计划与生产环境一致
+            connection.exec_driver_sql(
+                'ANALYZE "user", project, project_collaborator_association, '
+                "task, task_collaborator_association"
+            )
+            connection.commit()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logger.info("Seeding data")
+    counts = seed_database(
+        create_db_engine(),
+        users=args.users,
+        projects=args.projects,
+        tasks=args.tasks,
+        seed=args.seed,
+        zipf_exponent=args.zipf_exponent,
+        chunk_size=args.chunk_size,
+    )
+    logger.info(f"Seeded {counts}")
+
+
+if __name__ == "__main__":
+    main()
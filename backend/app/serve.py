@@ -0,0 +1,140 @@
+"""
+预加载模式启动 Web 服务：主进程导入并预热应用，冻结 GC 跟踪的对象后 fork 出 worker。
+fastapi run --workers 以 spawn 方式启动 worker，每个 worker 各自导入应用，重复构建
+SQLModel 模型、pydantic 校验器、Jinja 模板和 OpenAPI 文档；预加载模式下这些对象
+所在的内存页由所有 worker 以写时复制的方式共享。数据库引擎仍在每个 worker 的
+lifespan 中创建，连接不会跨进程共享。
+
+    python -m app.serve --workers 4
+
+worker 异常退出时由主进程重新 fork，启动失败时所有进程退出。
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+from types import FrameType
+
+import uvicorn
+from uvicorn.config import STARTUP_FAILURE
+
+from app.core.metrics import mark_worker_dead
+from app.core.workers import worker_count
+
+logger = logging.getLogger("uvicorn.error")
+
+stop_signals = {signal.SIGTERM, signal.SIGINT}
+
+
+def preload(host: str, port: int) -> uvicorn.Config:
+    """导入应用并完成不依赖数据库的预热，worker 的 lifespan 中不再重复执行"""
+    from app.core.security import pwd_context
+    from app.core.warmup import warm_up_serializers
+    from app.main import app, openapi_payload
+    from app.utils import precompile_email_templates
+
+    pwd_context.handler().get_backend()
+    warm_up_serializers(app)
+    precompile_email_templates()
+    openapi_payload.prepare()
+    config = uvicorn.Config(app, host=host, port=port)
+    # 导入 HTTP 协议实现等模块，包装 ASGI 应用
+    config.load()
+    return config
+
+
+def run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    for signum in stop_signals:
+        signal.signal(signum, signal.SIG_DFL)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, stop_signals)
+    # 主进程的对象已被冻结，worker 的 GC 只扫描 fork 之后创建的对象，
+    # 不会修改共享对象的 GC 头部而触发复制
+    gc.enable()
+    code = 0
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        logger.exception("Worker crashed")
+        code = 1
+    # 不执行主进程注册的退出清理
+    os._exit(code)
+
+
+def spawn_worker(
+    config: uvicorn.Config, sock: socket.socket, children: set[int]
+) -> None:
+    # fork 期间屏蔽退出信号：子进程不会在恢复默认处理前执行主进程的信号处理函数，
+    # 主进程在记录子进程 pid 之后才处理信号，新 worker 同样会被通知退出
+    signal.pthread_sigmask(signal.SIG_BLOCK, stop_signals)
+    try:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(config, sock)
+        children.add(pid)
+    finally:
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, stop_signals)
+
+
+def serve(config: uvicorn.Config, sock: socket.socket, workers: int) -> int:
+    children: set[int] = set()
+    stopping = False
+
+    def stop(_signum: int, _frame: FrameType | None) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    for signum in stop_signals:
+        signal.signal(signum, stop)
+    # 冻结后主进程已有的对象移出 GC 的跟踪范围
+    gc.freeze()
+    for _ in range(workers):
+        spawn_worker(config, sock, children)
+    logger.info(f"Started {workers} preloaded workers")
+
+    exit_code = 0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        mark_worker_dead(pid)
+        if stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        if code == STARTUP_FAILURE:
+            logger.error(f"Worker {pid} failed to start, shutting down")
+            exit_code = STARTUP_FAILURE
+            stop(signal.SIGTERM, None)
+            continue
+        logger.warning(f"Worker {pid} exited with {code}, restarting")
+        spawn_worker(config, sock, children)
+    sock.close()
+    return exit_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    # 导入应用前关闭 GC，避免回收在主进程的内存页中留下空洞，fork 后写入这些页会触发复制
+    gc.disable()
+    config = preload(args.host, args.port)
+    sock = config.bind_socket()
+    sys.exit(serve(config, sock, args.workers or worker_count()))
+
+
+if __name__ == "__main__":
+    main()
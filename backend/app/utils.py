@@ -1,17 +1,22 @@
 import logging
+import queue
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
 from app.core.config import settings
+from app.core.tracing import start_span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,27 +28,28 @@ class EmailData:
     subject: str
 
 
+# 邮件模板只编译一次并缓存，本地开发时模板文件修改后自动重新加载
+email_templates_env = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+    auto_reload=settings.ENVIRONMENT == "local",
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+
+
+def precompile_email_templates() -> None:
+    """启动时预先编译所有邮件模板，避免首次发送邮件时才编译"""
+    for template_name in email_templates_env.list_templates(extensions=["html"]):
+        email_templates_env.get_template(template_name)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-            Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
+    template = email_templates_env.get_template(template_name)
+    html_content = template.render(context)
     return html_content
 
 
-def send_email(
-        *,
-        email_to: str,
-        subject: str = "",
-        html_content: str = "",
-) -> None:
-    assert settings.emails_enabled, "no provided configuration for email variables"
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
-    )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
+def get_smtp_options() -> dict[str, Any]:
+    smtp_options: dict[str, Any] = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
     if settings.SMTP_TLS:
         smtp_options["tls"] = True
     elif settings.SMTP_SSL:
@@ -52,8 +58,122 @@ def send_email(
         smtp_options["user"] = settings.SMTP_USER
     if settings.SMTP_PASSWORD:
         smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
+    return smtp_options
+
+
+class SMTPConnectionPool:
+    """
+    SMTP 连接池，连接在多封邮件之间复用，避免每封邮件都重新连接、TLS 握手和认证。
+    空闲超过 idle_timeout 的连接会先关闭再重新连接，防止使用已被服务器断开的连接。
+    """
+
+    def __init__(self, options: dict[str, Any], size: int, idle_timeout: float) -> None:
+        self.options = options
+        self.idle_timeout = idle_timeout
+        self._idle: queue.LifoQueue[tuple[Any, float]] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        with self._slots:
+            try:
+                smtp, last_used = self._idle.get_nowait()
+                if time.monotonic() - last_used > self.idle_timeout:
+                    smtp.close()  # 下次发送时自动重新连接
+            except queue.Empty:
+                # emails 导入较慢且只有发件进程需要，按需导入
+                from emails.backend import SMTPBackend  # type: ignore
+
+                smtp = SMTPBackend(**self.options)
+            try:
+                yield smtp
+            except Exception:
+                smtp.close()
+                raise
+            finally:
+                self._idle.put((smtp, time.monotonic()))
+
+    def close(self) -> None:
+        while True:
+            try:
+                smtp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            smtp.close()
+
+
+_smtp_pool: SMTPConnectionPool | None = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """获取全局 SMTP 连接池，SMTP 配置变化时重建"""
+    global _smtp_pool
+    options = get_smtp_options()
+    with _smtp_pool_lock:
+        if _smtp_pool is None or _smtp_pool.options != options:
+            if _smtp_pool is not None:
+                _smtp_pool.close()
+            _smtp_pool = SMTPConnectionPool(
+                options,
+                size=settings.SMTP_POOL_SIZE,
+                idle_timeout=settings.SMTP_POOL_IDLE_SECONDS,
+            )
+        return _smtp_pool
+
+
+def _send_message(smtp: Any, *, email_to: str, subject: str, html_content: str) -> None:
+    import emails  # type: ignore
+
+    message = emails.Message(
+        subject=subject,
+        html=html_content,
+        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+    )
+    with start_span("smtp.send", {"server.address": str(settings.SMTP_HOST)}):
+        response = message.send(to=email_to, smtp=smtp)
     logger.info(f"send email result: {response}")
+    if not response or not response.success:
+        error = response.error if response else None
+        raise RuntimeError(f"send email failed: {response}, error: {error}")
+
+
+def send_email(
+        *,
+        email_to: str,
+        subject: str = "",
+        html_content: str = "",
+) -> None:
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    with get_smtp_pool().connection() as smtp:
+        _send_message(smtp, email_to=email_to, subject=subject, html_content=html_content)
+
+
+def send_email_batch(
+        *, messages: Sequence[tuple[str, EmailData]]
+) -> list[Exception | None]:
+    """
+    在同一个 SMTP 连接上依次发送一批邮件，返回每封邮件的发送错误（成功为 None）。
+    某封邮件失败后关闭连接，后续邮件会自动重新连接。
+    """
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    errors: list[Exception | None] = []
+    with get_smtp_pool().connection() as smtp:
+        for email_to, email_data in messages:
+            try:
+                _send_message(
+                    smtp,
+                    email_to=email_to,
+                    subject=email_data.subject,
+                    html_content=email_data.html_content,
+                )
+            except Exception as e:
+                logger.error(e)
+                smtp.close()
+                errors.append(e)
+            else:
+                errors.append(None)
+    return errors
 
 
 def generate_test_email(email_to: str) -> EmailData:
@@ -0,0 +1,300 @@
+"""
+主要 API 流程的负载测试：登录、/users/me、项目列表分页、创建项目、创建任务和注册，
+以固定并发请求运行中的服务，记录各场景的 p50/p95/p99 延迟和吞吐量。
+
+被测服务需连接本地 Postgres，并设置 RATE_LIMIT_ENABLED=false，否则登录和注册会被限流：
+
+    python -m benchmarks.api_load --concurrency 16 --requests 500 --save baseline.json
+    python -m benchmarks.api_load --concurrency 16 --requests 500 --baseline baseline.json
+
+与基线对比时，任一场景延迟变慢或吞吐量下降超过 --tolerance，或有请求失败，以非零状态退出。
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import anyio
+import httpx
+
+from app.core.config import settings
+
+api = settings.API_V1_STR
+# 项目列表分页的页大小和页数
+page_size = 20
+pages = 10
+
+
+@dataclass
+class LoadContext:
+    headers: dict[str, str]
+    project_id: str
+    # 区分多次运行创建的数据，避免注册邮箱冲突
+    run_id: str
+
+
+Request = Callable[[httpx.AsyncClient, LoadContext, int], Awaitable[httpx.Response]]
+
+
+async def login(
+    client: httpx.AsyncClient, _ctx: LoadContext, _i: int
+) -> httpx.Response:
+    return await client.post(
+        f"{api}/login/access-token",
+        data={
+            "username": settings.FIRST_SUPERUSER,
+            "password": settings.FIRST_SUPERUSER_PASSWORD,
+        },
+    )
+
+
+async def users_me(
+    client: httpx.AsyncClient, ctx: LoadContext, _i: int
+) -> httpx.Response:
+    return await client.get(f"{api}/users/me", headers=ctx.headers)
+
+
+async def read_projects(
+    client: httpx.AsyncClient, ctx: LoadContext, i: int
+) -> httpx.Response:
+    return await client.get(
+        f"{api}/projects/",
+        headers=ctx.headers,
+        params={"skip": (i % pages) * page_size, "limit": page_size},
+    )
+
+
+async def create_project(
+    client: httpx.AsyncClient, ctx: LoadContext, i: int
+) -> httpx.Response:
+    return await client.post(
+        f"{api}/projects/",
+        headers=ctx.headers,
+        json={"title": f"load {ctx.run_id} {i}"},
+    )
+
+
+async def create_task(
+    client: httpx.AsyncClient, ctx: LoadContext, i: int
+) -> httpx.Response:
+    return await client.post(
+        f"{api}/projects/{ctx.project_id}/tasks",
+        headers=ctx.headers,
+        json={"title": f"load {ctx.run_id} {i}"},
+    )
+
+
+async def signup(client: httpx.AsyncClient, ctx: LoadContext, i: int) -> httpx.Response:
+    return await client.post(
+        f"{api}/users/signup",
+        json={
+            "email": f"load-{ctx.run_id}-{i}@example.com",
+            "password": "load-test-password",
+        },
+    )
+
+
+scenarios: dict[str, Request] = {
+    "login": login,
+    "users_me": users_me,
+    "read_projects": read_projects,
+    "create_project": create_project,
+    "create_task": create_task,
+    "signup": signup,
+}
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> ScenarioResult:
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return ScenarioResult(
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(quantiles[49], 2),
+        p95_ms=round(quantiles[94], 2),
+        p99_ms=round(quantiles[98], 2),
+        throughput_rps=round(len(latencies) / elapsed, 1),
+    )
+
+
+async def prepare(client: httpx.AsyncClient) -> LoadContext:
+    """以超级用户登录，创建任务场景使用的项目，并保证项目列表至少有一页数据"""
+    run_id = uuid.uuid4().hex[:8]
+    r = await login(client, LoadContext({}, "", run_id), 0)
+    r.raise_for_status()
+    ctx = LoadContext(
+        {"Authorization": f"Bearer {r.json()['access_token']}"}, "", run_id
+    )
+    r = await create_project(client, ctx, 0)
+    r.raise_for_status()
+    ctx.project_id = r.json()["id"]
+    for i in range(1, page_size):
+        (await create_project(client, ctx, -i)).raise_for_status()
+    return ctx
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: LoadContext,
+    request: Request,
+    *,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+) -> ScenarioResult:
+    for i in range(warmup):
+        await request(client, ctx, requests + i)
+
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                failed = (await request(client, ctx, i)).status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for _ in range(concurrency):
+            tg.start_soon(worker)
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_suite(
+    client: httpx.AsyncClient,
+    names: list[str],
+    *,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+) -> dict[str, ScenarioResult]:
+    ctx = await prepare(client)
+    return {
+        name: await run_scenario(
+            client,
+            ctx,
+            scenarios[name],
+            concurrency=concurrency,
+            requests=requests,
+            warmup=warmup,
+        )
+        for name in names
+    }
+
+
+def compare(
+    results: dict[str, ScenarioResult],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """返回超出容差的指标，延迟越高越差，吞吐量越低越差"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            current, previous = getattr(result, metric), base[metric]
+            if current > previous * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {previous} -> {current}")
+        current, previous = result.throughput_rps, base["throughput_rps"]
+        if current < previous * (1 - tolerance):
+            regressions.append(f"{name} throughput_rps: {previous} -> {current}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(scenarios), default=list(scenarios)
+    )
+    parser.add_argument("--save", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    async def run() -> dict[str, ScenarioResult]:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=args.base_url, limits=limits, timeout=30
+        ) as client:
+            return await run_suite(
+                client,
+                args.scenarios,
+                concurrency=args.concurrency,
+                requests=args.requests,
+                warmup=args.warmup,
+            )
+
+    results = anyio.run(run)
+
+    print(
+        f"{'scenario':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'req/s':>8} {'errors':>7}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<16} {result.p50_ms:8.2f} {result.p95_ms:8.2f} "
+            f"{result.p99_ms:8.2f} {result.throughput_rps:8.1f} {result.errors:>7}"
+        )
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "concurrency": args.concurrency,
+                    "requests": args.requests,
+                    "scenarios": {name: asdict(r) for name, r in results.items()},
+                },
+                indent=2,
+            )
+        )
+
+    failed = any(result.errors for result in results.values())
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if (baseline["concurrency"], baseline["requests"]) != (
+            args.concurrency,
+            args.requests,
+        ):
+            print(
+                "warning: baseline was recorded with different --concurrency/--requests"
+            )
+        regressions = compare(results, baseline["scenarios"], args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+对比邮件模板渲染速度：每次读文件并构造 Template 与使用缓存的 Environment
+
+    python -m benchmarks.email_render --count 10000
+"""
+import argparse
+import time
+from pathlib import Path
+
+from jinja2 import Template
+
+import app.utils
+from app.utils import generate_new_account_email, precompile_email_templates
+
+
+def render_uncached(*, template_name: str, context: dict[str, object]) -> str:
+    # 旧实现：每次发送都读取文件并重新编译模板
+    template_str = (
+        Path(app.utils.__file__).parent / "email-templates" / "build" / template_name
+    ).read_text()
+    return Template(template_str).render(context)
+
+
+def run(count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        generate_new_account_email(
+            email_to=f"user{i}@example.com", username=f"user{i}", password="changethis"
+        )
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000)
+    args = parser.parse_args()
+
+    precompile_email_templates()
+    cached = run(args.count)
+
+    original = app.utils.render_email_template
+    app.utils.render_email_template = render_uncached  # type: ignore[assignment]
+    try:
+        uncached = run(args.count)
+    finally:
+        app.utils.render_email_template = original
+
+    print(f"uncached: {uncached:10.0f} renders/s")
+    print(f"  cached: {cached:10.0f} renders/s ({cached / uncached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+用 python -X importtime 测量导入 app.main 的耗时，列出累计耗时最多的模块，
+超过预算时以非零状态退出，可用于 CI
+
+    python -m benchmarks.import_time --runs 5 --top 15 --budget-ms 1500
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+
+# 只有在启用对应功能时才应导入的重量级模块
+lazy_modules = ["sentry_sdk", "emails", "pyinstrument", "opentelemetry"]
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(module: str = "app.main") -> list[ImportTiming]:
+    """在新的解释器中导入模块，解析 -X importtime 输出"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def total_ms(timings: list[ImportTiming], module: str = "app.main") -> float:
+    return next(t.cumulative_us for t in timings if t.module == module) / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # 第一次运行生成字节码缓存，不计入结果
+    measure()
+    runs = [measure() for _ in range(args.runs)]
+    totals = [total_ms(timings) for timings in runs]
+    median = statistics.median(totals)
+
+    print(f"import app.main: median {median:.0f} ms, min {min(totals):.0f} ms")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    top = sorted(runs[-1], key=lambda t: t.cumulative_us, reverse=True)
+    for timing in top[: args.top]:
+        print(
+            f"{timing.cumulative_us / 1000:10.1f}ms {timing.self_us / 1000:8.1f}ms  "
+            f"{timing.module}"
+        )
+
+    imported = {t.module for t in runs[-1]}
+    eager = [module for module in lazy_modules if module in imported]
+    if eager:
+        print(f"eagerly imported: {', '.join(eager)}")
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"over budget: {median:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    if eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+测量后台分批清理期间其他请求的延迟
+
+在一个项目下写入大量任务，先测量基线延迟，再分别在分批清理（chunked）
+或单条语句删除（single）的同时持续请求项目列表，对比 p50/p99 延迟。
+
+需要已执行迁移的 Postgres 数据库：
+
+    python -m benchmarks.purge_latency --tasks 1000000 --mode chunked
+"""
+import argparse
+import statistics
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import Session, delete
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+from app.crud.purge import crud_soft_delete_project
+from app.crud.users import crud_get_user_by_email
+from app.main import app
+from app.models import Project, Task, User
+from app.purge_worker import run_pending_jobs
+from app.utils import get_beijing_time
+
+
+def seed(session: Session, owner: User, tasks: int) -> Project:
+    project = Project(title="purge benchmark", owner_id=owner.id)
+    session.add(project)
+    session.commit()
+    now = get_beijing_time()
+    batch = 10_000
+    for start in range(0, tasks, batch):
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "title": f"task {i}",
+                "project_id": project.id,
+                "owner_id": owner.id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(start, min(start + batch, tasks))
+        ]
+        session.execute(insert(Task), rows)
+        session.commit()
+    return project
+
+
+def sample_latency(
+    client: TestClient, headers: dict[str, str], stop: threading.Event
+) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get(f"{settings.API_V1_STR}/projects/", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:>10}: {len(latencies):6d} requests  "
+        f"p50={quantiles[49]:.1f}ms  p99={quantiles[98]:.1f}ms  max={max(latencies):.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--mode", choices=["chunked", "single"], default="chunked")
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    engine = create_db_engine()
+    # lifespan 中为应用创建数据库引擎
+    with TestClient(app) as client:
+        login_data = {
+            "username": settings.FIRST_SUPERUSER,
+            "password": settings.FIRST_SUPERUSER_PASSWORD,
+        }
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        with Session(engine) as session:
+            owner = crud_get_user_by_email(session=session, email=settings.FIRST_SUPERUSER)
+            assert owner
+            print(f"Seeding {args.tasks} tasks...")
+            project = seed(session, owner, args.tasks)
+
+        stop = threading.Event()
+        timer = threading.Timer(args.baseline_seconds, stop.set)
+        timer.start()
+        report("baseline", sample_latency(client, headers, stop))
+
+        def purge() -> None:
+            with Session(engine) as session:
+                if args.mode == "chunked":
+                    db_project = session.get(Project, project.id)
+                    assert db_project
+                    crud_soft_delete_project(session=session, project=db_project)
+                    run_pending_jobs(session)
+                else:
+                    session.exec(delete(Project).where(Project.id == project.id))  # type: ignore
+                    session.commit()
+
+        stop = threading.Event()
+        started = time.perf_counter()
+        worker = threading.Thread(target=lambda: (purge(), stop.set()))
+        worker.start()
+        report(args.mode, sample_latency(client, headers, stop))
+        worker.join()
+        print(f"{args.mode} purge of {args.tasks} tasks took {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+测量一页 100 条数据的响应序列化开销
+
+对比三种方式：
+- stdlib：ORM 对象 -> response_model 二次校验 -> JSONResponse（原实现）
+- orjson：同上，但使用 ORJSONResponse 渲染
+- direct：从数据库行直接构造响应模型，由 pydantic-core 序列化（热点列表接口）
+
+    python -m benchmarks.serialization --page-size 100
+"""
+import argparse
+import timeit
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.utils import create_model_field
+from sqlmodel import SQLModel
+
+from app.core.responses import ModelJSONResponse
+from app.models import (
+    Project,
+    ProjectPublic,
+    ProjectsPublic,
+    Task,
+    TaskPublic,
+    TasksPublic,
+)
+from app.utils import get_beijing_time
+
+
+def make_projects(count: int) -> list[Project]:
+    owner_id = uuid.uuid4()
+    return [
+        Project(title=f"project {i}", description="description " * 10, owner_id=owner_id)
+        for i in range(count)
+    ]
+
+
+def make_tasks(count: int) -> list[Task]:
+    project_id, owner_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        Task(
+            title=f"task {i}",
+            description="description " * 20,
+            project_id=project_id,
+            owner_id=owner_id,
+            due_date=get_beijing_time(),
+        )
+        for i in range(count)
+    ]
+
+
+def via_response_model(
+    list_model: type[SQLModel], objects: list[Any], response_class: type[JSONResponse]
+) -> Callable[[], bytes]:
+    field = create_model_field(name="Response", type_=list_model, mode="serialization")
+
+    def run() -> bytes:
+        content = list_model(data=objects, count=len(objects))
+        value, _ = field.validate(content, {}, loc=("response",))
+        return bytes(response_class(field.serialize(value, mode="json")).body)
+
+    return run
+
+
+def direct(
+    list_model: type[SQLModel], public_model: type[SQLModel], objects: list[Any]
+) -> Callable[[], bytes]:
+    # 模拟 select(*columns) 返回的行
+    rows = [
+        {name: getattr(obj, name) for name in public_model.model_fields}
+        for obj in objects
+    ]
+
+    def run() -> bytes:
+        data = [public_model.model_construct(**row) for row in rows]
+        content = list_model.model_construct(data=data, count=len(rows))
+        return bytes(ModelJSONResponse(content).body)
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    cases: list[tuple[str, type[SQLModel], type[SQLModel], list[Any]]] = [
+        ("ProjectsPublic", ProjectsPublic, ProjectPublic, make_projects(args.page_size)),
+        ("TasksPublic", TasksPublic, TaskPublic, make_tasks(args.page_size)),
+    ]
+    for name, list_model, public_model, objects in cases:
+        print(f"{name} ({args.page_size} items per page)")
+        for label, run in [
+            ("stdlib", via_response_model(list_model, objects, JSONResponse)),
+            ("orjson", via_response_model(list_model, objects, ORJSONResponse)),
+            ("direct", direct(list_model, public_model, objects)),
+        ]:
+            seconds = timeit.timeit(run, number=args.number) / args.number
+            print(f"  {label:>6}: {seconds * 1e6:8.0f} us/page")
+
+
+if __name__ == "__main__":
+    main()
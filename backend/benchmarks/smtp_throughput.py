@@ -0,0 +1,122 @@
+"""
+对比 SMTP 发送吞吐量：每封邮件新建连接、连接池逐封发送、连接池批量并发发送
+
+使用本地 aiosmtpd 丢弃所有邮件作为 SMTP 服务器，EHLO 时延迟 --handshake-ms
+模拟真实网络中 TLS 握手和认证的往返开销：
+
+    python -m benchmarks.smtp_throughput --count 2000 --handshake-ms 50
+"""
+import argparse
+import asyncio
+import logging
+import socket
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest.mock import patch
+
+import emails  # type: ignore
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from app.core.config import settings
+from app.utils import (
+    generate_test_email,
+    get_smtp_options,
+    send_email,
+    send_email_batch,
+)
+
+
+class SlowHandshakeSink(Sink):  # type: ignore[misc]
+    def __init__(self, handshake_ms: float) -> None:
+        self.handshake_seconds = handshake_ms / 1000
+
+    async def handle_EHLO(
+        self, server: Any, session: Any, envelope: Any, hostname: str, responses: list[str]  # noqa: ARG002
+    ) -> list[str]:
+        await asyncio.sleep(self.handshake_seconds)
+        session.host_name = hostname
+        return responses
+
+
+def send_unpooled(*, email_to: str, subject: str, html_content: str) -> None:
+    # 旧实现：每封邮件都新建连接
+    message = emails.Message(
+        subject=subject,
+        html=html_content,
+        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+    )
+    message.send(to=email_to, smtp=get_smtp_options())
+
+
+def measure(name: str, count: int, send: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    send()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>22}: {count / elapsed:8.0f} emails/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    logging.getLogger("app.utils").setLevel(logging.WARNING)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    controller = Controller(SlowHandshakeSink(args.handshake_ms), hostname="127.0.0.1", port=port)
+    controller.start()
+
+    email_data = generate_test_email(email_to="user@example.com")
+    recipients = [f"user{i}@example.com" for i in range(args.count)]
+    batches = [
+        [(email_to, email_data) for email_to in recipients[i : i + args.batch_size]]
+        for i in range(0, args.count, args.batch_size)
+    ]
+
+    def unpooled() -> None:
+        for email_to in recipients:
+            send_unpooled(
+                email_to=email_to,
+                subject=email_data.subject,
+                html_content=email_data.html_content,
+            )
+
+    def pooled() -> None:
+        for email_to in recipients:
+            send_email(
+                email_to=email_to,
+                subject=email_data.subject,
+                html_content=email_data.html_content,
+            )
+
+    def pooled_batches() -> None:
+        with ThreadPoolExecutor(settings.SMTP_POOL_SIZE) as executor:
+            list(executor.map(lambda batch: send_email_batch(messages=batch), batches))
+
+    try:
+        with (
+            patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+            patch("app.core.config.settings.SMTP_PORT", port),
+            patch("app.core.config.settings.SMTP_TLS", False),
+            patch("app.core.config.settings.SMTP_SSL", False),
+            patch("app.core.config.settings.SMTP_USER", None),
+            patch("app.core.config.settings.SMTP_PASSWORD", None),
+            patch("app.core.config.settings.EMAILS_FROM_EMAIL", "info@example.com"),
+        ):
+            measure("new connection / email", args.count, unpooled)
+            measure("pooled", args.count, pooled)
+            measure(
+                f"pooled x{settings.SMTP_POOL_SIZE} batches", args.count, pooled_batches
+            )
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
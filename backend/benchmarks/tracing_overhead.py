@@ -0,0 +1,74 @@
+"""
+测量不同采样比例下链路追踪带来的请求延迟开销
+
+依次以各个采样比例启用追踪（span 导出到临时文件），请求项目列表，
+对比 p50/p99 延迟。需要已执行迁移的 Postgres 数据库：
+
+    python -m benchmarks.tracing_overhead --requests 2000 --rates 0 0.01 0.1 1
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.config import settings
+from app.main import app
+
+
+def measure(client: TestClient, headers: dict[str, str], requests: int) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(f"{settings.API_V1_STR}/projects/", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rates", type=float, nargs="+", default=[0, 0.01, 0.1, 1])
+    args = parser.parse_args()
+
+    with TestClient(app) as client, tempfile.TemporaryDirectory() as tmp:
+        r = client.post(
+            f"{settings.API_V1_STR}/login/access-token",
+            data={
+                "username": settings.FIRST_SUPERUSER,
+                "password": settings.FIRST_SUPERUSER_PASSWORD,
+            },
+        )
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        # 预热，不计入结果
+        measure(client, headers, 100)
+
+        instrumented = False
+        print(f"{'rate':>6} {'p50 ms':>8} {'p99 ms':>8} {'spans':>8}")
+        for rate in args.rates:
+            export_file = Path(tmp) / f"spans-{rate}.jsonl"
+            with patch.multiple(
+                settings, TRACING_SAMPLE_RATE=rate, TRACING_EXPORT_FILE=str(export_file)
+            ):
+                tracing.setup_tracing("benchmark")
+            # 请求 span 由中间件创建，SQL span 需要为引擎注册一次事件
+            if rate > 0 and not instrumented:
+                tracing.instrument_tracing(app.state.engine)
+                instrumented = True
+            latencies = measure(client, headers, args.requests)
+            tracing.shutdown_tracing()
+            spans = (
+                sum(line.count('"spanId"') for line in export_file.open())
+                if export_file.exists()
+                else 0
+            )
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(f"{rate:>6} {quantiles[49]:8.2f} {quantiles[98]:8.2f} {spans:>8}")
+
+
+if __name__ == "__main__":
+    main()
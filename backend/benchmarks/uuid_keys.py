@@ -0,0 +1,120 @@
+"""
+对比 uuid4 和 UUIDv7 主键的写入吞吐量、主键索引大小和 WAL 写入量
+
+分别向只有 UUID 主键的临时表中按批写入相同数量的行，每写入 --report-every 行
+输出一次该区间的吞吐量。uuid4 的随机插入在索引超出 shared_buffers 后吞吐量明显下降，
+UUIDv7 始终追加在索引末尾。结束后输出主键索引和表的大小，测试表随后删除。
+
+需要 Postgres 数据库：
+
+    python -m benchmarks.uuid_keys --rows 50000000 --report-every 5000000
+"""
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Engine,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    insert,
+    text,
+)
+
+from app.core.db import create_db_engine
+from app.models import uuid7
+from app.utils import get_beijing_time
+
+factories: dict[str, Callable[[], uuid.UUID]] = {"v4": uuid.uuid4, "v7": uuid7}
+
+
+def create_table(engine: Engine, version: str) -> Table:
+    table = Table(
+        f"uuid_benchmark_{version}",
+        MetaData(),
+        Column("id", Uuid, primary_key=True),
+        Column("owner_id", Uuid, nullable=False),
+        Column("title", String(255), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+    return table
+
+
+def wal_lsn(engine: Engine) -> str:
+    with engine.connect() as conn:
+        return str(conn.execute(text("SELECT pg_current_wal_lsn()")).scalar_one())
+
+
+def run(engine: Engine, version: str, rows: int, batch: int, report_every: int) -> None:
+    table = create_table(engine, version)
+    factory = factories[version]
+    owner_id = uuid.uuid4()
+    start_lsn = wal_lsn(engine)
+    started = interval_started = time.perf_counter()
+    interval_rows = 0
+    for start in range(0, rows, batch):
+        now = get_beijing_time()
+        values = [
+            {
+                "id": factory(),
+                "owner_id": owner_id,
+                "title": f"row {i}",
+                "created_at": now,
+            }
+            for i in range(start, min(start + batch, rows))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(table), values)
+        interval_rows += len(values)
+        if interval_rows >= report_every or start + batch >= rows:
+            elapsed = time.perf_counter() - interval_started
+            print(
+                f"{version}: {start + len(values):>11,d} rows  "
+                f"{interval_rows / elapsed:>9,.0f} rows/s"
+            )
+            interval_started = time.perf_counter()
+            interval_rows = 0
+    total = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        index_size, table_size, wal_bytes = conn.execute(
+            text(
+                "SELECT pg_relation_size(:index), pg_relation_size(:table), "
+                "pg_wal_lsn_diff(pg_current_wal_lsn(), :lsn)"
+            ),
+            {"index": f"{table.name}_pkey", "table": table.name, "lsn": start_lsn},
+        ).one()
+    print(
+        f"{version}: total {rows / total:,.0f} rows/s  "
+        f"pkey {index_size / 2**20:,.0f}MB  table {table_size / 2**20:,.0f}MB  "
+        f"WAL {float(wal_bytes) / 2**20:,.0f}MB"
+    )
+    table.drop(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument(
+        "--versions", nargs="+", choices=list(factories), default=["v4", "v7"]
+    )
+    args = parser.parse_args()
+
+    engine = create_db_engine()
+    if engine.dialect.name != "postgresql":
+        parser.error("uuid_keys benchmark requires PostgreSQL")
+    for version in args.versions:
+        run(engine, version, args.rows, args.batch, args.report_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+对比两种启动方式下每个 worker 的内存占用：
+
+- spawn：fastapi run --workers，每个 worker 各自导入应用
+- preload：python -m app.serve --workers，worker 由已导入并预热应用的主进程 fork 出来
+
+服务启动并处理若干请求后，读取各进程的 /proc/<pid>/smaps_rollup（仅支持 Linux）：
+Shared 为与其他进程共享的内存，Private 为进程独占的内存，PSS 将共享内存按共享进程数分摊，
+所有进程的 PSS 之和即服务实际占用的内存。无需连接数据库：
+
+    python -m benchmarks.worker_memory --workers 4
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from app.core.config import settings
+
+# 启动后请求的接口，使 worker 完成首次请求时的延迟初始化
+warm_paths = [
+    f"{settings.API_V1_STR}/health/live",
+    f"{settings.API_V1_STR}/openapi.json",
+    "/docs",
+]
+
+
+@dataclass
+class ProcessMemory:
+    pid: int
+    rss_kb: int
+    pss_kb: int
+    shared_kb: int
+    private_kb: int
+
+
+def parse_smaps_rollup(pid: int, text: str) -> ProcessMemory:
+    fields: dict[str, int] = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(":")
+        parts = value.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            fields[name] = int(parts[0])
+    return ProcessMemory(
+        pid=pid,
+        rss_kb=fields["Rss"],
+        pss_kb=fields["Pss"],
+        shared_kb=fields["Shared_Clean"] + fields["Shared_Dirty"],
+        private_kb=fields["Private_Clean"] + fields["Private_Dirty"],
+    )
+
+
+def read_memory(pid: int) -> ProcessMemory:
+    return parse_smaps_rollup(pid, Path(f"/proc/{pid}/smaps_rollup").read_text())
+
+
+def child_pids(pid: int) -> list[int]:
+    children = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # comm 中可能有空格，ppid 在最后一个 ")" 之后的第二个字段
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat.parent.name))
+    return sorted(children)
+
+
+def worker_pids(pid: int) -> list[int]:
+    """multiprocessing 的 resource_tracker 等辅助进程不计为 worker"""
+    return [
+        child
+        for child in child_pids(pid)
+        if b"resource_tracker" not in Path(f"/proc/{child}/cmdline").read_bytes()
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def server_command(mode: str, workers: int, port: int) -> list[str]:
+    if mode == "spawn":
+        return [
+            sys.executable,
+            "-m",
+            "fastapi",
+            "run",
+            "app/main.py",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ]
+    return [
+        sys.executable,
+        "-m",
+        "app.serve",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+    ]
+
+
+def measure(
+    mode: str, workers: int, requests: int, timeout: float
+) -> list[ProcessMemory]:
+    """返回主进程和各 worker 的内存，主进程在第一个"""
+    port = free_port()
+    process = subprocess.Popen(
+        server_command(mode, workers, port),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while len(worker_pids(process.pid)) < workers or not ready(client):
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError(f"{mode} server did not start")
+                time.sleep(0.2)
+            # 新连接由各 worker 轮流接受，请求足够多时每个 worker 都会处理到
+            for i in range(requests):
+                client.get(
+                    warm_paths[i % len(warm_paths)], headers={"Connection": "close"}
+                )
+        time.sleep(1)
+        return [read_memory(process.pid)] + [
+            read_memory(pid) for pid in worker_pids(process.pid)
+        ]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def ready(client: httpx.Client) -> bool:
+    try:
+        return client.get(warm_paths[0]).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--modes", nargs="+", choices=["spawn", "preload"], default=["spawn", "preload"]
+    )
+    args = parser.parse_args()
+    # 数据库不可用时预热只会记录警告，跳过以免等待连接超时
+    os.environ.setdefault("WARMUP_ENABLED", "false")
+
+    for mode in args.modes:
+        master, *workers = measure(mode, args.workers, args.requests, args.timeout)
+        print(f"\n{mode} ({len(workers)} workers)")
+        print(
+            f"{'process':<10} {'RSS MB':>8} {'Shared MB':>10} {'Private MB':>11} {'PSS MB':>8}"
+        )
+        for label, memory in [("master", master)] + [
+            (f"worker {i}", memory) for i, memory in enumerate(workers, 1)
+        ]:
+            print(
+                f"{label:<10} {memory.rss_kb / 1024:8.1f} {memory.shared_kb / 1024:10.1f} "
+                f"{memory.private_kb / 1024:11.1f} {memory.pss_kb / 1024:8.1f}"
+            )
+        total = sum(memory.pss_kb for memory in [master, *workers])
+        print(f"{'total PSS':<10} {total / 1024:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,12 @@ from sqlmodel import Session
 from app.core.config import settings
 from app.core.security import verify_password
 
+from app.crud.purge import crud_soft_delete_user
 from app.crud.users import crud_create_user
 
 from app.models import UserCreate
 from app.utils import generate_password_reset_token
-from tests.utils.user import user_authentication_headers
+from tests.utils.user import create_random_user, user_authentication_headers
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -74,6 +75,13 @@ def test_recovery_password_user_not_exits(
     assert r.status_code == 404
 
 
+def test_recovery_password_deleted_user(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    crud_soft_delete_user(session=db, user=user)
+    r = client.post(f"{settings.API_V1_STR}/password-recovery/{user.email}")
+    assert r.status_code == 404
+
+
 def test_reset_password(client: TestClient, db: Session) -> None:
     email = random_email()
     password = random_lower_string()
@@ -118,3 +126,12 @@ def test_reset_password_invalid_token(
     assert "detail" in response
     assert r.status_code == 400
     assert response["detail"] == "Invalid token"
+
+
+def test_reset_password_deleted_user(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    token = generate_password_reset_token(email=user.email)
+    crud_soft_delete_user(session=db, user=user)
+    data = {"new_password": random_lower_string(), "token": token}
+    r = client.post(f"{settings.API_V1_STR}/reset-password/", json=data)
+    assert r.status_code == 404
@@ -1,10 +1,13 @@
 import uuid
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.core.config import settings
+from app.models import Task
+from app.purge_worker import run_pending_jobs
 from tests.utils.project import create_random_project
+from tests.utils.task import create_random_task
 
 
 def test_create_project(
@@ -79,6 +82,84 @@ def test_read_projects(
     assert len(content["data"]) >= 2
 
 
+def test_read_projects_keyset(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_project(db)
+    url = f"{settings.API_V1_STR}/projects/"
+    ids = [p["id"] for p in client.get(url, headers=superuser_token_headers).json()["data"]]
+    assert ids == sorted(ids)
+
+    # 以上一页最后一个 id 作为游标，逐页取完与一次取出的结果相同
+    pages: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = client.get(url, headers=superuser_token_headers, params=params)
+        data = response.json()["data"]
+        if not data:
+            break
+        pages.extend(p["id"] for p in data)
+        params["after"] = data[-1]["id"]
+    assert pages == ids
+
+
+def test_read_project_etag(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    url = f"{settings.API_V1_STR}/projects/{project.id}"
+    response = client.get(url, headers=superuser_token_headers)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    client.put(url, headers=superuser_token_headers, json={"title": "Changed"})
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Changed"
+
+
+def test_read_project_etag_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers={**normal_user_token_headers, "If-None-Match": "*"},
+    )
+    assert response.status_code == 400
+
+
+def test_read_projects_etag(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_project(db)
+    url = f"{settings.API_V1_STR}/projects/"
+    etag = client.get(url, headers=superuser_token_headers).headers["etag"]
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    # 分页参数不同，ETag 也不同
+    response = client.get(
+        f"{url}?limit=1", headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    create_random_project(db)
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
 def test_update_project(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -139,6 +220,22 @@ def test_delete_project(
     assert content["message"] == "Project deleted successfully"
 
 
+def test_delete_project_cascades_to_tasks(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    task = create_random_task(db, project)
+    task_id = task.id
+    response = client.delete(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    run_pending_jobs(db)
+    db.expire_all()
+    assert db.exec(select(Task).where(Task.id == task_id)).first() is None
+
+
 def test_delete_project_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
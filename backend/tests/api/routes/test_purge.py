@@ -0,0 +1,138 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.crud.purge import crud_soft_delete_project, crud_soft_delete_user
+from app.models import ProjectCollaboratorLink, TaskCollaboratorLink
+from app.purge_worker import run_pending_jobs
+from tests.utils.project import create_random_project
+from tests.utils.task import create_random_task
+from tests.utils.user import create_random_user
+
+
+def test_deleted_project_is_hidden_before_purge(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    response = client.delete(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+    )
+    assert str(project.id) not in {p["id"] for p in response.json()["data"]}
+
+
+def test_read_purge_job_progress(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    for _ in range(3):
+        create_random_task(db, project)
+    response = client.delete(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers=superuser_token_headers,
+    )
+    purge_job_id = response.json()["purge_job_id"]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/purge-jobs/{purge_job_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["status"] == "pending"
+    assert content["target_id"] == str(project.id)
+
+    assert run_pending_jobs(db) == 1
+    response = client.get(
+        f"{settings.API_V1_STR}/purge-jobs/{purge_job_id}",
+        headers=superuser_token_headers,
+    )
+    content = response.json()
+    assert content["status"] == "completed"
+    # 3 个任务 + 1 个项目
+    assert content["deleted_rows"] == 4
+    assert content["finished_at"]
+
+
+def test_purge_keeps_shared_collaborators(db: Session) -> None:
+    project = create_random_project(db)
+    other_project = create_random_project(db)
+    task = create_random_task(db, other_project)
+    user = create_random_user(db)
+    collaborator = create_random_user(db)
+    # collaborator 同时协作两个项目；user 与 collaborator 协作同一项目和任务
+    db.add_all(
+        [
+            ProjectCollaboratorLink(project_id=project.id, user_id=collaborator.id),
+            ProjectCollaboratorLink(
+                project_id=other_project.id, user_id=collaborator.id
+            ),
+            ProjectCollaboratorLink(project_id=other_project.id, user_id=user.id),
+            TaskCollaboratorLink(task_id=task.id, user_id=collaborator.id),
+            TaskCollaboratorLink(task_id=task.id, user_id=user.id),
+        ]
+    )
+    db.commit()
+
+    project_ids = [project.id, other_project.id]
+    expected = (other_project.id, collaborator.id)
+    task_id = task.id
+    crud_soft_delete_project(session=db, project=project)
+    crud_soft_delete_user(session=db, user=user)
+    run_pending_jobs(db)
+
+    project_links = db.exec(
+        select(
+            ProjectCollaboratorLink.project_id, ProjectCollaboratorLink.user_id
+        ).where(col(ProjectCollaboratorLink.project_id).in_(project_ids))
+    ).all()
+    assert set(project_links) == {expected}
+    task_links = db.exec(
+        select(TaskCollaboratorLink.user_id).where(
+            TaskCollaboratorLink.task_id == task_id
+        )
+    ).all()
+    assert task_links == [expected[1]]
+
+
+def test_read_purge_job_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/purge-jobs/{uuid.uuid4()}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Purge job not found"
+
+
+def test_read_purge_job_not_enough_permissions(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+) -> None:
+    project = create_random_project(db)
+    response = client.delete(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers=superuser_token_headers,
+    )
+    purge_job_id = response.json()["purge_job_id"]
+    response = client.get(
+        f"{settings.API_V1_STR}/purge-jobs/{purge_job_id}",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
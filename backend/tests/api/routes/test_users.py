@@ -4,11 +4,16 @@ from unittest.mock import patch
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
+from app.crud.purge import crud_soft_delete_user
 from app.crud.users import crud_create_user, crud_get_user_by_email, crud_update_user
 
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import Project, Task, User, UserCreate
+from app.purge_worker import run_pending_jobs
+from tests.utils.project import create_random_project
+from tests.utils.task import create_random_task
+from tests.utils.user import create_random_user, user_authentication_headers
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -103,6 +108,31 @@ def test_get_existing_user_current_user(client: TestClient, db: Session) -> None
     assert existing_user.email == api_user["email"]
 
 
+def test_get_user_etag(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud_create_user(session=db, user_create=user_in)
+    url = f"{settings.API_V1_STR}/users/{user.id}"
+    etag = client.get(url, headers=superuser_token_headers).headers["etag"]
+    r = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    client.patch(url, headers=superuser_token_headers, json={"full_name": "Changed"})
+    r = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["full_name"] == "Changed"
+
+
+def test_get_users_me_etag(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    etag = client.get(url, headers=normal_user_token_headers).headers["etag"]
+    r = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+
+
 def test_get_existing_user_permissions_error(
     client: TestClient, normal_user_token_headers: dict[str, str]
 ) -> None:
@@ -169,6 +199,20 @@ def test_retrieve_users(
         assert "email" in project
 
 
+def test_retrieve_users_etag(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    url = f"{settings.API_V1_STR}/users/"
+    etag = client.get(url, headers=superuser_token_headers).headers["etag"]
+    r = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    crud_create_user(session=db, user_create=user_in)
+    r = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -305,6 +349,23 @@ def test_register_user(client: TestClient, db: Session) -> None:
     assert verify_password(password, user_db.hashed_password)
 
 
+def test_register_user_after_delete(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    email = user.email
+    crud_soft_delete_user(session=db, user=user)
+    password = random_lower_string()
+    r = client.post(
+        f"{settings.API_V1_STR}/users/signup",
+        json={"email": email, "password": password},
+    )
+    # 已删除用户的邮箱可以重新注册
+    assert r.status_code == 200
+    assert r.json()["id"] != str(user.id)
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.json()["id"] != str(user.id)
+
+
 def test_register_user_already_exists_error(client: TestClient) -> None:
     password = random_lower_string()
     full_name = random_lower_string()
@@ -406,9 +467,16 @@ def test_delete_user_me(client: TestClient, db: Session) -> None:
     assert r.status_code == 200
     deleted_user = r.json()
     assert deleted_user["message"] == "User deleted successfully"
+    assert deleted_user["purge_job_id"]
     result = db.exec(select(User).where(User.id == user_id)).first()
-    assert result is None
+    assert result
+    db.refresh(result)
+    assert result.deleted_at is not None
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 404
 
+    run_pending_jobs(db)
     user_query = select(User).where(User.id == user_id)
     user_db = db.execute(user_query).first()
     assert user_db is None
@@ -441,10 +509,28 @@ def test_delete_user_super_user(
     assert r.status_code == 200
     deleted_user = r.json()
     assert deleted_user["message"] == "User deleted successfully"
+    run_pending_jobs(db)
     result = db.exec(select(User).where(User.id == user_id)).first()
     assert result is None
 
 
+def test_delete_user_cascades_to_projects_and_tasks(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    task = create_random_task(db, project)
+    project_id, task_id = project.id, task.id
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{project.owner_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    run_pending_jobs(db)
+    db.expire_all()
+    assert db.exec(select(Project).where(Project.id == project_id)).first() is None
+    assert db.exec(select(Task).where(Task.id == task_id)).first() is None
+
+
 def test_delete_user_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -0,0 +1,101 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def get_profile_token(client: TestClient, headers: dict[str, str]) -> str:
+    r = client.post(f"{settings.API_V1_STR}/utils/profile-token/", headers=headers)
+    assert r.status_code == 200
+    return str(r.json()["token"])
+
+
+def test_profile_request(
+    client: TestClient, superuser_token_headers: dict[str, str], tmp_path: Path
+) -> None:
+    token = get_profile_token(client, superuser_token_headers)
+    with patch("app.core.config.settings.PROFILE_DIR", str(tmp_path)):
+        r = client.get(
+            f"{settings.API_V1_STR}/projects/",
+            headers={**superuser_token_headers, "X-Profile": token},
+        )
+        assert r.status_code == 200
+        profile_id = r.headers["x-profile-id"]
+
+        r = client.get(
+            f"{settings.API_V1_STR}/utils/profiles/{profile_id}",
+            headers=superuser_token_headers,
+        )
+        assert r.status_code == 200
+        report = r.json()
+        assert report["path"] == f"{settings.API_V1_STR}/projects/"
+        assert report["status_code"] == 200
+        assert report["duration_ms"] > 0
+        assert any("FROM project" in s["statement"] for s in report["statements"])
+
+        r = client.get(
+            f"{settings.API_V1_STR}/utils/profiles/{profile_id}/flamegraph",
+            headers=superuser_token_headers,
+        )
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/html")
+
+
+def test_profile_query_param(
+    client: TestClient, superuser_token_headers: dict[str, str], tmp_path: Path
+) -> None:
+    token = get_profile_token(client, superuser_token_headers)
+    with patch("app.core.config.settings.PROFILE_DIR", str(tmp_path)):
+        r = client.get(
+            f"{settings.API_V1_STR}/users/me",
+            headers=superuser_token_headers,
+            params={"profile": token},
+        )
+        assert r.status_code == 200
+        assert (tmp_path / f"{r.headers['x-profile-id']}.json").exists()
+
+
+def test_profile_not_requested(
+    client: TestClient, superuser_token_headers: dict[str, str], tmp_path: Path
+) -> None:
+    with patch("app.core.config.settings.PROFILE_DIR", str(tmp_path)):
+        r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert "x-profile-id" not in r.headers
+    assert not any(tmp_path.iterdir())
+
+
+def test_profile_token_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/utils/profile-token/",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_profile_invalid_token(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    # 访问令牌不能作为性能分析令牌使用
+    access_token = normal_user_token_headers["Authorization"].split()[1]
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={**normal_user_token_headers, "X-Profile": access_token},
+    )
+    assert r.status_code == 403
+    assert r.json() == {"detail": "Invalid profile token"}
+
+
+def test_profile_token_is_not_access_token(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    token = get_profile_token(client, superuser_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 403
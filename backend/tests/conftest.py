@@ -1,31 +1,125 @@
+import os
 from collections.abc import Generator
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import Session, delete
+# 测试模式：降低 bcrypt 轮数、关闭限流和启动预热，需在导入 app 之前设置
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("WARMUP_ENABLED", "false")
 
-from app.core.config import settings
-from app.core.db import engine, init_db
-from app.main import app
-from app.models import User, Project
-from tests.utils.user import authentication_token_from_email
-from tests.utils.utils import get_superuser_token_headers
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import Connection, Engine, event, text  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
 
+from app.api.deps.common import get_db  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.db import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.utils.user import authentication_token_from_email  # noqa: E402
+from tests.utils.utils import get_superuser_token_headers  # noqa: E402
 
-@pytest.fixture(scope="session", autouse=True)
-def db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
-        init_db(session)
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--db",
+        choices=["postgres", "sqlite"],
+        default=os.getenv("TEST_DB", "postgres"),
+        help="测试数据库：postgres（默认）或内存 SQLite",
+    )
+
+
+def _create_sqlite_engine() -> Engine:
+    # 内存 SQLite，所有线程共享同一个连接
+    test_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(test_engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, _connection_record):  # type: ignore[no-untyped-def]
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    SQLModel.metadata.create_all(test_engine)
+    return test_engine
+
+
+def _create_postgres_engine(worker_id: str) -> Engine:
+    if worker_id == "master":
+        # 未启用 xdist 时直接使用已迁移的数据库
+        return create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+    # xdist 每个 worker 使用独立 schema，避免相互干扰
+    schema = f"test_{worker_id}"
+    with create_engine(str(settings.SQLALCHEMY_DATABASE_URI)).begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    test_engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        connect_args={"options": f"-csearch_path={schema}"},
+    )
+    SQLModel.metadata.create_all(test_engine)
+    return test_engine
+
+
+@pytest.fixture(scope="session")
+def engine(request: pytest.FixtureRequest) -> Generator[Engine, None, None]:
+    worker_id = os.getenv("PYTEST_XDIST_WORKER", "master")
+    if request.config.getoption("--db") == "sqlite":
+        test_engine = _create_sqlite_engine()
+    else:
+        test_engine = _create_postgres_engine(worker_id)
+    yield test_engine
+    if test_engine.dialect.name == "postgresql" and worker_id != "master":
+        with test_engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "test_{worker_id}" CASCADE'))
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def connection(engine: Engine) -> Generator[Connection, None, None]:
+    """
+    整个测试会话共用一个连接并开启外层事务，结束时全部回滚，不在数据库中留下数据
+    """
+    with engine.connect() as conn:
+        transaction = conn.begin()
+
+        def override_get_db() -> Generator[Session, None, None]:
+            # 请求内的 commit 只会释放 SAVEPOINT，不会提交外层事务
+            with Session(
+                bind=conn, join_transaction_mode="create_savepoint"
+            ) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        with Session(bind=conn, join_transaction_mode="create_savepoint") as session:
+            init_db(session)
+        yield conn
+        app.dependency_overrides.pop(get_db, None)
+        transaction.rollback()
+
+
+@pytest.fixture(autouse=True)
+def savepoint(connection: Connection) -> Generator[None, None, None]:
+    """
+    每个用例包在 SAVEPOINT 中，结束后回滚，用例之间互不影响
+    """
+    nested = connection.begin_nested()
+    yield
+    if nested.is_active:
+        nested.rollback()
+
+
+@pytest.fixture()
+def db(connection: Connection, savepoint: None) -> Generator[Session, None, None]:  # noqa: ARG001
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
         yield session
-        statement = delete(Project)
-        session.execute(statement)
-        statement = delete(User)
-        session.execute(statement)
-        session.commit()
 
 
 @pytest.fixture(scope="module")
-def client() -> Generator[TestClient, None, None]:
+def client(connection: Connection) -> Generator[TestClient, None, None]:  # noqa: ARG001
     with TestClient(app) as c:
         yield c
 
@@ -36,7 +130,10 @@ def superuser_token_headers(client: TestClient) -> dict[str, str]:
 
 
 @pytest.fixture(scope="module")
-def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]:
-    return authentication_token_from_email(
-        client=client, email=settings.EMAIL_TEST_USER, db=db
-    )
+def normal_user_token_headers(
+    client: TestClient, connection: Connection
+) -> dict[str, str]:
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+        return authentication_token_from_email(
+            client=client, email=settings.EMAIL_TEST_USER, db=session
+        )
@@ -0,0 +1,106 @@
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, create_engine, text
+
+from app.api.deps.common import SessionDep
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    database_breaker,
+    instrument_circuit_breaker,
+    probe_database,
+)
+
+
+def test_circuit_breaker_states() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    assert breaker.before_call() is False
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # 打开后仍在执行的请求失败时不推迟半开的时间
+    opened_at = breaker.opened_at
+    breaker.record_failure()
+    assert breaker.opened_at == opened_at
+
+    # 半开时只放行一个探测，探测失败重新打开
+    time.sleep(0.06)
+    assert breaker.before_call() is True
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # 探测成功后关闭
+    time.sleep(0.06)
+    assert breaker.before_call() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    assert breaker.before_call() is False
+
+
+def test_probe_database(tmp_path: Path) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    unavailable = create_engine("sqlite:////nonexistent/dir/breaker.db")
+    with pytest.raises(OperationalError):
+        probe_database(unavailable, breaker)
+    assert breaker.state == "open"
+    # 打开期间不再连接数据库
+    with pytest.raises(CircuitOpenError):
+        probe_database(create_engine(f"sqlite:///{tmp_path}/breaker.db"), breaker)
+
+
+def test_instrumented_engine(tmp_path: Path) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    unavailable = create_engine("sqlite:////nonexistent/dir/breaker.db")
+    instrument_circuit_breaker(unavailable, breaker)
+    for _ in range(2):
+        with pytest.raises(OperationalError), Session(unavailable) as session:
+            session.exec(text("SELECT 1"))  # type: ignore[call-overload]
+    assert breaker.state == "open"
+
+    # SQL 错误不计为失败，执行成功的语句清零失败次数
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    engine = create_engine(f"sqlite:///{tmp_path}/breaker.db")
+    instrument_circuit_breaker(engine, breaker)
+    with Session(engine) as session:
+        with pytest.raises(OperationalError):
+            session.exec(text("SELECT * FROM missing"))  # type: ignore[call-overload]
+        assert breaker.state == "closed"
+        breaker.failures = 1
+        session.exec(text("SELECT 1"))  # type: ignore[call-overload]
+    assert breaker.failures == 0
+
+
+def test_get_db_fails_fast(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    app = FastAPI()
+    app.state.engine = create_engine(f"sqlite:///{tmp_path}/breaker.db")
+
+    @app.get("/")
+    def read(session: SessionDep) -> int:
+        return int(session.exec(text("SELECT 1")).one()[0])  # type: ignore[call-overload]
+
+    client = TestClient(app)
+    monkeypatch.setattr(database_breaker, "state", "open")
+    monkeypatch.setattr(database_breaker, "opened_at", time.monotonic())
+    r = client.get("/")
+    assert r.status_code == 503
+    assert r.json() == {"detail": "Database unavailable"}
+    assert 1 <= int(r.headers["retry-after"]) <= database_breaker.reset_timeout + 1
+
+    # 半开时由请求执行探测，成功后关闭并正常处理
+    monkeypatch.setattr(database_breaker, "opened_at", 0.0)
+    r = client.get("/")
+    assert r.status_code == 200
+    assert database_breaker.state == "closed"
@@ -0,0 +1,157 @@
+import gzip
+import zlib
+
+import anyio
+import brotli
+import zstandard
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.types import Message
+
+from app.core.compression import CompressionMiddleware, select_encoding
+from app.core.config import settings
+
+large_text = "hello world " * 200
+
+
+async def large(_request: Request) -> Response:
+    return PlainTextResponse(large_text)
+
+
+async def small(_request: Request) -> Response:
+    return PlainTextResponse("ok")
+
+
+async def stream(_request: Request) -> Response:
+    async def chunks():  # type: ignore[no-untyped-def]
+        for _ in range(3):
+            yield large_text
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def image(_request: Request) -> Response:
+    return Response(b"\x89PNG" * 500, media_type="image/png")
+
+
+compression_app = Starlette(
+    routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/stream", stream),
+        Route("/image", image),
+    ]
+)
+compression_app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+def test_select_encoding() -> None:
+    assert select_encoding("") is None
+    assert select_encoding("identity") is None
+    assert select_encoding("gzip") == "gzip"
+    assert select_encoding("gzip, deflate, br") == "br"
+    assert select_encoding("gzip, br, zstd") == "zstd"
+    assert select_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+    assert select_encoding("*, zstd;q=0") == "br"
+    assert select_encoding("gzip;q=0") is None
+
+
+def test_compress_gzip() -> None:
+    with TestClient(compression_app) as client:
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(large_text)
+    assert response.text == large_text
+
+
+def test_compress_brotli_and_zstd() -> None:
+    with TestClient(compression_app) as client:
+        for encoding, decompress in (
+            ("br", brotli.decompress),
+            (
+                "zstd",
+                lambda data: (
+                    zstandard.ZstdDecompressor().decompressobj().decompress(data)
+                ),
+            ),
+        ):
+            with client.stream(
+                "GET", "/large", headers={"Accept-Encoding": encoding}
+            ) as response:
+                raw = b"".join(response.iter_raw())
+            assert response.headers["content-encoding"] == encoding
+            assert decompress(raw).decode() == large_text
+
+
+def test_skip_small_and_incompressible_responses() -> None:
+    with TestClient(compression_app) as client:
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "ok"
+        response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+def test_compress_streaming_response() -> None:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        # 客户端不会断开连接
+        await anyio.sleep_forever()
+        raise AssertionError
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    anyio.run(compression_app, scope, receive, send)
+    headers = Headers(raw=messages[0]["headers"])
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    chunks = [message["body"] for message in messages[1:]]
+    # 每块都已刷新，收到第一块即可解压出完整的第一段内容
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    assert decompressor.decompress(chunks[0]).decode() == large_text
+    assert gzip.decompress(b"".join(chunks)).decode() == large_text * 3
+
+
+def test_openapi_precompressed(client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/openapi.json"
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["info"]["title"] == settings.PROJECT_NAME
+    response = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert "paths" in response.json()
+
+
+def test_precompressed_etag_per_encoding(client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/openapi.json"
+    etags = {
+        encoding: client.get(url, headers={"Accept-Encoding": encoding}).headers["etag"]
+        for encoding in ("identity", "gzip", "br", "zstd")
+    }
+    # 不同编码的字节内容不同，强 ETag 也不同
+    assert len(set(etags.values())) == 4
+    assert etags["gzip"].endswith('-gzip"')
+    # 其他编码的 ETag 不能用于重新验证
+    response = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": etags["br"]}
+    )
+    assert response.status_code == 200
+    response = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": etags["gzip"]}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,107 @@
+import time
+from pathlib import Path
+from typing import Annotated, Any
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import create_engine, text
+from starlette.requests import Request
+
+from app.api.deps.common import SessionDep
+from app.core.config import settings
+from app.core.deadlines import DeadlineMiddleware, request_deadline
+
+
+def sample(name: str, route: str) -> float:
+    return REGISTRY.get_sample_value(name, {"route": route}) or 0.0
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "state": {"received_at": 100.0},
+        }
+    )
+
+
+def test_request_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_SECONDS", 30.0)
+    assert request_deadline(make_request({})) == 130.0
+    # 请求头只能缩短超时
+    assert request_deadline(make_request({"X-Request-Timeout": "2.5"})) == 102.5
+    assert request_deadline(make_request({"X-Request-Timeout": "60"})) == 130.0
+    assert request_deadline(make_request({"X-Request-Timeout": "soon"})) == 130.0
+    assert request_deadline(make_request({"X-Request-Timeout": "-1"})) == 130.0
+
+    monkeypatch.setattr(settings, "REQUEST_ROUTE_TIMEOUTS", {"unmatched": 5.0})
+    assert request_deadline(make_request({})) == 105.0
+    # 未经过 DeadlineMiddleware 的请求没有截止时间
+    assert request_deadline(Request({"type": "http", "headers": []})) is None
+
+
+def create_app(engine: Engine) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware)
+    app.state.engine = engine
+
+    def wait_in_queue() -> None:
+        time.sleep(0.2)
+
+    @app.get("/queued")
+    def queued(_: Annotated[None, Depends(wait_in_queue)], session: SessionDep) -> Any:
+        return session.exec(text("SELECT 1")).one()[0]  # type: ignore[call-overload]
+
+    @app.get("/canceled")
+    def canceled(_session: SessionDep) -> Any:
+        orig = Exception("canceling statement due to statement timeout")
+        orig.sqlstate = "57014"  # type: ignore[attr-defined]
+        raise OperationalError("SELECT 1", {}, orig)
+
+    @app.get("/slow")
+    def slow(session: SessionDep) -> Any:
+        return session.exec(text("SELECT pg_sleep(2)")).one()  # type: ignore[call-overload]
+
+    return app
+
+
+def test_expired_request_rejected(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/deadlines.db")
+    client = TestClient(create_app(engine))
+    before = sample("request_deadline_exceeded_total", "queued_queued_get")
+
+    r = client.get("/queued")
+    assert r.status_code == 200
+
+    r = client.get("/queued", headers={"X-Request-Timeout": "0.1"})
+    assert r.status_code == 504
+    assert r.json() == {"detail": "Request deadline exceeded"}
+    after = sample("request_deadline_exceeded_total", "queued_queued_get")
+    assert after == before + 1
+
+
+def test_statement_timeout_reported(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/deadlines.db")
+    client = TestClient(create_app(engine))
+    before = sample("db_statement_timeouts_total", "canceled_canceled_get")
+
+    r = client.get("/canceled")
+    assert r.status_code == 504
+    after = sample("db_statement_timeouts_total", "canceled_canceled_get")
+    assert after == before + 1
+
+
+def test_statement_timeout_postgres(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        pytest.skip("statement_timeout requires PostgreSQL")
+    client = TestClient(create_app(engine))
+
+    start = time.perf_counter()
+    r = client.get("/slow", headers={"X-Request-Timeout": "0.3"})
+    assert r.status_code == 504
+    assert time.perf_counter() - start < 1.5
@@ -0,0 +1,54 @@
+import re
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.docs import immutable_cache_control
+
+
+def test_swagger_ui_uses_local_assets(client: TestClient) -> None:
+    response = client.get("/docs")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "cdn.jsdelivr.net" not in response.text
+    assert f"{settings.API_V1_STR}/openapi.json" in response.text
+
+    urls = re.findall(r"/docs/assets/[\w.-]+\?v=\w+", response.text)
+    assert len(urls) == 3
+    for url in urls:
+        asset = client.get(url)
+        assert asset.status_code == 200
+        assert asset.headers["cache-control"] == immutable_cache_control
+        assert asset.content
+
+
+def test_redoc_uses_local_assets(client: TestClient) -> None:
+    response = client.get("/redoc")
+    assert response.status_code == 200
+    assert "cdn.jsdelivr.net" not in response.text
+    assert "fonts.googleapis.com" not in response.text
+    assert "/docs/assets/redoc.standalone.js?v=" in response.text
+
+
+def test_asset_not_modified(client: TestClient) -> None:
+    url = "/docs/assets/swagger-ui.css"
+    response = client.get(url, headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["content-type"].startswith("text/css")
+    etag = response.headers["etag"]
+    response = client.get(url, headers={"Accept-Encoding": "br", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_unknown_asset(client: TestClient) -> None:
+    response = client.get("/docs/assets/missing.js")
+    assert response.status_code == 404
+
+
+def test_openapi_not_modified(client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/openapi.json"
+    response = client.get(url)
+    assert response.headers["cache-control"] == "no-cache"
+    response = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
@@ -0,0 +1,129 @@
+import time
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.circuit_breaker import database_breaker
+from app.core.health import live_path, ready_path
+from app.models import EmailOutbox
+from app.utils import get_beijing_time
+
+
+@pytest.fixture()
+def probe_engine(client: TestClient, tmp_path) -> Generator[Engine, None, None]:  # type: ignore[no-untyped-def]
+    # 就绪检查直接使用 app.state.engine，换成独立的数据库，不影响测试会话共用的连接
+    engine = create_engine(f"sqlite:///{tmp_path / 'health.db'}")
+    SQLModel.metadata.create_all(engine)
+    app_state = client.app.state  # type: ignore[attr-defined]
+    original = app_state.engine
+    app_state.engine = engine
+    with patch("app.core.config.settings.HEALTH_CACHE_MS", 0):
+        yield engine
+    app_state.engine = original
+    engine.dispose()
+
+
+def test_liveness(client: TestClient) -> None:
+    r = client.get(live_path)
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+
+
+def test_readiness(client: TestClient, probe_engine: Engine) -> None:  # noqa: ARG001
+    r = client.get(ready_path)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["status"] == "ok"
+    assert content["checks"]["database"]["ok"]
+    assert content["checks"]["outbox"]["lag_seconds"] == 0
+
+
+def test_readiness_outbox_lag_is_degraded(
+    client: TestClient, probe_engine: Engine
+) -> None:
+    with Session(probe_engine) as session:
+        session.add(
+            EmailOutbox(
+                email_to="user@example.com",
+                subject="lag",
+                html_content="",
+                next_attempt_at=get_beijing_time().replace(year=2000),
+            )
+        )
+        session.commit()
+    r = client.get(ready_path)
+    assert r.status_code == 200
+    assert r.json()["status"] == "degraded"
+    assert not r.json()["checks"]["outbox"]["ok"]
+
+
+def test_readiness_pool_saturated_is_degraded(client: TestClient) -> None:
+    app_state = client.app.state  # type: ignore[attr-defined]
+    original = app_state.engine
+    engine = create_engine(
+        "sqlite:////nonexistent/dir/health.db", pool_size=1, max_overflow=0
+    )
+    app_state.engine = engine
+    try:
+        # 占满连接池：数据库不可用也不会检出连接，就绪检查不访问数据库
+        with (
+            patch.object(engine.pool, "checkedout", return_value=1),
+            patch("app.core.config.settings.HEALTH_CACHE_MS", 0),
+        ):
+            r = client.get(ready_path)
+    finally:
+        app_state.engine = original
+    # 流量高峰时连接池占满不会让所有 worker 同时被摘除
+    assert r.status_code == 200
+    assert r.json()["status"] == "degraded"
+    assert r.json()["checks"]["pool"] == {"ok": False, "checked_out": 1, "capacity": 1}
+    assert "database" not in r.json()["checks"]
+
+
+def test_readiness_database_unavailable(client: TestClient) -> None:
+    app_state = client.app.state  # type: ignore[attr-defined]
+    original = app_state.engine
+    app_state.engine = create_engine("sqlite:////nonexistent/dir/health.db")
+    try:
+        with patch("app.core.config.settings.HEALTH_CACHE_MS", 0):
+            r = client.get(ready_path)
+    finally:
+        app_state.engine = original
+    assert r.status_code == 503
+    assert r.json()["status"] == "fail"
+    assert not r.json()["checks"]["database"]["ok"]
+
+
+def test_readiness_is_cached(client: TestClient, probe_engine: Engine) -> None:  # noqa: ARG001
+    client.get(ready_path)
+    with (
+        patch("app.core.config.settings.HEALTH_CACHE_MS", 60_000),
+        patch("app.core.health.run_checks") as run_checks,
+    ):
+        client.get(ready_path)
+        client.get(ready_path)
+    run_checks.assert_not_called()
+
+
+def test_readiness_circuit_breaker(
+    client: TestClient,
+    probe_engine: Engine,  # noqa: ARG001
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 熔断器打开时不访问数据库
+    monkeypatch.setattr(database_breaker, "state", "open")
+    monkeypatch.setattr(database_breaker, "opened_at", time.monotonic())
+    r = client.get(ready_path)
+    assert r.status_code == 503
+    assert r.json()["checks"]["circuit_breaker"] == {"ok": False, "state": "open"}
+    assert "database" not in r.json()["checks"]
+
+    # 半开时就绪检查即为探测，成功后关闭
+    monkeypatch.setattr(database_breaker, "opened_at", 0.0)
+    r = client.get(ready_path)
+    assert r.status_code == 200
+    assert r.json()["checks"]["circuit_breaker"] == {"ok": True, "state": "closed"}
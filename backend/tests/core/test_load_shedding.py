@@ -0,0 +1,88 @@
+import anyio
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.load_shedding import AdaptiveLimit, LoadSheddingMiddleware
+
+
+def test_adaptive_limit() -> None:
+    limit = AdaptiveLimit(initial=10, min_limit=2, max_limit=12, tolerance=2.0)
+    limit.update(0.1, inflight=10)
+    assert limit.baseline == 0.1
+
+    # 接近上限时加性增大，不超过最大值
+    for _ in range(5):
+        limit.update(0.1, inflight=10)
+    assert limit.limit == 12
+    # 远低于上限时不增大
+    limit.limit = 10
+    limit.update(0.1, inflight=2)
+    assert limit.limit == 10
+
+    # 延迟超过基线的 tolerance 倍时乘性减小，不低于最小值
+    limit.update(0.5, inflight=10)
+    assert limit.limit == 9
+    for _ in range(50):
+        limit.update(10.0, inflight=10)
+    assert limit.limit == 2
+    # 基线随持续变慢的延迟升高
+    assert limit.baseline is not None and limit.baseline > 1
+
+
+def test_queue_and_shed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_INITIAL_LIMIT", 1)
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_MIN_LIMIT", 1)
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_QUEUE_SIZE", 1)
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_QUEUE_TIMEOUT_MS", 200)
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_RETRY_AFTER_SECONDS", 3)
+
+    app = FastAPI()
+    app.add_middleware(LoadSheddingMiddleware)
+    release = anyio.Event()
+
+    @app.get("/wait")
+    async def wait() -> dict[str, bool]:
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/other")
+    async def other() -> dict[str, bool]:
+        return {"ok": True}
+
+    async def run() -> dict[str, httpx.Response]:
+        responses: dict[str, httpx.Response] = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            async def get(name: str, path: str) -> None:
+                responses[name] = await client.get(path)
+
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(get, "running", "/wait")
+                await anyio.sleep(0.05)
+                tg.start_soon(get, "queued", "/wait")
+                await anyio.sleep(0.05)
+                # 队列已满，立即拒绝
+                await get("rejected", "/wait")
+                # 其他路由的并发上限相互独立
+                await get("other", "/other")
+                # 排队的请求等待超时
+                await anyio.sleep(0.3)
+                assert "queued" in responses
+                tg.start_soon(get, "handed_off", "/wait")
+                await anyio.sleep(0.05)
+                # 完成的请求将许可转交给排队的请求
+                release.set()
+        return responses
+
+    responses = anyio.run(run)
+    assert responses["running"].status_code == 200
+    assert responses["other"].status_code == 200
+    assert responses["handed_off"].status_code == 200
+    for name in ("rejected", "queued"):
+        assert responses[name].status_code == 503
+        assert responses[name].headers["retry-after"] == "3"
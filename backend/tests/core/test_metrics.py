@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlmodel import create_engine, text
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine, metrics_path
+from app.core.security import get_password_hash, verify_password
+
+
+def sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_per_route(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    labels = {"route": "项目-read_projects", "method": "GET"}
+    before = sample("http_request_duration_seconds_count", labels)
+    r = client.get(
+        f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert sample("http_request_duration_seconds_count", labels) == before + 1
+    assert sample("http_requests_total", {**labels, "status": "200"}) >= 1
+    assert sample("http_requests_in_progress", labels) == 0
+
+    r = client.get(metrics_path)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'route="项目-read_projects"' in r.text
+    # 访问不存在的路径不会按 URL 生成新的标签
+    client.get("/no-such-path/123")
+    assert sample(
+        "http_requests_total",
+        {"route": "unmatched", "method": "GET", "status": "404"},
+    ) >= 1
+
+
+def test_metrics_password_hash() -> None:
+    before = sample("password_hash_duration_seconds_count", {"operation": "verify"})
+    hashed = get_password_hash("secret")
+    assert verify_password("secret", hashed)
+    after = sample("password_hash_duration_seconds_count", {"operation": "verify"})
+    assert after == before + 1
+    assert sample("password_hash_duration_seconds_count", {"operation": "hash"}) >= 1
+
+
+def test_metrics_database(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine)
+    before = sample("db_statement_duration_seconds_count", {"operation": "SELECT"})
+    with engine.connect() as connection:
+        checked_out = sample("db_pool_checked_out", {})
+        connection.execute(text("SELECT 1"))
+    after = sample("db_statement_duration_seconds_count", {"operation": "SELECT"})
+    assert after == before + 1
+    assert sample("db_pool_checked_out", {}) == checked_out - 1
+    engine.dispose()
+
+
+def test_metrics_multiprocess(tmp_path: Path) -> None:
+    # 两个进程分别记录请求，第三个进程的 /metrics 汇总两者的数据
+    record = textwrap.dedent(
+        """
+        from app.core.metrics import requests_total
+        requests_total.labels("项目-read_projects", "GET", "200").inc()
+        """
+    )
+    collect = textwrap.dedent(
+        """
+        from app.core.metrics import metrics_endpoint
+        print(metrics_endpoint(None).body.decode())
+        """
+    )
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    cwd = Path(__file__).parents[2]
+
+    def run(code: str) -> str:
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=cwd,
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout
+
+    run(record)
+    run(record)
+    output = run(collect)
+    assert (
+        'http_requests_total{method="GET",route="项目-read_projects",status="200"} 2.0'
+        in output
+    )
@@ -0,0 +1,158 @@
+import time
+from collections.abc import Generator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, bindparam
+from sqlmodel import SQLModel, create_engine, text
+
+from app.core.config import settings
+from app.core.metrics import current_route
+from app.core.slow_queries import (
+    SlowQueryStats,
+    capture_plan,
+    explaining,
+    instrument_slow_queries,
+    record_slow_query,
+    redact_parameters,
+    reserve_explain,
+    should_explain,
+    slow_queries,
+    statement_shape,
+)
+
+
+@pytest.fixture()
+def slow_engine(tmp_path: Path) -> Generator[Engine, None, None]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    SQLModel.metadata.create_all(engine)
+    instrument_slow_queries(engine)
+    slow_queries.clear()
+    # 阈值为 0 时所有语句都视为慢查询
+    with patch("app.core.config.settings.SLOW_QUERY_THRESHOLD_MS", 0):
+        yield engine
+    slow_queries.clear()
+    explaining.clear()
+    engine.dispose()
+
+
+def test_statement_shape() -> None:
+    assert (
+        statement_shape("SELECT id\n  FROM project WHERE id IN (%(id_1_1)s, %(id_1_2)s)")
+        == "SELECT id FROM project WHERE id IN (...)"
+    )
+    assert statement_shape("SELECT 1 WHERE a IN (?, ?, ?)") == "SELECT 1 WHERE a IN (...)"
+
+
+def test_redact_parameters() -> None:
+    assert redact_parameters({"email_1": "a@example.com", "id": 1}, False) == {
+        "email_1": "str",
+        "id": "int",
+    }
+    assert redact_parameters(("secret",), False) == ["str"]
+    assert redact_parameters([("a",), ("b",)], True) == "<2 rows>"
+
+
+def test_should_explain() -> None:
+    engine: Any = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    with patch("app.core.config.settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0):
+        assert should_explain(engine, "SELECT * FROM project")
+        assert not should_explain(engine, "UPDATE project SET title = 'a'")
+        # 加锁领取的语句不再次执行
+        assert not should_explain(
+            engine, "SELECT * FROM email_outbox LIMIT 10 FOR UPDATE SKIP LOCKED"
+        )
+        assert not should_explain(engine, "SELECT * FROM project for no key update")
+        assert not should_explain(engine, "SELECT * FROM project FOR SHARE")
+        engine.dialect.name = "sqlite"
+        assert not should_explain(engine, "SELECT * FROM project")
+
+
+def test_reserve_explain() -> None:
+    slow_queries.clear()
+    explaining.clear()
+    try:
+        # 未汇总的语句结构没有地方保存执行计划
+        assert not reserve_explain("SELECT 1")
+        record_slow_query("SELECT 1", 300.0, None)
+        assert reserve_explain("SELECT 1")
+        # 已在队列中时不重复提交
+        assert not reserve_explain("SELECT 1")
+        explaining.discard("SELECT 1")
+        slow_queries["SELECT 1"].plan = "Result"
+        # 已有执行计划时不再捕获
+        assert not reserve_explain("SELECT 1")
+    finally:
+        slow_queries.clear()
+        explaining.clear()
+
+
+def test_capture_plan_timeout(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        pytest.skip("EXPLAIN capture requires PostgreSQL")
+    shape = "SELECT pg_sleep(2)"
+    slow_queries[shape] = SlowQueryStats()
+    explaining.add(shape)
+    try:
+        start = time.perf_counter()
+        with patch("app.core.config.settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 100):
+            capture_plan(engine, shape, shape, {})
+        assert time.perf_counter() - start < 1.5
+        assert slow_queries[shape].plan is None
+        assert shape not in explaining
+    finally:
+        slow_queries.pop(shape, None)
+        explaining.discard(shape)
+
+
+def test_slow_query_recorded(
+    slow_engine: Engine, caplog: pytest.LogCaptureFixture
+) -> None:
+    statement = text("SELECT :email AS email WHERE 1 IN :ids").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    reset = current_route.set("项目-read_projects")
+    try:
+        with slow_engine.connect() as connection:
+            # IN 参数个数不同仍视为同一语句结构
+            for ids in ([1, 2], [1, 2, 3]):
+                connection.execute(statement, {"email": "secret@example.com", "ids": ids})
+    finally:
+        current_route.reset(reset)
+    assert "secret@example.com" not in caplog.text
+    assert "route 项目-read_projects" in caplog.text
+    [stats] = [stats for shape, stats in slow_queries.items() if "AS email" in shape]
+    assert stats.count == 2
+    assert stats.last_route == "项目-read_projects"
+    # 只在 PostgreSQL 下捕获执行计划
+    assert stats.plan is None
+
+
+def test_read_slow_queries(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+    slow_engine: Engine,
+) -> None:
+    with slow_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/slow-queries/",
+        headers=superuser_token_headers,
+        params={"limit": 1},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] >= 1
+    assert len(content["data"]) == 1
+    assert content["data"][0]["max_ms"] >= 0
+
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/slow-queries/",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
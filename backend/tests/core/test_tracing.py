@@ -0,0 +1,119 @@
+import json
+from collections.abc import Callable, Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import create_engine, text
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+Setup = Callable[..., Callable[[], list[dict[str, Any]]]]
+
+
+@pytest.fixture()
+def traced(tmp_path: Path) -> Generator[Setup, None, None]:
+    """启用追踪并导出到临时文件，返回读取已导出 span 的函数"""
+    export_file = tmp_path / "spans.jsonl"
+
+    def setup(
+        rate: float = 1.0, route_rates: dict[str, float] | None = None
+    ) -> Callable[[], list[dict[str, Any]]]:
+        patches = {
+            "TRACING_SAMPLE_RATE": rate,
+            "TRACING_ROUTE_SAMPLE_RATES": route_rates or {},
+            "TRACING_EXPORT_FILE": str(export_file),
+        }
+        with patch.multiple(settings, **patches):
+            tracing.setup_tracing("test")
+
+        def read_spans() -> list[dict[str, Any]]:
+            tracing.provider.force_flush()
+            if not export_file.exists():
+                return []
+            return [
+                span
+                for line in export_file.read_text().splitlines()
+                for resource in json.loads(line)["resourceSpans"]
+                for scope in resource["scopeSpans"]
+                for span in scope["spans"]
+            ]
+
+        return read_spans
+
+    yield setup
+    tracing.shutdown_tracing()
+
+
+def test_tracing_disabled_by_default() -> None:
+    assert not tracing.tracing_enabled()
+    assert tracing.tracer is None
+    with tracing.start_span("noop") as span:
+        assert span is None
+
+
+def test_request_spans(
+    client: TestClient, superuser_token_headers: dict[str, str], traced: Setup
+) -> None:
+    read_spans = traced()
+    r = client.get(f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    spans = read_spans()
+    [root] = [span for span in spans if span["kind"] == 2]
+    assert root["name"] == f"GET {settings.API_V1_STR}/projects/"
+    attributes = {a["key"]: a["value"] for a in root["attributes"]}
+    assert attributes["app.route"] == {"stringValue": "项目-read_projects"}
+    assert attributes["http.response.status_code"] == {"intValue": "200"}
+    [user_span] = [span for span in spans if span["name"] == "get_current_user"]
+    assert user_span["parentSpanId"] == root["spanId"]
+    assert user_span["traceId"] == root["traceId"]
+
+
+def test_route_sample_rate(
+    client: TestClient, superuser_token_headers: dict[str, str], traced: Setup
+) -> None:
+    read_spans = traced(rate=1.0, route_rates={"项目-read_projects": 0.0})
+    client.get(f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers)
+    assert read_spans() == []
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert read_spans()
+
+
+def test_traceparent_sampled(client: TestClient, traced: Setup) -> None:
+    # 默认不采样，上游已采样时沿用上游的 trace
+    read_spans = traced(rate=0.0, route_rates={"unused": 1.0})
+    trace_id = "0af7651916cd43dd8448eb211c80319c"
+    client.get(
+        f"{settings.API_V1_STR}/utils/health-check/",
+        headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"},
+    )
+    [span] = read_spans()
+    assert span["traceId"] == trace_id
+    assert span["parentSpanId"] == "b7ad6b7169203331"
+
+
+def test_sql_and_bcrypt_spans(traced: Setup, tmp_path: Path) -> None:
+    hashed = get_password_hash("secret")
+    read_spans = traced()
+    engine = create_engine(f"sqlite:///{tmp_path / 'trace.db'}")
+    tracing.instrument_tracing(engine)
+    with tracing.start_trace("job", "email-sender"):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :value"), {"value": "secret"})
+        assert verify_password("secret", hashed)
+    # 不在已采样的 trace 中执行的语句不创建 span
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 2"))
+    engine.dispose()
+
+    spans = read_spans()
+    names = sorted(span["name"] for span in spans)
+    assert names == ["SELECT", "bcrypt.verify", "job"]
+    [sql] = [span for span in spans if span["name"] == "SELECT"]
+    attributes = {a["key"]: a["value"] for a in sql["attributes"]}
+    assert attributes["db.query.text"] == {"stringValue": "SELECT ?"}
+    assert "secret" not in json.dumps(spans)
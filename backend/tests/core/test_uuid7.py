@@ -0,0 +1,22 @@
+import time
+import uuid
+
+from app.models import uuid7
+
+
+def test_uuid7_layout() -> None:
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    # 前 48 位为毫秒时间戳
+    assert before <= value.int >> 80 <= after + 1
+
+
+def test_uuid7_monotonic() -> None:
+    values = [uuid7() for _ in range(10_000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    # 数据库按 16 进制字符串或字节比较，与 UUID 的整数顺序一致
+    assert [v.hex for v in values] == sorted(v.hex for v in values)
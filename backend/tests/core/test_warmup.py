@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from sqlalchemy.pool import QueuePool
+from sqlmodel import SQLModel, create_engine
+
+from app.core.warmup import warm_up
+from app.main import app
+
+
+def test_warm_up_opens_pool_and_compiles_statements(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    # 独立的数据库，避免影响测试会话共用的连接
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'warmup.db'}", poolclass=QueuePool, pool_size=3
+    )
+    SQLModel.metadata.create_all(engine)
+
+    with patch("app.core.config.settings.DB_POOL_SIZE", 3):
+        warm_up(app, engine)
+
+    assert engine.pool.checkedin() == 3
+    assert len(engine._compiled_cache) > 0
+    engine.dispose()
+
+
+def test_warm_up_tolerates_unavailable_database() -> None:
+    engine = create_engine("sqlite:////nonexistent/dir/warmup.db")
+    warm_up(app, engine)
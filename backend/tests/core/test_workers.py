@@ -0,0 +1,77 @@
+import logging
+from pathlib import Path
+
+import anyio
+import pytest
+
+from app.core import workers
+from app.core.config import settings
+
+
+def test_cgroup_v2_cpu_limit(tmp_path: Path) -> None:
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert workers.cgroup_cpu_limit(tmp_path) == 1.5
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert workers.cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_cpu_limit(tmp_path: Path) -> None:
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert workers.cgroup_cpu_limit(tmp_path) == 2
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert workers.cgroup_cpu_limit(tmp_path) is None
+
+
+def test_no_cgroup(tmp_path: Path) -> None:
+    assert workers.cgroup_cpu_limit(tmp_path) is None
+
+
+def test_available_cpus_rounds_up_quota(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    monkeypatch.setattr(workers, "cgroup_root", tmp_path)
+    monkeypatch.setattr(workers.os, "sched_getaffinity", lambda _pid: set(range(8)))
+    assert workers.available_cpus() == 2
+
+
+def test_worker_count_from_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 3)
+    assert workers.worker_count() == 3
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", None)
+    assert workers.worker_count() == workers.available_cpus()
+
+
+def test_threadpool_sized_to_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 4)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 6)
+
+    async def configure() -> tuple[int, float]:
+        size = workers.configure_threadpool()
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        return size, limiter.total_tokens
+
+    assert anyio.run(configure) == (10, 10)
+
+    monkeypatch.setattr(settings, "THREADPOOL_SIZE", 25)
+    assert anyio.run(configure) == (25, 25)
+
+
+def test_connection_budget_warning(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 10)
+    monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", 60)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.workers"):
+        assert workers.check_connection_budget(4)
+        assert not caplog.records
+        assert not workers.check_connection_budget(5)
+    assert "75" in caplog.text
+    assert "DB_CONNECTION_BUDGET=60" in caplog.text
@@ -1,7 +1,13 @@
 from fastapi.encoders import jsonable_encoder
 from sqlmodel import Session
 
-from app.crud.users import crud_create_user, crud_update_user, crud_authenticate
+from app.crud.purge import crud_soft_delete_user
+from app.crud.users import (
+    crud_authenticate,
+    crud_create_user,
+    crud_get_user_by_email,
+    crud_update_user,
+)
 from app.core.security import verify_password
 from app.models import User, UserCreate, UserUpdate
 from tests.utils.utils import random_email, random_lower_string
@@ -33,6 +39,17 @@ def test_not_authenticate_user(db: Session) -> None:
     assert user is None
 
 
+def test_get_user_by_email_deleted(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=email, password=password)
+    user = crud_create_user(session=db, user_create=user_in)
+    assert crud_get_user_by_email(session=db, email=email)
+    crud_soft_delete_user(session=db, user=user)
+    assert crud_get_user_by_email(session=db, email=email) is None
+    assert crud_authenticate(session=db, email=email, password=password) is None
+
+
 def test_check_if_user_is_active(db: Session) -> None:
     email = random_email()
     password = random_lower_string()
@@ -0,0 +1,60 @@
+import anyio
+import httpx
+from fastapi.testclient import TestClient
+
+from benchmarks.api_load import ScenarioResult, compare, run_suite, scenarios, summarize
+
+
+def result(p99_ms: float, throughput_rps: float) -> ScenarioResult:
+    return ScenarioResult(
+        requests=100,
+        errors=0,
+        p50_ms=10.0,
+        p95_ms=20.0,
+        p99_ms=p99_ms,
+        throughput_rps=throughput_rps,
+    )
+
+
+def test_summarize() -> None:
+    summary = summarize([float(i) for i in range(1, 101)], errors=1, elapsed=2.0)
+    assert summary.requests == 100
+    assert summary.errors == 1
+    assert summary.p50_ms == 50.5
+    assert summary.p99_ms >= summary.p95_ms >= summary.p50_ms
+    assert summary.throughput_rps == 50.0
+
+
+def test_compare() -> None:
+    baseline = {
+        "users_me": {
+            "p50_ms": 10.0,
+            "p95_ms": 20.0,
+            "p99_ms": 30.0,
+            "throughput_rps": 100.0,
+        }
+    }
+    assert compare({"users_me": result(33.0, 95.0)}, baseline, tolerance=0.2) == []
+    regressions = compare({"users_me": result(40.0, 70.0)}, baseline, tolerance=0.2)
+    assert regressions == [
+        "users_me p99_ms: 30.0 -> 40.0",
+        "users_me throughput_rps: 100.0 -> 70.0",
+    ]
+    # 基线中没有的场景不比较
+    assert compare({"signup": result(100.0, 1.0)}, baseline, tolerance=0.2) == []
+
+
+def test_run_suite(client: TestClient) -> None:
+    # 测试数据库共用一个连接，只以单并发在进程内运行各场景
+    async def run() -> dict[str, ScenarioResult]:
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            return await run_suite(
+                c, list(scenarios), concurrency=1, requests=3, warmup=1
+            )
+
+    results = anyio.run(run)
+    assert set(results) == set(scenarios)
+    for name, summary in results.items():
+        assert summary.requests == 3, name
+        assert summary.errors == 0, name
@@ -0,0 +1,129 @@
+import socket
+from collections.abc import Generator
+from email import message_from_bytes
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from aiosmtpd.controller import Controller
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.email_sender import send_pending_emails
+from app.models import EmailOutbox, EmailStatus
+from tests.utils.utils import random_email
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.messages: list[Any] = []
+        self.peers: list[Any] = []
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:  # noqa: ARG002
+        self.messages.append(message_from_bytes(envelope.content))
+        self.peers.append(session.peer)
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture()
+def smtp_server() -> Generator[RecordingHandler, None, None]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+        patch("app.core.config.settings.SMTP_PORT", port),
+        patch("app.core.config.settings.SMTP_TLS", False),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "info@example.com"),
+    ):
+        yield handler
+    controller.stop()
+
+
+def test_test_email_is_queued_and_sent(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    smtp_server: RecordingHandler,
+) -> None:
+    email_to = random_email()
+    r = client.post(
+        f"{settings.API_V1_STR}/utils/test-email/",
+        headers=superuser_token_headers,
+        params={"email_to": email_to},
+    )
+    assert r.status_code == 201
+    # 请求只写入发件箱，不直接发送
+    assert smtp_server.messages == []
+    email = db.exec(select(EmailOutbox).where(EmailOutbox.email_to == email_to)).one()
+    assert email.status == EmailStatus.PENDING
+
+    assert send_pending_emails(db) == 1
+    assert len(smtp_server.messages) == 1
+    assert smtp_server.messages[0]["To"] == email_to
+    db.refresh(email)
+    assert email.status == EmailStatus.SENT
+    assert email.attempts == 1
+    assert email.sent_at
+    # 发送后不再保存邮件内容
+    assert email.html_content == ""
+
+
+def test_batch_reuses_smtp_connection(
+    db: Session, smtp_server: RecordingHandler
+) -> None:
+    for _ in range(3):
+        db.add(
+            EmailOutbox(
+                email_to=random_email(), subject="subject", html_content="<p>content</p>"
+            )
+        )
+    db.commit()
+    assert send_pending_emails(db) == 3
+    assert len(smtp_server.messages) == 3
+    # 三封邮件通过同一个连接发送
+    assert len(set(smtp_server.peers)) == 1
+
+
+def test_failed_email_is_retried_with_backoff(db: Session) -> None:
+    email = EmailOutbox(
+        email_to=random_email(), subject="subject", html_content="<p>content</p>"
+    )
+    db.add(email)
+    db.commit()
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+        patch("app.core.config.settings.SMTP_PORT", 1),
+        patch("app.core.config.settings.SMTP_TLS", False),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "info@example.com"),
+    ):
+        send_pending_emails(db)
+    db.refresh(email)
+    assert email.status == EmailStatus.PENDING
+    assert email.attempts == 1
+    assert email.last_error
+    assert email.next_attempt_at > email.created_at
+    assert email.html_content == "<p>content</p>"
+
+
+def test_failed_email_content_is_cleared(db: Session) -> None:
+    email = EmailOutbox(
+        email_to=random_email(), subject="subject", html_content="<p>password</p>"
+    )
+    db.add(email)
+    db.commit()
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+        patch("app.core.config.settings.SMTP_PORT", 1),
+        patch("app.core.config.settings.SMTP_TLS", False),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "info@example.com"),
+        patch("app.core.config.settings.EMAIL_MAX_ATTEMPTS", 1),
+    ):
+        send_pending_emails(db)
+    db.refresh(email)
+    assert email.status == EmailStatus.FAILED
+    assert email.html_content == ""
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+backend_dir = Path(__file__).parents[2]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "app.backend_pre_start",
+        "app.initial_data",
+        "app.email_sender",
+        "app.purge_worker",
+    ],
+)
+def test_import_with_missing_multiproc_dir(module: str, tmp_path: Path) -> None:
+    # 镜像中为所有服务设置了 PROMETHEUS_MULTIPROC_DIR，只有 Web 服务的启动命令会创建该目录
+    multiproc_dir = tmp_path / "missing" / "prometheus"
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=backend_dir,
+        env={**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert multiproc_dir.is_dir()
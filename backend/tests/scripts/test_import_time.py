@@ -0,0 +1,15 @@
+from benchmarks.import_time import lazy_modules, measure, total_ms
+
+# 预算留有余量，只用于发现导入时间的明显回退
+import_budget_ms = 3000
+
+
+def test_import_time_budget() -> None:
+    timings = measure()
+    assert total_ms(timings) < import_budget_ms
+
+    imported = {timing.module for timing in timings}
+    for module in lazy_modules:
+        assert module not in imported
+    # 数据库驱动在 lifespan 创建引擎时才导入
+    assert "psycopg" not in imported
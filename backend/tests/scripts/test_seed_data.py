@@ -0,0 +1,69 @@
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel, col, create_engine, func, select
+
+from app.core.security import verify_password
+from app.models import Project, ProjectCollaboratorLink, Task, TaskStatus, User
+from app.seed_data import seed_database, seed_password
+
+
+def seeded_engine(path: Path, seed: int) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    seed_database(engine, users=50, projects=500, tasks=2000, seed=seed, chunk_size=300)
+    return engine
+
+
+def snapshot(engine: Engine) -> list[tuple[object, ...]]:
+    with Session(engine) as session:
+        return list(
+            session.exec(
+                select(
+                    Task.id, Task.project_id, Task.owner_id, Task.created_at
+                ).order_by(col(Task.id))
+            ).all()
+        ) + list(
+            session.exec(
+                select(User.id, User.hashed_password).order_by(col(User.id))
+            ).all()
+        )
+
+
+def test_seed_database(tmp_path: Path) -> None:
+    engine = seeded_engine(tmp_path / "a.db", seed=1)
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(User)).one() == 50
+        assert session.exec(select(func.count()).select_from(Project)).one() == 500
+        assert session.exec(select(func.count()).select_from(Task)).one() == 2000
+        assert (
+            session.exec(
+                select(func.count()).select_from(ProjectCollaboratorLink)
+            ).one()
+            > 0
+        )
+
+        # 每个用户的项目数呈长尾分布
+        owners = Counter(session.exec(select(Project.owner_id)).all())
+        top = owners.most_common(1)[0][1]
+        median = sorted(owners.values())[len(owners) // 2]
+        assert top >= 5 * median
+
+        user = session.exec(select(User)).first()
+        assert user is not None
+        assert verify_password(seed_password, user.hashed_password)
+        task = session.exec(select(Task)).first()
+        assert task is not None
+        assert isinstance(task.status, TaskStatus)
+    engine.dispose()
+
+
+def test_seed_database_is_deterministic(tmp_path: Path) -> None:
+    first = seeded_engine(tmp_path / "a.db", seed=7)
+    second = seeded_engine(tmp_path / "b.db", seed=7)
+    other = seeded_engine(tmp_path / "c.db", seed=8)
+    assert snapshot(first) == snapshot(second)
+    assert snapshot(first) != snapshot(other)
+    for engine in (first, second, other):
+        engine.dispose()
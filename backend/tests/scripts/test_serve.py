@@ -0,0 +1,77 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from benchmarks.worker_memory import (
+    child_pids,
+    free_port,
+    parse_smaps_rollup,
+    server_command,
+)
+
+backend_dir = Path(__file__).parents[2]
+
+smaps_rollup = """\
+55d0c0a00000-7ffd7a5f9000 ---p 00000000 00:00 0                          [rollup]
+Rss:              110712 kB
+Pss:               64520 kB
+Shared_Clean:      40100 kB
+Shared_Dirty:      17500 kB
+Private_Clean:       312 kB
+Private_Dirty:     52800 kB
+Swap:                  0 kB
+"""
+
+
+def test_parse_smaps_rollup() -> None:
+    memory = parse_smaps_rollup(1, smaps_rollup)
+    assert memory.rss_kb == 110712
+    assert memory.pss_kb == 64520
+    assert memory.shared_kb == 57600
+    assert memory.private_kb == 53112
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires fork and /proc")
+def test_preloaded_workers(tmp_path: Path) -> None:
+    port = free_port()
+    process = subprocess.Popen(
+        server_command("preload", 2, port),
+        cwd=backend_dir,
+        env={**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{settings.API_V1_STR}/health/live"
+        deadline = time.monotonic() + 30
+        while True:
+            assert process.poll() is None
+            assert time.monotonic() < deadline
+            try:
+                if httpx.get(url).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+
+        workers = child_pids(process.pid)
+        assert len(workers) == 2
+        # worker 启动时写入连接池等 live 仪表盘
+        assert list(tmp_path.glob(f"gauge_live*_{workers[0]}.db"))
+        # 异常退出的 worker 由主进程重新 fork
+        os.kill(workers[0], signal.SIGKILL)
+        while len(child_pids(process.pid)) < 2 or workers[0] in child_pids(process.pid):
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        # 已退出 worker 的 live 仪表盘不再计入 /metrics
+        assert not list(tmp_path.glob(f"gauge_live*_{workers[0]}.db"))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
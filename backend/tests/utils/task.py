@@ -0,0 +1,14 @@
+from sqlmodel import Session
+
+from app.crud.tasks import crud_create_task
+from app.models import Project, Task, TaskCreate
+from tests.utils.utils import random_lower_string
+
+
+def create_random_task(db: Session, project: Project) -> Task:
+    title = random_lower_string()
+    description = random_lower_string()
+    task_in = TaskCreate(title=title, description=description)
+    return crud_create_task(
+        session=db, task_in=task_in, project_id=project.id, owner_id=project.owner_id
+    )